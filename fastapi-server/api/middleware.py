@@ -0,0 +1,54 @@
+from typing import Dict
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class UploadSizeLimitMiddleware:
+    """Reject request bodies over a per-path limit before they are buffered.
+
+    A declared Content-Length over the limit is answered with 413 straight away;
+    chunked bodies are counted as they arrive and cut off once they cross it.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        # Longest prefix wins, so specific endpoints can override broader ones
+        self.limits = sorted(limits.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def _limit_for(self, path: str):
+        for prefix, limit in self.limits:
+            if path.startswith(prefix):
+                return limit
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT"):
+            return await self.app(scope, receive, send)
+        limit = self._limit_for(scope["path"])
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        detail = f"Request body too large. Maximum upload size is {limit} bytes."
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            logger.warning(f"Rejected {scope['path']} upload of {int(content_length)} bytes")
+            response = JSONResponse({"detail": detail}, status_code=413)
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI re-raises HTTPExceptions from body parsing unchanged
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
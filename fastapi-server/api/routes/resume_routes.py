@@ -1,30 +1,68 @@
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import json
+import os
 
-from database import get_db
+from database import get_db, get_async_db
 import schemas
-from repository.resume_repository import ResumeRepository
-from services.resume_parser import ResumeParser
+from repository.resume_repository import AsyncResumeRepository
+from repository.parse_job_repository import ParseJobRepository
+from services.resume_parser import ResumeParser, EXTRACTION_MODES
+from services.parse_cache import parse_cache
+from services.model_tiers import tier_stats
+from services.schema_repair import repair_stats
+from services.single_flight import parse_flights
+from services.llm_guard import llm_guard
+from services.hedging import hedger
+from services.llm_registry import llm_registry, get_resume_parser
+from services.upload_spooler import spool_upload, UploadRejected
+from services.resume_stream import EVENT_RESULT, sse_event
+from services.parse_jobs import enqueue_parse_job
+from services.bulk_ingest import BulkIngestor
 
 router = APIRouter(
     prefix="/api/resume",
     tags=["resume"]
 )
 
+def _parse_response_body(parsed_data: schemas.ResumeResponse) -> Dict[str, Any]:
+    """Body of a parse response, shared by the plain and streaming endpoints"""
+    return {
+        "status": parsed_data.status,
+        "message": parsed_data.message,
+        "data": parsed_data.data.dict() if parsed_data.data else None,
+        "error": parsed_data.error,
+        "timings": parsed_data.timings,
+        "repairs": parsed_data.repairs,
+        "tokens_saved": parsed_data.tokens_saved,
+        "served_by": parsed_data.served_by
+    }
+
 @router.post("/parse")
 async def upload_resume(
     file: UploadFile = File(...),
     user_id: int = 1,
-    db: Session = Depends(get_db)
+    mode: Optional[str] = None,
+    queue: bool = False,
+    db: Session = Depends(get_db),
+    resume_parser: ResumeParser = Depends(get_resume_parser)
 ):
-    """Upload and parse a resume file"""
+    """Upload and parse a resume file; mode picks single-call or per-section extraction.
+
+    With queue=true the parse is left to a worker: the response is 202 with a job ID to poll at /jobs/{job_id}.
+    """
     print("Processing resume upload...")
     try:
+        if mode is not None and mode not in EXTRACTION_MODES:
+            raise HTTPException(status_code=400, detail=f"Invalid mode. Supported modes: {', '.join(EXTRACTION_MODES)}")
+
         # if debugging is true, return a sample response
-        debugging = True
+        debugging = os.getenv("RESUME_PARSE_DEBUG", "false").lower() == "true"
         if debugging:
             return {
     "status": "partial",
@@ -193,25 +231,119 @@ async def upload_resume(
     "error": "'is_current_job' is an invalid keyword argument for WorkExperience"
 }
 
-         # Parse the resume
-        resume_parser = ResumeParser(db)
+        # Stream the upload to a spool, rejecting oversized or non-resume files early
+        try:
+            upload = await spool_upload(file)
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+
+        if queue:
+            with upload:
+                try:
+                    resume_text = await resume_parser.extract_text_from_upload(upload)
+                except Exception as e:
+                    raise HTTPException(status_code=400, detail=f"Could not extract text from file: {e}")
+            if not resume_text:
+                raise HTTPException(status_code=400, detail="Could not extract text from file")
+            job = await run_in_threadpool(enqueue_parse_job, db, user_id, upload.file_name, resume_text, mode)
+            return JSONResponse(status_code=202, content={
+                "status": "queued",
+                "message": "Resume queued for parsing",
+                "job_id": job.id
+            })
+
+         # Parse the resume with the shared parser and this request's session
         print("Parsing resume...")
-        parsed_data = await resume_parser.parse_uploaded_resume(file, user_id)
+        with upload:
+            parsed_data = await resume_parser.parse_spooled_upload(upload, user_id, db, mode)
         print("Resume parsed successfully",parsed_data)
         
  
-        return {
-            "status": parsed_data.status,
-            "message": parsed_data.message,
-            "data": parsed_data.data.dict() if parsed_data.data else None,
-            "error": parsed_data.error
-        }
+        return _parse_response_body(parsed_data)
     
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Failed to process resume: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to process resume: {str(e)}")
 
-@router.post("/save", response_model=schemas.ResumeResponse)
+@router.post("/parse/stream")
+async def stream_resume(
+    file: UploadFile = File(...),
+    user_id: int = 1,
+    mode: Optional[str] = None,
+    db: Session = Depends(get_db),
+    resume_parser: ResumeParser = Depends(get_resume_parser)
+):
+    """Upload and parse a resume, streaming each finished piece as a Server-Sent Event.
+
+    Events are personal_info, education, work_experience and skills (one per entry),
+    closing with a result event that carries the same body as /parse.
+    """
+    if mode is not None and mode not in EXTRACTION_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode. Supported modes: {', '.join(EXTRACTION_MODES)}")
+    try:
+        upload = await spool_upload(file)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    async def events():
+        with upload:
+            async for event, data in resume_parser.astream_spooled_upload(upload, user_id, db, mode):
+                yield sse_event(event, _parse_response_body(data) if event == EVENT_RESULT else data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/bulk")
+async def bulk_ingest_resumes(
+    files: List[UploadFile] = File(...),
+    user_map: Optional[str] = Form(None),
+    mode: Optional[str] = None,
+    match_email: bool = False,
+    user_id: int = 1,
+    db: Session = Depends(get_db),
+    resume_parser: ResumeParser = Depends(get_resume_parser)
+):
+    """Parse and save a batch of resumes, uploaded as files and/or ZIP archives of them.
+
+    Resumes are saved for user_id, or for the users user_map, a JSON object of file name to
+    user ID, gives them to; with match_email they are saved for the user with the email
+    address found in each one instead, who is created if needed. Only one resume per user
+    is saved from a batch. Progress streams as Server-Sent Events: a file event per resume
+    as it is saved, skipped as a duplicate, rejected or failed, then a summary event with
+    the counts.
+    """
+    if mode is not None and mode not in EXTRACTION_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode. Supported modes: {', '.join(EXTRACTION_MODES)}")
+    owners = {"match_email": True} if match_email else {"user_id": user_id}
+    if user_map is not None:
+        if match_email:
+            raise HTTPException(status_code=400, detail="Use either user_map or match_email")
+        try:
+            owners = {"user_map": json.loads(user_map)}
+            if not isinstance(owners["user_map"], dict) or not all(
+                isinstance(mapped, int) for mapped in owners["user_map"].values()
+            ):
+                raise ValueError("not an object of file name to user ID")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid user_map: {e}")
+    ingestor = BulkIngestor(resume_parser, sessionmaker(bind=db.get_bind()), **owners)
+
+    async def events():
+        async for event, data in ingestor.run(files, mode):
+            yield sse_event(event, data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/save", response_model=schemas.StoredResumeResponse)
 async def save_parsed_resume(
     file_name: str = Form(...),
     personal_info: str = Form(...),
@@ -219,7 +351,7 @@ async def save_parsed_resume(
     work_experience: str = Form("[]"),
     skills: str = Form("[]"),
     user_id: int = 1,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Save parsed resume data"""
     try:
@@ -232,30 +364,84 @@ async def save_parsed_resume(
         }
         
         # Save resume data
-        resume = ResumeRepository.save_parsed_resume(db, user_id, file_name, parsed_data)
+        resume = await AsyncResumeRepository.save_parsed_resume(db, user_id, file_name, parsed_data)
         print(f"Resume data saved for user {user_id}")
         
         return resume
     
     except SQLAlchemyError as e:
         print(f"Database error while saving resume: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
         print(f"Error saving resume: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to save resume: {str(e)}")
 
-@router.get("/{user_id}", response_model=schemas.ResumeResponse)
-async def get_resume(user_id: int, db: Session = Depends(get_db)):
+@router.get("/jobs/stats")
+async def get_parse_job_stats(db: Session = Depends(get_db)):
+    """Get how many parse jobs are queued, running, succeeded and failed"""
+    return await run_in_threadpool(ParseJobRepository.count_by_status, db)
+
+@router.get("/jobs/{job_id}", response_model=schemas.ParseJobResponse)
+async def get_parse_job(job_id: int, db: Session = Depends(get_db)):
+    """Get the status of a queued parse job, and its result once finished"""
+    job = await run_in_threadpool(ParseJobRepository.get_job, db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Parse job not found")
+    return job
+
+@router.get("/cache/stats")
+async def get_parse_cache_stats():
+    """Get parse cache hit/miss counters"""
+    return parse_cache.stats()
+
+@router.get("/tiers/stats")
+async def get_model_tier_stats():
+    """Get how many parses each model tier served and why parses escalated"""
+    return tier_stats.stats()
+
+@router.get("/coalescing/stats")
+async def get_coalescing_stats():
+    """Get how many concurrent duplicate parses joined an in-flight parse instead of starting their own"""
+    return parse_flights.stats()
+
+@router.get("/llm/stats")
+async def get_llm_guard_stats():
+    """Get the adaptive LLM concurrency limit, queue depth, circuit breaker state and call outcomes"""
+    return llm_guard.stats()
+
+@router.get("/hedges/stats")
+async def get_hedge_stats():
+    """Get how often hedged LLM calls fired and won, and the current hedge delays"""
+    return hedger.stats()
+
+@router.get("/providers/stats")
+async def get_provider_stats():
+    """Get latency, circuit breaker state and call outcomes for each configured LLM backend"""
+    return llm_registry.router.stats()
+
+@router.get("/repairs/stats")
+async def get_schema_repair_stats():
+    """Get how many LLM outputs were repaired locally, and which repairs were applied"""
+    return repair_stats.stats()
+
+@router.delete("/cache")
+async def invalidate_parse_cache(content_hash: Optional[str] = None, db: Session = Depends(get_db)):
+    """Invalidate cached parses, either for one content hash or entirely"""
+    deleted = await run_in_threadpool(parse_cache.invalidate, db, content_hash=content_hash)
+    return {"message": "Parse cache invalidated", "deleted": deleted}
+
+@router.get("/{user_id}", response_model=schemas.StoredResumeResponse)
+async def get_resume(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get resume by user ID"""
-    resume = ResumeRepository.get_resume(db, user_id)
+    resume = await AsyncResumeRepository.get_resume(db, user_id)
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     return resume
 
 @router.delete("/{user_id}")
-async def delete_resume(user_id: int, db: Session = Depends(get_db)):
+async def delete_resume(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete resume"""
-    if ResumeRepository.delete_resume(db, user_id):
+    if await AsyncResumeRepository.delete_resume(db, user_id):
         return {"message": "Resume deleted successfully"}
     raise HTTPException(status_code=404, detail="Resume not found") 
\ No newline at end of file
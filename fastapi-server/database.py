@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -23,6 +25,39 @@ except Exception as e:
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The same database through an asyncio driver, for routes that await their queries
+# instead of holding the event loop while a sync driver waits on the network
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+class AsyncDatabaseNotConfigured(RuntimeError):
+    """Raised when an async session is needed for a database with no known asyncio driver."""
+
+
+def async_database_url(url: str) -> str:
+    """The URL of a database with its driver swapped for the asyncio one"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise AsyncDatabaseNotConfigured(
+            f"No asyncio driver known for {backend} databases; set ASYNC_DATABASE_URL to one with an async driver"
+        )
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+# Set ASYNC_DATABASE_URL for a database whose asyncio driver isn't one of ASYNC_DRIVERS
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+async_engine = None
+AsyncSessionLocal = None
+try:
+    ASYNC_DATABASE_URL = ASYNC_DATABASE_URL or async_database_url(DATABASE_URL)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+    # Objects stay readable after commit, since an expired attribute can't lazy load under asyncio
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+except AsyncDatabaseNotConfigured as e:
+    # Scripts and the sync routes still work; only routes using get_async_db fail
+    print(f"Async database disabled: {e}")
+
 Base = declarative_base()
 
 # Dependency
@@ -31,4 +66,13 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise AsyncDatabaseNotConfigured(
+            f"No async database for {make_url(DATABASE_URL).get_backend_name()}; set ASYNC_DATABASE_URL"
+        )
+    async with AsyncSessionLocal() as db:
+        yield db
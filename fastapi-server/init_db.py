@@ -1,13 +1,18 @@
+from sqlalchemy import text
+
 from database import engine, SessionLocal
+from migrate import upgrade_database
 from models import Base, User
 from schemas.user_schemas import OnboardingStatus
 
 def init_db():
-    # Drop all tables
+    # Drop all tables, and the migration history with them
     Base.metadata.drop_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
     
     # Create all tables
-    Base.metadata.create_all(bind=engine)
+    upgrade_database(engine)
     
     # Create a default user
     db = SessionLocal()
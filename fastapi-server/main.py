@@ -1,9 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-import models
-from database import engine
+from database import engine, async_engine
+from migrate import upgrade_database
 from api.routes import router
+from api.middleware import UploadSizeLimitMiddleware
+from services.upload_spooler import MAX_UPLOAD_SIZE
+from services.bulk_ingest import BULK_MAX_UPLOAD_SIZE
+from services.pdf_extractor import pdf_extraction_engine
+from services.llm_registry import llm_registry
+from contextlib import asynccontextmanager
 import logging
 import sys
 
@@ -18,14 +24,36 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+# Create or migrate the database tables
+upgrade_database(engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop process-wide resources"""
+    # Spawn the PDF extraction workers before the first upload arrives
+    await pdf_extraction_engine.start()
+    logger.info(f"Started {pdf_extraction_engine.max_workers} PDF extraction workers")
+    # Build the shared parser and LLM clients once and warm their connections
+    await llm_registry.startup()
+    yield
+    await llm_registry.shutdown()
+    pdf_extraction_engine.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="ZoopJobs API",
     description="API for ZoopJobs - Resume parsing and job matching platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+# Reject oversized resume uploads before the body is buffered; the extra
+# allowance covers the multipart framing around the file itself
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={"/api/resume/parse": MAX_UPLOAD_SIZE + 64 * 1024, "/api/resume/bulk": BULK_MAX_UPLOAD_SIZE}
 )
 
 # Configure CORS
@@ -0,0 +1,64 @@
+"""Bring the database schema up to date with the Alembic migrations in migrations/.
+
+The server and the worker commands run this at startup; run it by hand to
+migrate ahead of a deploy, or to look at the SQL first:
+
+    python migrate.py           # upgrade to the latest revision
+    python migrate.py --sql     # print the upgrade SQL without running it
+
+New migrations are written with `alembic revision --autogenerate -m "..."`.
+"""
+import logging
+import argparse
+from pathlib import Path
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().with_name("alembic.ini")
+# The schema create_all built before there were migrations
+BASELINE_REVISION = "0001"
+
+
+def alembic_config(connection=None) -> Config:
+    """Alembic config for this app; migrations run on connection when one is given."""
+    config = Config(str(ALEMBIC_INI))
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def upgrade_database(bind: Optional[Engine] = None, revision: str = "head") -> None:
+    """Migrate the database to revision, first stamping a database create_all built at the baseline."""
+    if bind is None:
+        from database import engine as bind
+
+    with bind.connect() as connection:
+        tables = inspect(connection).get_table_names()
+        # End the read so Alembic runs each command in a transaction of its own, which
+        # migrations building indexes CONCURRENTLY need to be able to step out of
+        connection.commit()
+        config = alembic_config(connection)
+        if "users" in tables and "alembic_version" not in tables:
+            logger.warning(f"Database has no migration history; marking it as at revision {BASELINE_REVISION}")
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, revision)
+        # Without transactional DDL (SQLite) Alembic leaves the statements to the connection's own transaction
+        connection.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate the database schema")
+    parser.add_argument("--revision", default="head", help="Revision to upgrade to")
+    parser.add_argument("--sql", action="store_true", help="Print the SQL instead of running it")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if args.sql:
+        command.upgrade(alembic_config(), args.revision, sql=True)
+    else:
+        upgrade_database(revision=args.revision)
@@ -0,0 +1,52 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+import models
+import database
+
+config = context.config
+
+# Run from the app (migrate.upgrade_database), the caller passes its connection and keeps its own logging
+connection = config.attributes.get("connection")
+if connection is None and config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = models.Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Print the migration SQL for DATABASE_URL instead of running it."""
+    context.configure(
+        url=database.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run the migrations on the given connection, or on the app's engine."""
+    if connection is not None:
+        _run_migrations(connection)
+        return
+    with database.engine.connect() as own_connection:
+        _run_migrations(own_connection)
+
+
+def _run_migrations(bind) -> None:
+    # SQLite can't ALTER most constraints in place; batch mode rebuilds the table instead
+    context.configure(connection=bind, target_metadata=target_metadata, render_as_batch=True)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
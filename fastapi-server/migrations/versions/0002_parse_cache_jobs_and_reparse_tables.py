@@ -0,0 +1,111 @@
+"""Parse cache, parse job and re-parse checkpoint tables; stored resume text and parse version
+
+Tables and columns already there are left alone, so a database create_all
+built from the models of this change is adopted as well.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 04:09:01.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existing_schema():
+    """Names of the tables there are, and of the resumes columns; nothing when printing SQL offline."""
+    if context.is_offline_mode():
+        return set(), set()
+    inspector = sa.inspect(op.get_bind())
+    return set(inspector.get_table_names()), {column['name'] for column in inspector.get_columns('resumes')}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables, resume_columns = _existing_schema()
+
+    if 'parse_cache' not in tables:
+        op.create_table('parse_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cache_key', sa.String(), nullable=False),
+        sa.Column('content_hash', sa.String(), nullable=False),
+        sa.Column('prompt_version', sa.String(), nullable=True),
+        sa.Column('model_name', sa.String(), nullable=True),
+        sa.Column('parsed_data', sa.JSON(), nullable=True),
+        sa.Column('hit_count', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_parse_cache_cache_key'), 'parse_cache', ['cache_key'], unique=True)
+        op.create_index(op.f('ix_parse_cache_content_hash'), 'parse_cache', ['content_hash'], unique=False)
+        op.create_index(op.f('ix_parse_cache_id'), 'parse_cache', ['id'], unique=False)
+
+    if 'parse_jobs' not in tables:
+        op.create_table('parse_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('file_name', sa.String(), nullable=True),
+        sa.Column('resume_text', sa.Text(), nullable=False),
+        sa.Column('mode', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_at', sa.DateTime(), nullable=False),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('worker_id', sa.String(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_parse_jobs_id'), 'parse_jobs', ['id'], unique=False)
+        op.create_index('ix_parse_jobs_status_run_at', 'parse_jobs', ['status', 'run_at'], unique=False)
+        op.create_index(op.f('ix_parse_jobs_user_id'), 'parse_jobs', ['user_id'], unique=False)
+
+    if 'reparse_checkpoints' not in tables:
+        op.create_table('reparse_checkpoints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('parse_version', sa.String(), nullable=False),
+        sa.Column('last_resume_id', sa.Integer(), nullable=False),
+        sa.Column('updated', sa.Integer(), nullable=False),
+        sa.Column('unchanged', sa.Integer(), nullable=False),
+        sa.Column('failed', sa.Integer(), nullable=False),
+        sa.Column('skipped', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+        op.create_index(op.f('ix_reparse_checkpoints_id'), 'reparse_checkpoints', ['id'], unique=False)
+
+    with op.batch_alter_table('resumes') as batch_op:
+        if 'resume_text' not in resume_columns:
+            batch_op.add_column(sa.Column('resume_text', sa.Text(), nullable=True))
+        if 'parse_version' not in resume_columns:
+            batch_op.add_column(sa.Column('parse_version', sa.String(), nullable=True))
+            batch_op.create_index(batch_op.f('ix_resumes_parse_version'), ['parse_version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('resumes') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_resumes_parse_version'))
+        batch_op.drop_column('parse_version')
+        batch_op.drop_column('resume_text')
+    op.drop_table('reparse_checkpoints')
+    op.drop_table('parse_jobs')
+    op.drop_table('parse_cache')
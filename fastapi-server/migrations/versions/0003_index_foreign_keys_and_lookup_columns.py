@@ -0,0 +1,65 @@
+"""Index foreign keys and lookup columns; one resume and one profile per user
+
+Duplicate resumes or profiles left by racing saves are removed first, keeping
+the oldest row, which is the one the app has been reading. The indexes on the
+child tables are built CONCURRENTLY on PostgreSQL so uploads keep writing to
+them while they build.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 04:09:26.686217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHILD_TABLES = ('education', 'work_experience', 'skills')
+
+DUPLICATE_RESUMES = (
+    "SELECT id FROM resumes WHERE user_id IS NOT NULL "
+    "AND id NOT IN (SELECT MIN(id) FROM resumes GROUP BY user_id)"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in CHILD_TABLES:
+        op.execute(f"DELETE FROM {table} WHERE resume_id IN ({DUPLICATE_RESUMES})")
+    op.execute(f"DELETE FROM resumes WHERE id IN ({DUPLICATE_RESUMES})")
+    op.execute(
+        "DELETE FROM profiles WHERE user_id IS NOT NULL "
+        "AND id NOT IN (SELECT MIN(id) FROM profiles GROUP BY user_id)"
+    )
+    op.create_index(op.f('ix_resumes_user_id'), 'resumes', ['user_id'], unique=True)
+    op.create_index(op.f('ix_profiles_user_id'), 'profiles', ['user_id'], unique=True)
+
+    if op.get_context().dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY can't run inside a transaction
+        with op.get_context().autocommit_block():
+            _create_child_indexes(postgresql_concurrently=True)
+    else:
+        _create_child_indexes()
+
+
+def _create_child_indexes(**options) -> None:
+    for table in CHILD_TABLES:
+        op.create_index(op.f(f'ix_{table}_resume_id'), table, ['resume_id'], **options)
+    op.create_index('ix_skills_name_resume_id', 'skills', ['name', 'resume_id'], **options)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_skills_name_resume_id', table_name='skills')
+    for table in CHILD_TABLES:
+        op.drop_index(op.f(f'ix_{table}_resume_id'), table_name=table)
+    op.drop_index(op.f('ix_profiles_user_id'), table_name='profiles')
+    op.drop_index(op.f('ix_resumes_user_id'), table_name='resumes')
@@ -4,7 +4,7 @@ Models package initialization.
 
 from database import Base
 from .user import User, Profile
-from .resume import Resume, Education, WorkExperience, Skill
+from .resume import Resume, Education, WorkExperience, Skill, ParseCacheEntry, ParseJob, ReparseCheckpoint
 
 __all__ = [
     'Base',
@@ -13,5 +13,8 @@ __all__ = [
     'Resume',
     'Education',
     'WorkExperience',
-    'Skill'
+    'Skill',
+    'ParseCacheEntry',
+    'ParseJob',
+    'ReparseCheckpoint'
 ] 
\ No newline at end of file
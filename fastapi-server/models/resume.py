@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -7,9 +7,11 @@ class Resume(Base):
     __tablename__ = "resumes"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), unique=True, index=True)  # One resume per user, upserted on re-upload
     file_name = Column(String)
     parsed_data = Column(JSON)
+    resume_text = Column(Text)  # Extracted text the parse came from, kept so it can be re-parsed
+    parse_version = Column(String, index=True)  # Prompt and schema version of the parse; None for hand edits
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -23,7 +25,7 @@ class Education(Base):
     __tablename__ = "education"
     
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer, ForeignKey("resumes.id"))
+    resume_id = Column(Integer, ForeignKey("resumes.id"), index=True)
     institution = Column(String)
     degree = Column(String)
     field_of_study = Column(String)
@@ -40,7 +42,7 @@ class WorkExperience(Base):
     __tablename__ = "work_experience"
     
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer, ForeignKey("resumes.id"))
+    resume_id = Column(Integer, ForeignKey("resumes.id"), index=True)
     company = Column(String)
     job_title = Column(String)
     start_date = Column(String)
@@ -56,11 +58,65 @@ class Skill(Base):
     __tablename__ = "skills"
     
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer, ForeignKey("resumes.id"))
+    resume_id = Column(Integer, ForeignKey("resumes.id"), index=True)
     name = Column(String)
     category = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    resume = relationship("Resume", back_populates="skills") 
\ No newline at end of file
+    resume = relationship("Resume", back_populates="skills")
+    
+    # Finds the resumes listing a skill without reading the skill rows
+    __table_args__ = (Index("ix_skills_name_resume_id", "name", "resume_id"),)
+
+class ParseCacheEntry(Base):
+    __tablename__ = "parse_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String, unique=True, index=True, nullable=False)
+    content_hash = Column(String, index=True, nullable=False)
+    prompt_version = Column(String)
+    model_name = Column(String)
+    parsed_data = Column(JSON)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_hit_at = Column(DateTime(timezone=True))
+
+class ParseJob(Base):
+    __tablename__ = "parse_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, index=True)
+    file_name = Column(String)
+    resume_text = Column(Text, nullable=False)
+    mode = Column(String)
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    # Naive UTC, compared against each other in the claim query
+    run_at = Column(DateTime, nullable=False)  # Earliest time a worker may claim it
+    lease_expires_at = Column(DateTime)  # A running job whose lease ran out is claimable again
+    worker_id = Column(String)
+    result = Column(JSON)  # The /api/resume/parse response body
+    error = Column(String)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime)
+    
+    __table_args__ = (Index("ix_parse_jobs_status_run_at", "status", "run_at"),)
+
+class ReparseCheckpoint(Base):
+    __tablename__ = "reparse_checkpoints"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+    parse_version = Column(String, nullable=False)  # The version the run is bringing resumes up to
+    last_resume_id = Column(Integer, nullable=False, default=0)  # Resumes up to this id are done
+    updated = Column(Integer, nullable=False, default=0)
+    unchanged = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)  # Saved again by someone else while being re-parsed
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime)
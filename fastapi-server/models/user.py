@@ -20,7 +20,7 @@ class Profile(Base):
     __tablename__ = "profiles"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), unique=True, index=True)  # One profile per user
     first_name = Column(String)
     last_name = Column(String)
     location = Column(String)
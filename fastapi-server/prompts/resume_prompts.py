@@ -1,3 +1,4 @@
+import hashlib
 from typing import Optional
 
 class ResumeSystemPrompts:
@@ -43,4 +44,50 @@ class ResumeSystemPrompts:
         - Focus on relevant professional details
         
         Remember to structure the output exactly according to the provided schema format.
-        Be thorough and precise in your extraction while maintaining the integrity of the information.""" 
\ No newline at end of file
+        Be thorough and precise in your extraction while maintaining the integrity of the information."""
+
+    @staticmethod
+    def get_resume_chunk_prompt(chunk_number: int, total_chunks: int) -> str:
+        return ResumeSystemPrompts.get_resume_parser_prompt() + f"""
+
+        You are reading part {chunk_number} of {total_chunks} of a longer resume.
+        - Extract only the information that appears in this part
+        - Leave sections empty when this part does not contain them
+        - Do not guess information that belongs to other parts of the resume"""
+
+    @staticmethod
+    def get_resume_section_prompt(section: str) -> str:
+        instructions = {
+            "personal_info": """Extract only the candidate's personal information: full name, email, phone,
+        location, LinkedIn and website links, and the professional summary.""",
+            "education": """Extract only the education history: institution names, degrees and certifications,
+        fields of study, dates of attendance, and relevant coursework or achievements.
+        Keep entries in chronological order.""",
+            "work_experience": """Extract only the work experience: company names, job titles, employment dates,
+        and key responsibilities, achievements, projects and impact.
+        Keep entries in chronological order.""",
+            "skills": """Extract only the skills: technical skills, soft skills, tools and technologies,
+        and professional certifications, each with an appropriate category."""
+        }
+        return f"""You are an expert resume parser with deep understanding of professional documents.
+        {instructions[section]}
+
+        Guidelines:
+        - Ignore every other part of the resume
+        - If information is unclear or missing, mark as None
+        - Ensure dates are formatted consistently
+
+        Remember to structure the output exactly according to the provided schema format."""
+
+    @staticmethod
+    def get_prompt_version() -> str:
+        """Short fingerprint of the parser prompts, used to key cached parses."""
+        prompt = (
+            ResumeSystemPrompts.get_resume_parser_prompt()
+            + ResumeSystemPrompts.get_resume_chunk_prompt(0, 0)
+            + "".join(
+                ResumeSystemPrompts.get_resume_section_prompt(section)
+                for section in ("personal_info", "education", "work_experience", "skills")
+            )
+        )
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
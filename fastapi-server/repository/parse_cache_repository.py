@@ -0,0 +1,67 @@
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+import models
+from typing import Optional, Dict, Any
+from datetime import datetime
+
+class ParseCacheRepository:
+    @staticmethod
+    def get_entry(db: Session, cache_key: str) -> Optional[models.ParseCacheEntry]:
+        """Get a cached parse by its cache key"""
+        return db.query(models.ParseCacheEntry).filter(models.ParseCacheEntry.cache_key == cache_key).first()
+
+    @staticmethod
+    def record_hit(db: Session, cache_key: str) -> None:
+        """Bump the hit counter of a cached parse; committed with the caller's next commit"""
+        # Incremented in SQL, so concurrent hits don't overwrite each other's count
+        db.execute(
+            update(models.ParseCacheEntry)
+            .where(models.ParseCacheEntry.cache_key == cache_key)
+            .values(hit_count=func.coalesce(models.ParseCacheEntry.hit_count, 0) + 1, last_hit_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def save_entry(
+        db: Session,
+        cache_key: str,
+        content_hash: str,
+        prompt_version: str,
+        model_name: str,
+        parsed_data: Dict[str, Any]
+    ) -> models.ParseCacheEntry:
+        """Save or replace a cached parse"""
+        entry = ParseCacheRepository.get_entry(db, cache_key)
+        if entry:
+            entry.parsed_data = parsed_data
+        else:
+            entry = models.ParseCacheEntry(
+                cache_key=cache_key,
+                content_hash=content_hash,
+                prompt_version=prompt_version,
+                model_name=model_name,
+                parsed_data=parsed_data,
+                hit_count=0
+            )
+            db.add(entry)
+        db.commit()
+        return entry
+
+    @staticmethod
+    def delete_entries(
+        db: Session,
+        content_hash: Optional[str] = None,
+        prompt_version: Optional[str] = None,
+        model_name: Optional[str] = None
+    ) -> int:
+        """Delete cached parses matching the given filters; no filters clears the table"""
+        query = db.query(models.ParseCacheEntry)
+        if content_hash:
+            query = query.filter(models.ParseCacheEntry.content_hash == content_hash)
+        if prompt_version:
+            query = query.filter(models.ParseCacheEntry.prompt_version == prompt_version)
+        if model_name:
+            query = query.filter(models.ParseCacheEntry.model_name == model_name)
+        deleted = query.delete(synchronize_session=False)
+        db.commit()
+        return deleted
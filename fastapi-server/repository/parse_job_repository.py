@@ -0,0 +1,163 @@
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+import models
+from typing import Optional, Dict, Any
+from datetime import datetime, timedelta
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_STATUSES = (JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, JOB_FAILED)
+
+# Claims lost to another worker (SQLite only) or spent failing expired jobs before giving up until the next poll
+CLAIM_RETRIES = 5
+
+class ParseJobRepository:
+    @staticmethod
+    def enqueue(
+        db: Session,
+        user_id: int,
+        file_name: str,
+        resume_text: str,
+        mode: Optional[str] = None,
+        max_attempts: int = 3
+    ) -> models.ParseJob:
+        """Queue a parse job, claimable right away"""
+        job = models.ParseJob(
+            user_id=user_id,
+            file_name=file_name,
+            resume_text=resume_text,
+            mode=mode,
+            status=JOB_QUEUED,
+            attempts=0,
+            max_attempts=max_attempts,
+            run_at=datetime.utcnow()
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def get_job(db: Session, job_id: int) -> Optional[models.ParseJob]:
+        """Get a parse job by ID"""
+        return db.query(models.ParseJob).filter(models.ParseJob.id == job_id).first()
+
+    @staticmethod
+    def _claimable(now: datetime):
+        return or_(
+            and_(models.ParseJob.status == JOB_QUEUED, models.ParseJob.run_at <= now),
+            and_(models.ParseJob.status == JOB_RUNNING, models.ParseJob.lease_expires_at < now)
+        )
+
+    @staticmethod
+    def claim(db: Session, worker_id: str, lease_seconds: float, now: Optional[datetime] = None) -> Optional[models.ParseJob]:
+        """Claim the oldest runnable job for a worker, or None if there is none.
+
+        On PostgreSQL the row is locked with FOR UPDATE SKIP LOCKED, so concurrent
+        workers each get a different job without waiting on each other. SQLite has
+        no row locks; there the claim is an UPDATE conditional on the row being
+        unchanged since it was read, retried if another worker got there first.
+        A job whose lease ran out on its last attempt is failed when a claim reaches
+        it, so an idle poll only reads.
+        """
+        now = now or datetime.utcnow()
+        claimed = {
+            models.ParseJob.status: JOB_RUNNING,
+            models.ParseJob.attempts: models.ParseJob.attempts + 1,
+            models.ParseJob.worker_id: worker_id,
+            models.ParseJob.lease_expires_at: now + timedelta(seconds=lease_seconds)
+        }
+        expired = {
+            models.ParseJob.status: JOB_FAILED,
+            models.ParseJob.error: "Worker lease expired on the last attempt",
+            models.ParseJob.finished_at: now
+        }
+        query = db.query(
+            models.ParseJob.id, models.ParseJob.status, models.ParseJob.attempts, models.ParseJob.max_attempts
+        ).filter(ParseJobRepository._claimable(now)).order_by(models.ParseJob.run_at, models.ParseJob.id)
+        if db.get_bind().dialect.name == "postgresql":
+            query = query.with_for_update(skip_locked=True)
+
+        for _ in range(CLAIM_RETRIES):
+            candidate = query.first()
+            if candidate is None:
+                db.rollback()
+                return None
+            row = db.query(models.ParseJob).filter(
+                models.ParseJob.id == candidate.id,
+                models.ParseJob.status == candidate.status,
+                models.ParseJob.attempts == candidate.attempts
+            )
+            if candidate.status == JOB_RUNNING and candidate.attempts >= candidate.max_attempts:
+                # Its worker died on the last attempt; fail it and look for another job
+                row.update(expired, synchronize_session=False)
+                db.commit()
+                continue
+            won = row.update(claimed, synchronize_session=False)
+            db.commit()
+            if won:
+                return ParseJobRepository.get_job(db, candidate.id)
+        return None
+
+    @staticmethod
+    def _owned(db: Session, job_id: int, worker_id: str):
+        return db.query(models.ParseJob).filter(
+            models.ParseJob.id == job_id,
+            models.ParseJob.status == JOB_RUNNING,
+            models.ParseJob.worker_id == worker_id
+        )
+
+    @staticmethod
+    def extend_lease(db: Session, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        """Push out the lease of a job the worker still holds; False if it lost the job"""
+        extended = ParseJobRepository._owned(db, job_id, worker_id).update({
+            models.ParseJob.lease_expires_at: datetime.utcnow() + timedelta(seconds=lease_seconds)
+        }, synchronize_session=False)
+        db.commit()
+        return bool(extended)
+
+    @staticmethod
+    def complete(db: Session, job_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Mark a held job succeeded with its result; False if the worker no longer holds it"""
+        completed = ParseJobRepository._owned(db, job_id, worker_id).update({
+            models.ParseJob.status: JOB_SUCCEEDED,
+            models.ParseJob.result: result,
+            models.ParseJob.error: None,
+            models.ParseJob.lease_expires_at: None,
+            models.ParseJob.finished_at: datetime.utcnow()
+        }, synchronize_session=False)
+        db.commit()
+        return bool(completed)
+
+    @staticmethod
+    def release(
+        db: Session,
+        job_id: int,
+        worker_id: str,
+        error: str,
+        retry_at: Optional[datetime] = None,
+        result: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Give up a held job after a failed attempt: requeue it for retry_at, or fail it if retry_at is None"""
+        values = {
+            models.ParseJob.error: error,
+            models.ParseJob.result: result,
+            models.ParseJob.lease_expires_at: None
+        }
+        if retry_at is None:
+            values.update({models.ParseJob.status: JOB_FAILED, models.ParseJob.finished_at: datetime.utcnow()})
+        else:
+            values.update({models.ParseJob.status: JOB_QUEUED, models.ParseJob.run_at: retry_at})
+        released = ParseJobRepository._owned(db, job_id, worker_id).update(values, synchronize_session=False)
+        db.commit()
+        return bool(released)
+
+    @staticmethod
+    def count_by_status(db: Session) -> Dict[str, int]:
+        """Number of jobs in each status"""
+        counts = dict(
+            db.query(models.ParseJob.status, func.count(models.ParseJob.id)).group_by(models.ParseJob.status).all()
+        )
+        return {status: counts.get(status, 0) for status in JOB_STATUSES}
@@ -0,0 +1,48 @@
+from sqlalchemy.orm import Session
+import models
+from typing import Dict, Optional
+from datetime import datetime
+
+REPARSE_COUNTS = ("updated", "unchanged", "failed", "skipped")
+
+class ReparseCheckpointRepository:
+    @staticmethod
+    def get_checkpoint(db: Session, name: str) -> Optional[models.ReparseCheckpoint]:
+        """Get a re-parse run's checkpoint by name"""
+        return db.query(models.ReparseCheckpoint).filter(models.ReparseCheckpoint.name == name).first()
+
+    @staticmethod
+    def start(db: Session, name: str, parse_version: str, restart: bool = False) -> models.ReparseCheckpoint:
+        """Resume the named run, or start it from the first resume if it finished, targets another version or restart is set"""
+        checkpoint = ReparseCheckpointRepository.get_checkpoint(db, name)
+        if checkpoint is None:
+            checkpoint = models.ReparseCheckpoint(name=name)
+            db.add(checkpoint)
+        elif not restart and checkpoint.finished_at is None and checkpoint.parse_version == parse_version:
+            return checkpoint
+        checkpoint.parse_version = parse_version
+        checkpoint.last_resume_id = 0
+        for count in REPARSE_COUNTS:
+            setattr(checkpoint, count, 0)
+        checkpoint.finished_at = None
+        db.commit()
+        db.refresh(checkpoint)
+        return checkpoint
+
+    @staticmethod
+    def advance(db: Session, checkpoint_id: int, last_resume_id: int, counts: Dict[str, int]) -> None:
+        """Move the checkpoint past a page of resumes; not committed, so it lands with the page's saves"""
+        checkpoint = db.get(models.ReparseCheckpoint, checkpoint_id)
+        checkpoint.last_resume_id = last_resume_id
+        for count in REPARSE_COUNTS:
+            setattr(checkpoint, count, getattr(checkpoint, count) + counts.get(count, 0))
+        db.flush()
+
+    @staticmethod
+    def finish(db: Session, checkpoint_id: int) -> models.ReparseCheckpoint:
+        """Mark the run done; starting it again begins a fresh pass"""
+        checkpoint = db.get(models.ReparseCheckpoint, checkpoint_id)
+        checkpoint.finished_at = datetime.utcnow()
+        db.commit()
+        db.refresh(checkpoint)
+        return checkpoint
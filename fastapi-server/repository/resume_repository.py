@@ -1,99 +1,147 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import models
 import schemas
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Union
 import os
 from fastapi import UploadFile
 import shutil
 from datetime import datetime
-from sqlalchemy import desc
+from sqlalchemy import delete, desc, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def _parse_date(value: Any) -> Optional[datetime]:
+    """Parse an ISO date or datetime string; anything else becomes None."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).replace(tzinfo=None)
+        except ValueError:
+            return None
+    return None
+
+
+def _column_values(model, values: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the keys that are columns of the model, so extra parsed fields can't break the insert."""
+    columns = model.__table__.columns.keys()
+    return {key: value for key, value in values.items() if key in columns}
+
+
+def _work_sort_key(exp: Dict[str, Any]) -> datetime:
+    return _parse_date(exp.get("start_date")) or datetime.min
+
+
+def _dialect_insert(db: Union[Session, AsyncSession]):
+    """The INSERT construct with ON CONFLICT support for the session's database."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"Resume upserts are not supported on {dialect}")
+
+
+def _resume_upsert(db: Union[Session, AsyncSession], user_id: int, file_name: str, parsed_data: Dict[str, Any],
+                   resume_text: Optional[str], parse_version: Optional[str]):
+    """INSERT ... ON CONFLICT (user_id) DO UPDATE for the user's resume row, returning the row."""
+    now = datetime.utcnow()
+    values = dict(
+        user_id=user_id,
+        file_name=file_name,
+        parsed_data=parsed_data,
+        resume_text=resume_text,
+        parse_version=parse_version,
+        created_at=now,
+        updated_at=now
+    )
+    # A re-upload keeps the row's id and created_at, and its stored text unless new text is given
+    updated = {key: value for key, value in values.items() if key not in ("user_id", "created_at")}
+    if resume_text is None:
+        del updated["resume_text"]
+    
+    upsert = _dialect_insert(db)(models.Resume).values(**values)
+    upsert = upsert.on_conflict_do_update(index_elements=[models.Resume.user_id], set_=updated)
+    return upsert.returning(models.Resume).execution_options(populate_existing=True)
+
+
+def _child_rows(parsed_data: Dict[str, Any]) -> List[Tuple[Any, List[Dict[str, Any]]]]:
+    """The education, work experience and skill rows of a parsed resume, by model."""
+    education = [
+        dict(
+            institution=edu.get("institution", ""),
+            degree=edu.get("degree", ""),
+            field_of_study=edu.get("field_of_study", ""),
+            start_date=edu.get("start_date", ""),
+            end_date=edu.get("end_date", ""),
+            description=edu.get("description", "")
+        )
+        for edu in parsed_data.get("education") or []
+    ]
+    
+    # Work experience is stored by start_date in descending order
+    work_experience = []
+    for exp in sorted(parsed_data.get("work_experience") or [], key=_work_sort_key, reverse=True):
+        start_date = _parse_date(exp.get("start_date"))
+        end_date = None if exp.get("is_current_job") else _parse_date(exp.get("end_date"))
+        work_experience.append(_column_values(models.WorkExperience, dict(
+            company=exp.get("company", ""),
+            job_title=exp.get("job_title", ""),
+            start_date=start_date.strftime("%Y-%m-%d") if start_date else None,
+            end_date=end_date.strftime("%Y-%m-%d") if end_date else None,
+            is_current_job=exp.get("is_current_job", False),
+            description=exp.get("description", "")
+        )))
+    
+    skills = [
+        dict(name=skill.get("name", ""), category=skill.get("category", ""))
+        for skill in parsed_data.get("skills") or []
+    ]
+    return [(models.Education, education), (models.WorkExperience, work_experience), (models.Skill, skills)]
+
+
+def _replace_children_statements(resume_id: int, parsed_data: Dict[str, Any]):
+    """Statements and parameters replacing a resume's child rows: one DELETE and one executemany INSERT per table."""
+    for model, rows in _child_rows(parsed_data):
+        yield delete(model).where(model.resume_id == resume_id).execution_options(synchronize_session=False), None
+        if rows:
+            yield insert(model), [{**row, "resume_id": resume_id} for row in rows]
+
+
+def _sort_work_experience(resume: Optional[models.Resume]) -> Optional[models.Resume]:
+    if resume and resume.parsed_data and "work_experience" in resume.parsed_data:
+        # Sort work experience by start_date in descending order
+        resume.parsed_data["work_experience"] = sorted(
+            resume.parsed_data["work_experience"],
+            key=_work_sort_key,
+            reverse=True
+        )
+    return resume
+
 
 class ResumeRepository:
     @staticmethod
-    def save_parsed_resume(db: Session, user_id: int, file_name: str, parsed_data: Dict[str, Any]) -> models.Resume:
-        """Save or update parsed resume data"""
-        # Check if resume exists
-        db_resume = db.query(models.Resume).filter(models.Resume.user_id == user_id).first()
-        
-        if db_resume:
-            # Delete existing work experiences
-            db.query(models.WorkExperience).filter(models.WorkExperience.resume_id == db_resume.id).delete()
-            db_resume.file_name = file_name
-            db_resume.parsed_data = parsed_data
-            db_resume.updated_at = datetime.utcnow()
-        else:
-            # Create new resume
-            db_resume = models.Resume(
-                user_id=user_id,
-                file_name=file_name,
-                parsed_data=parsed_data,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            db.add(db_resume)
-            db.flush()  # Get the ID without committing
-        
-        # Add education entries
-        if "education" in parsed_data and parsed_data["education"]:
-            for edu in parsed_data["education"]:
-                db_edu = models.Education(
-                    resume_id=db_resume.id,
-                    institution=edu.get("institution", ""),
-                    degree=edu.get("degree", ""),
-                    field_of_study=edu.get("field_of_study", ""),
-                    start_date=edu.get("start_date", ""),
-                    end_date=edu.get("end_date", ""),
-                    description=edu.get("description", "")
-                )
-                db.add(db_edu)
-        
-        # Add work experience entries
-        if "work_experience" in parsed_data and parsed_data["work_experience"]:
-            # Sort work experiences by start_date in descending order
-            work_experiences = sorted(
-                parsed_data["work_experience"],
-                key=lambda x: datetime.strptime(x.get("start_date", "1900-01-01"), "%Y-%m-%d") if isinstance(x.get("start_date"), str) else x.get("start_date", datetime.min),
-                reverse=True
-            )
-            
-            for exp in work_experiences:
-                start_date = exp.get("start_date")
-                if isinstance(start_date, str):
-                    try:
-                        start_date = datetime.strptime(start_date, "%Y-%m-%d")
-                    except ValueError:
-                        start_date = None
-
-                end_date = exp.get("end_date")
-                if isinstance(end_date, str) and not exp.get("is_current_job"):
-                    try:
-                        end_date = datetime.strptime(end_date, "%Y-%m-%d")
-                    except ValueError:
-                        end_date = None
-                elif exp.get("is_current_job"):
-                    end_date = None
-
-                db_exp = models.WorkExperience(
-                    resume_id=db_resume.id,
-                    company=exp.get("company", ""),
-                    job_title=exp.get("job_title", ""),
-                    start_date=start_date,
-                    end_date=end_date,
-                    is_current_job=exp.get("is_current_job", False),
-                    description=exp.get("description", "")
-                )
-                db.add(db_exp)
-        
-        # Add skills
-        if "skills" in parsed_data and parsed_data["skills"]:
-            for skill in parsed_data["skills"]:
-                db_skill = models.Skill(
-                    resume_id=db_resume.id,
-                    name=skill.get("name", ""),
-                    category=skill.get("category", "")
-                )
-                db.add(db_skill)
+    def save_parsed_resume(db: Session, user_id: int, file_name: str, parsed_data: Dict[str, Any],
+                           commit: bool = True, resume_text: Optional[str] = None,
+                           parse_version: Optional[str] = None) -> models.Resume:
+        """Save or update parsed resume data; with commit=False it is only flushed, for the caller to commit in a batch
+
+        parse_version is the parser version that produced parsed_data from resume_text; data saved without one
+        (edited by hand) is never re-parsed.
+        """
+        # Insert or update the user's resume in one statement, so concurrent uploads can't both insert
+        db_resume = db.execute(
+            _resume_upsert(db, user_id, file_name, parsed_data, resume_text, parse_version)
+        ).scalar_one()
+        for statement, params in _replace_children_statements(db_resume.id, parsed_data):
+            db.execute(statement, params)
+        # The relationship collections would otherwise still hold the rows replaced above
+        db.expire(db_resume, ["education", "work_experience", "skills"])
         
+        if not commit:
+            db.flush()
+            return db_resume
         db.commit()
         db.refresh(db_resume)
         return db_resume
@@ -101,15 +149,24 @@ class ResumeRepository:
     @staticmethod
     def get_resume(db: Session, user_id: int) -> Optional[models.Resume]:
         """Get resume by user ID with sorted work experience"""
-        resume = db.query(models.Resume).filter(models.Resume.user_id == user_id).first()
-        if resume and resume.parsed_data and "work_experience" in resume.parsed_data:
-            # Sort work experience by start_date in descending order
-            resume.parsed_data["work_experience"] = sorted(
-                resume.parsed_data["work_experience"],
-                key=lambda x: datetime.strptime(x.get("start_date", "1900-01-01"), "%Y-%m-%d") if isinstance(x.get("start_date"), str) else x.get("start_date", datetime.min),
-                reverse=True
+        return _sort_work_experience(db.query(models.Resume).filter(models.Resume.user_id == user_id).first())
+
+    @staticmethod
+    def get_resumes_to_reparse(db: Session, parse_version: str, after_id: int = 0,
+                               limit: int = 100) -> List[models.Resume]:
+        """Next page, by id, of parsed resumes with stored text from a parse_version other than the given one"""
+        return (
+            db.query(models.Resume)
+            .filter(
+                models.Resume.id > after_id,
+                models.Resume.resume_text.isnot(None),
+                models.Resume.parse_version.isnot(None),
+                models.Resume.parse_version != parse_version
             )
-        return resume
+            .order_by(models.Resume.id)
+            .limit(limit)
+            .all()
+        )
 
     @staticmethod
     def delete_resume(db: Session, user_id: int) -> bool:
@@ -120,4 +177,41 @@ class ResumeRepository:
             db.delete(db_resume)
             db.commit()
             return True
-        return False 
\ No newline at end of file
+        return False 
+
+
+class AsyncResumeRepository:
+    """ResumeRepository's reads and writes for AsyncSession, for routes that await the database."""
+
+    @staticmethod
+    async def save_parsed_resume(db: AsyncSession, user_id: int, file_name: str, parsed_data: Dict[str, Any],
+                                 resume_text: Optional[str] = None,
+                                 parse_version: Optional[str] = None) -> models.Resume:
+        """Save or update parsed resume data, as ResumeRepository.save_parsed_resume"""
+        db_resume = (await db.execute(
+            _resume_upsert(db, user_id, file_name, parsed_data, resume_text, parse_version)
+        )).scalar_one()
+        for statement, params in _replace_children_statements(db_resume.id, parsed_data):
+            await db.execute(statement, params)
+        # The relationship collections would otherwise still hold the rows replaced above
+        db.expire(db_resume, ["education", "work_experience", "skills"])
+        await db.commit()
+        await db.refresh(db_resume)
+        return db_resume
+
+    @staticmethod
+    async def get_resume(db: AsyncSession, user_id: int) -> Optional[models.Resume]:
+        """Get resume by user ID with sorted work experience"""
+        result = await db.execute(select(models.Resume).where(models.Resume.user_id == user_id))
+        return _sort_work_experience(result.scalars().first())
+
+    @staticmethod
+    async def delete_resume(db: AsyncSession, user_id: int) -> bool:
+        """Delete resume"""
+        db_resume = await AsyncResumeRepository.get_resume(db, user_id)
+        if db_resume:
+            await db.delete(db_resume)
+            await db.commit()
+            return True
+        return False
+
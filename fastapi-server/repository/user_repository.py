@@ -1,4 +1,6 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 import sys
 import os
 
@@ -6,7 +8,8 @@ import os
 
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from models import User, Profile, Resume, Education, WorkExperience, Skill
+from models import User, Profile, Resume
+from repository.resume_repository import ResumeRepository, AsyncResumeRepository
 from schemas.user_schemas import UserCreate, ProfileCreate, OnboardingStatus
 from typing import Optional, List, Dict, Any
 
@@ -33,6 +36,21 @@ class UserRepository:
         """Get user by email"""
         return db.query(User).filter(User.email == email).first()
     
+    @staticmethod
+    def get_or_create_user_by_email(db: Session, email: str, commit: bool = True) -> User:
+        """Get the user with an email, creating it if there is none; with commit=False a new user is only flushed"""
+        db_user = UserRepository.get_user_by_email(db, email)
+        if db_user:
+            return db_user
+        db_user = User(email=email, onboarding_status=OnboardingStatus.NOT_STARTED.value)
+        db.add(db_user)
+        if commit:
+            db.commit()
+            db.refresh(db_user)
+        else:
+            db.flush()
+        return db_user
+    
     @staticmethod
     def create_user_profile(db: Session, profile: ProfileCreate, user_id: int) -> Profile:
         """Create or update user profile"""
@@ -59,75 +77,15 @@ class UserRepository:
     
     @staticmethod
     def save_resume(db: Session, user_id: int, file_name: str, parsed_data: Dict[str, Any]) -> Resume:
-        """Save or update resume data"""
-        # Check if resume exists
-        db_resume = db.query(Resume).filter(Resume.user_id == user_id).first()
-        
-        if db_resume:
-            # Update existing resume
-            db_resume.file_name = file_name
-            db_resume.parsed_data = parsed_data
-            
-            # Clean up old relations
-            db.query(Education).filter(Education.resume_id == db_resume.id).delete()
-            db.query(WorkExperience).filter(WorkExperience.resume_id == db_resume.id).delete()
-            db.query(Skill).filter(Skill.resume_id == db_resume.id).delete()
-        else:
-            # Create new resume
-            db_resume = Resume(
-                user_id=user_id,
-                file_name=file_name,
-                parsed_data=parsed_data
-            )
-            db.add(db_resume)
-            db.commit()
-            db.refresh(db_resume)
-        
-        # Add education entries
-        if "education" in parsed_data and parsed_data["education"]:
-            for edu in parsed_data["education"]:
-                db_edu = Education(
-                    resume_id=db_resume.id,
-                    institution=edu.get("institution", ""),
-                    degree=edu.get("degree", ""),
-                    field_of_study=edu.get("field_of_study", ""),
-                    start_date=edu.get("start_date", ""),
-                    end_date=edu.get("end_date", ""),
-                    description=edu.get("description", "")
-                )
-                db.add(db_edu)
-        
-        # Add work experience entries
-        if "work_experience" in parsed_data and parsed_data["work_experience"]:
-            for exp in parsed_data["work_experience"]:
-                db_exp = WorkExperience(
-                    resume_id=db_resume.id,
-                    company=exp.get("company", ""),
-                    job_title=exp.get("job_title", ""),
-                    start_date=exp.get("start_date", ""),
-                    end_date=exp.get("end_date", ""),
-                    description=exp.get("description", "")
-                )
-                db.add(db_exp)
-        
-        # Add skills
-        if "skills" in parsed_data and parsed_data["skills"]:
-            for skill in parsed_data["skills"]:
-                db_skill = Skill(
-                    resume_id=db_resume.id,
-                    name=skill.get("name", ""),
-                    category=skill.get("category", "")
-                )
-                db.add(db_skill)
-        
-        db.commit()
-        db.refresh(db_resume)
-        return db_resume
+        """Save or update resume data, as one upsert of the user's resume row"""
+        return ResumeRepository.save_parsed_resume(db, user_id, file_name, parsed_data)
     
     @staticmethod
     def get_user_with_profile_and_resume(db: Session, user_id: int) -> Optional[User]:
-        """Get user with profile and resume data"""
-        return db.query(User).filter(User.id == user_id).first()
+        """Get user with profile and resume data, loaded together in one joined query"""
+        return db.query(User).options(
+            joinedload(User.profile), joinedload(User.resume)
+        ).filter(User.id == user_id).first()
     
     @staticmethod
     def update_onboarding_status(db: Session, user_id: int, status: OnboardingStatus) -> User:
@@ -137,4 +95,77 @@ class UserRepository:
             db_user.onboarding_status = status.value
             db.commit()
             db.refresh(db_user)
-        return db_user 
\ No newline at end of file
+        return db_user
+
+
+class AsyncUserRepository:
+    """UserRepository for AsyncSession, for routes that await the database.
+
+    Relationships can't lazy load under asyncio, so reads that are serialized
+    with the profile or resume load them up front.
+    """
+
+    @staticmethod
+    async def create_user(db: AsyncSession, user: UserCreate) -> User:
+        """Create a new user"""
+        db_user = User(
+            email=user.email,
+            onboarding_status=OnboardingStatus.NOT_STARTED.value
+        )
+        db.add(db_user)
+        await db.commit()
+        await db.refresh(db_user)
+        return db_user
+
+    @staticmethod
+    async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
+        """Get user by ID"""
+        return (await db.execute(select(User).where(User.id == user_id))).scalars().first()
+
+    @staticmethod
+    async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+        """Get user by email"""
+        return (await db.execute(select(User).where(User.email == email))).scalars().first()
+
+    @staticmethod
+    async def create_user_profile(db: AsyncSession, profile: ProfileCreate, user_id: int) -> Profile:
+        """Create or update user profile"""
+        db_profile = (await db.execute(select(Profile).where(Profile.user_id == user_id))).scalars().first()
+        profile_data = profile.model_dump(exclude_unset=True)
+        if db_profile:
+            for field, value in profile_data.items():
+                setattr(db_profile, field, value)
+        else:
+            db_profile = Profile(user_id=user_id, **profile_data)
+            db.add(db_profile)
+
+        await db.commit()
+        await db.refresh(db_profile)
+        return db_profile
+
+    @staticmethod
+    async def save_resume(db: AsyncSession, user_id: int, file_name: str, parsed_data: Dict[str, Any]) -> Resume:
+        """Save or update resume data, as one upsert of the user's resume row"""
+        return await AsyncResumeRepository.save_parsed_resume(db, user_id, file_name, parsed_data)
+
+    @staticmethod
+    async def get_user_with_profile_and_resume(db: AsyncSession, user_id: int) -> Optional[User]:
+        """Get user with profile and resume data, loaded together in one joined query"""
+        result = await db.execute(
+            select(User).options(joinedload(User.profile), joinedload(User.resume))
+            .where(User.id == user_id)
+            # Refill a user already in the session, which may have been loaded without them
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    async def update_onboarding_status(db: AsyncSession, user_id: int, status: OnboardingStatus) -> User:
+        """Update user's onboarding status"""
+        db_user = await AsyncUserRepository.get_user(db, user_id)
+        if db_user:
+            db_user.onboarding_status = status.value
+            await db.commit()
+            await db.refresh(db_user)
+        return db_user
+
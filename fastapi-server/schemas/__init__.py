@@ -20,8 +20,15 @@ from .resume_schemas import (
     WorkExperience,
     Skill,
     ResumeData,
+    PartialResumeData,
+    PersonalInfoSection,
+    EducationSection,
+    WorkExperienceSection,
+    SkillsSection,
     ResumeResponse,
-    ResumeParseResponse
+    StoredResumeResponse,
+    ResumeParseResponse,
+    ParseJobResponse
 )
 
 __all__ = [
@@ -39,6 +46,13 @@ __all__ = [
     'WorkExperience',
     'Skill',
     'ResumeData',
+    'PartialResumeData',
+    'PersonalInfoSection',
+    'EducationSection',
+    'WorkExperienceSection',
+    'SkillsSection',
     'ResumeResponse',
-    'ResumeParseResponse'
+    'StoredResumeResponse',
+    'ResumeParseResponse',
+    'ParseJobResponse'
 ] 
\ No newline at end of file
@@ -93,12 +93,64 @@ class ResumeData(BaseModel):
             raise ValueError("skills must contain at least one entry")
         return v
 
+class PartialResumeData(BaseModel):
+    """Resume data extracted from one chunk of a longer resume; every section may be empty."""
+    model_config = ConfigDict(from_attributes=True)
+    personal_info: Optional[PersonalInfo] = Field(None, description="Personal information found in this excerpt")
+    education: List[Education] = Field(default_factory=list, description="Education entries found in this excerpt")
+    work_experience: List[WorkExperience] = Field(default_factory=list, description="Work experience entries found in this excerpt")
+    skills: List[Skill] = Field(default_factory=list, description="Skills found in this excerpt")
+
+class PersonalInfoSection(BaseModel):
+    """Personal information extracted on its own in section fan-out mode."""
+    personal_info: PersonalInfo = Field(..., description="Personal information")
+
+class EducationSection(BaseModel):
+    """Education entries extracted on their own in section fan-out mode."""
+    education: List[Education] = Field(default_factory=list, description="List of education entries")
+
+class WorkExperienceSection(BaseModel):
+    """Work experience entries extracted on their own in section fan-out mode."""
+    work_experience: List[WorkExperience] = Field(default_factory=list, description="List of work experience entries")
+
+class SkillsSection(BaseModel):
+    """Skills extracted on their own in section fan-out mode."""
+    skills: List[Skill] = Field(default_factory=list, description="List of skills")
+
 class ResumeResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     status: str = Field(..., description="Status of the parsing operation")
     message: str = Field(..., description="Message describing the operation result")
     data: Optional[ResumeData] = Field(None, description="Parsed resume data")
     error: Optional[str] = Field(None, description="Error message if any")
+    timings: Optional[Dict[str, float]] = Field(None, description="Seconds spent in each LLM call, by section or chunk, and in PDF extraction and its slowest pages")
+    repairs: Optional[Dict[str, int]] = Field(None, description="Local fixes applied to the LLM output, by kind")
+    tokens_saved: Optional[int] = Field(None, description="Estimated prompt tokens removed by the rule-based pre-pass")
+    served_by: Optional[str] = Field(None, description="Model tier that produced the data, or cache")
+
+class StoredResumeResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int = Field(..., description="Resume ID")
+    user_id: Optional[int] = Field(None, description="User the resume belongs to")
+    file_name: Optional[str] = Field(None, description="Uploaded file name")
+    parsed_data: Optional[Dict[str, Any]] = Field(None, description="The saved parse, including fields without a column")
+    parse_version: Optional[str] = Field(None, description="Parser version that produced the data; None for hand edits")
+    created_at: Optional[datetime] = Field(None, description="When the resume was first saved")
+    updated_at: Optional[datetime] = Field(None, description="When the resume was last saved")
+
+class ParseJobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int = Field(..., description="Job ID")
+    user_id: Optional[int] = Field(None, description="User the resume is saved for")
+    file_name: Optional[str] = Field(None, description="Uploaded file name")
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    attempts: int = Field(..., description="Attempts started so far")
+    max_attempts: int = Field(..., description="Attempts allowed before the job fails")
+    run_at: Optional[datetime] = Field(None, description="Earliest time the next attempt may start")
+    error: Optional[str] = Field(None, description="Error from the last failed attempt")
+    result: Optional[Dict[str, Any]] = Field(None, description="The /api/resume/parse response, once finished")
+    created_at: Optional[datetime] = Field(None, description="When the job was queued")
+    finished_at: Optional[datetime] = Field(None, description="When the job succeeded or failed")
 
 class ResumeParseResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
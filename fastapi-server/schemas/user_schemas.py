@@ -3,6 +3,8 @@ from typing import Optional, List
 from datetime import datetime
 from enum import Enum
 
+from .resume_schemas import StoredResumeResponse
+
 class OnboardingStatus(str, Enum):
     NOT_STARTED = "not_started"
     PARTIAL = "partial" 
@@ -49,4 +51,4 @@ class ProfileResponse(ProfileBase):
 # Combined response schemas
 class UserProfileResumeResponse(UserResponse):
     profile: Optional[ProfileResponse] = None
-    resume: Optional[dict] = None 
\ No newline at end of file
+    resume: Optional[StoredResumeResponse] = None
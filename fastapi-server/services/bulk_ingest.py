@@ -0,0 +1,324 @@
+import os
+import time
+import asyncio
+import logging
+import zipfile
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from repository.resume_repository import ResumeRepository
+from repository.user_repository import UserRepository
+from services.llm_scheduler import PRIORITY_BACKGROUND, llm_priority
+from services.resume_stream import StreamEvent
+from services.upload_spooler import SpooledUpload, UploadRejected, spool_upload
+
+logger = logging.getLogger(__name__)
+
+BULK_MAX_FILES = int(os.getenv("BULK_MAX_FILES", "5000"))  # Resumes accepted per batch, archives counted by entry
+BULK_MAX_UPLOAD_SIZE = int(os.getenv("BULK_MAX_UPLOAD_SIZE", str(512 * 1024 * 1024)))  # Whole request body
+BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", "8"))  # Resumes extracted and parsed at once
+BULK_COMMIT_SIZE = int(os.getenv("BULK_COMMIT_SIZE", "50"))  # Parsed resumes saved per commit
+BULK_COMMIT_SECONDS = float(os.getenv("BULK_COMMIT_SECONDS", "2"))  # Longest a parsed resume waits to be saved
+
+EVENT_FILE = "file"
+EVENT_SUMMARY = "summary"
+
+FILE_SAVED = "saved"
+FILE_DUPLICATE = "duplicate"
+FILE_REJECTED = "rejected"
+FILE_FAILED = "failed"
+FILE_STATUSES = (FILE_SAVED, FILE_DUPLICATE, FILE_REJECTED, FILE_FAILED)
+
+ZIP_EXTENSION = ".zip"
+
+
+class ZipEntryReader:
+    """Async reader over one archive entry, decompressed a chunk at a time in the threadpool."""
+
+    def __init__(self, archive: zipfile.ZipFile, info: zipfile.ZipInfo):
+        self.filename = info.filename
+        self._entry = archive.open(info)
+
+    async def read(self, size: int) -> bytes:
+        return await run_in_threadpool(self._entry.read, size)
+
+    def close(self) -> None:
+        self._entry.close()
+
+
+def _is_resume_entry(info: zipfile.ZipInfo) -> bool:
+    name = os.path.basename(info.filename)
+    return not info.is_dir() and bool(name) and not name.startswith(".") and "__MACOSX/" not in info.filename
+
+
+@dataclass
+class ParsedFile:
+    """A parsed resume waiting for its batch to be saved."""
+    index: int
+    file_name: str
+    user_id: Optional[int]
+    email: Optional[str]
+    resume_text: str
+    parsed_data: Dict[str, Any]
+    served_by: Optional[str]
+
+
+class BulkIngestor:
+    """Parses a batch of uploaded resumes and saves them in batched commits.
+
+    Uploads may be resume files or ZIP archives of them; archive entries are
+    read one at a time straight from the uploaded file, never extracted as a
+    whole. Identical files are parsed once. At most concurrency resumes are
+    extracted and parsed at a time, at background LLM priority.
+
+    Each resume is saved for user_id, or for the user user_map gives its file
+    name to, looked up by the full archive path first and then the bare name.
+    With match_email it is saved instead for the user with the email address
+    in it, who is created if needed. A batch saves one resume per user: a
+    second file for a user already claimed is reported as an error rather
+    than replacing the first.
+    """
+
+    def __init__(self, parser, session_factory: Callable[[], Session], user_id: Optional[int] = None,
+                 user_map: Optional[Dict[str, int]] = None, match_email: bool = False,
+                 concurrency: int = BULK_CONCURRENCY, commit_size: int = BULK_COMMIT_SIZE,
+                 commit_seconds: float = BULK_COMMIT_SECONDS, max_files: int = BULK_MAX_FILES):
+        if match_email != (user_id is None and user_map is None):
+            raise ValueError("Save a batch either for user_id or user_map, or by match_email")
+        self.parser = parser
+        self.session_factory = session_factory
+        self.user_id = user_id
+        self.user_map = user_map
+        self.match_email = match_email
+        self.concurrency = concurrency
+        self.commit_size = commit_size
+        self.commit_seconds = commit_seconds
+        self.max_files = max_files
+
+    def _mapped_user(self, file_name: str) -> Optional[int]:
+        """The user a resume is saved for, when it isn't matched by email."""
+        if self.user_map is None:
+            return self.user_id
+        return self.user_map.get(file_name, self.user_map.get(os.path.basename(file_name)))
+
+    @staticmethod
+    def _claim(claims: Dict[Any, str], owner: Any, file_name: str) -> Optional[str]:
+        """Claim owner for a file, or the file that already has."""
+        if owner in claims:
+            return claims[owner]
+        claims[owner] = file_name
+        return None
+
+    async def _entries(self, files: List[Any], report: Callable[[Dict[str, Any]], None]) -> AsyncIterator[Any]:
+        """Each uploaded resume, with archives expanded into their entries."""
+        for file in files:
+            file_name = getattr(file, "filename", None) or ""
+            if not file_name.lower().endswith(ZIP_EXTENSION):
+                yield file
+                continue
+            try:
+                archive = await run_in_threadpool(zipfile.ZipFile, file.file)
+            except zipfile.BadZipFile:
+                report({"file_name": file_name, "status": FILE_REJECTED, "error": "Not a valid ZIP archive"})
+                continue
+            with archive:
+                for info in archive.infolist():
+                    if not _is_resume_entry(info):
+                        continue
+                    entry = ZipEntryReader(archive, info)
+                    try:
+                        yield entry
+                    finally:
+                        entry.close()
+
+    async def _produce(self, files: List[Any], spooled: asyncio.Queue, claims: Dict[Any, str], report) -> None:
+        """Spool each resume in turn, reporting rejected and duplicate files straight away."""
+        seen: Dict[Tuple[str, Optional[int]], str] = {}
+        index = 0
+        async for file in self._entries(files, report):
+            file_name = getattr(file, "filename", None) or ""
+            if index >= self.max_files:
+                report({"file_name": file_name, "status": FILE_REJECTED,
+                        "error": f"Batch limit of {self.max_files} files reached"})
+                continue
+            index += 1
+            user_id = None if self.match_email else self._mapped_user(file_name)
+            if user_id is None and not self.match_email:
+                report({"index": index, "file_name": file_name, "status": FILE_REJECTED,
+                        "error": "No user mapped to this file"})
+                continue
+            try:
+                upload = await spool_upload(file)
+            except UploadRejected as e:
+                report({"index": index, "file_name": file_name, "status": FILE_REJECTED, "error": str(e)})
+                continue
+            # The same file for two different users is saved for both; the parse cache makes the repeat parse free
+            seen_key = (upload.sha256, user_id)
+            if seen_key in seen:
+                upload.cleanup()
+                report({"index": index, "file_name": file_name, "status": FILE_DUPLICATE, "duplicate_of": seen[seen_key]})
+                continue
+            seen[seen_key] = file_name
+            if user_id is not None and (claimed_by := self._claim(claims, user_id, file_name)):
+                upload.cleanup()
+                report({"index": index, "file_name": file_name, "status": FILE_REJECTED,
+                        "error": f"{claimed_by} in this batch is already saved for user {user_id}"})
+                continue
+            # Blocks while every parse slot is busy, so spooled files never pile up
+            await spooled.put((index, upload, user_id))
+
+    async def _parse(self, index: int, upload: SpooledUpload, user_id: Optional[int], mode: Optional[str]):
+        """Extract and parse one spooled resume; a ParsedFile, or the failure to report."""
+        failed = {"index": index, "file_name": upload.file_name, "status": FILE_FAILED}
+        try:
+            resume_text = await self.parser.extract_text_from_upload(upload)
+        except Exception as e:
+            return {**failed, "error": str(e)}
+        if not resume_text:
+            return {**failed, "error": "Could not extract text from file"}
+
+        db = self.session_factory()
+        try:
+            with llm_priority(PRIORITY_BACKGROUND):
+                response = await self.parser.aparse_text(resume_text, db, mode)
+        finally:
+            await run_in_threadpool(db.close)
+        if response.status != "success":
+            return {**failed, "error": response.error or response.message}
+        email = response.data.personal_info.email
+        if self.match_email and not email:
+            return {**failed, "error": "No email address in the resume to match a user"}
+        return ParsedFile(index, upload.file_name, user_id, email, resume_text, response.data.model_dump(mode="json"),
+                          response.served_by)
+
+    async def _parse_loop(self, spooled: asyncio.Queue, parsed: asyncio.Queue, mode: Optional[str],
+                          claims: Dict[Any, str], report) -> None:
+        while (item := await spooled.get()) is not None:
+            index, upload, user_id = item
+            with upload:
+                result = await self._parse(index, upload, user_id, mode)
+            if not isinstance(result, ParsedFile):
+                report(result)
+            elif self.match_email and (claimed_by := self._claim(claims, result.email.lower(), result.file_name)):
+                report({"index": index, "file_name": result.file_name, "status": FILE_FAILED,
+                        "error": f"{claimed_by} in this batch has the same email address, {result.email}"})
+            else:
+                await parsed.put(result)
+
+    def _save_one(self, db: Session, item: ParsedFile) -> Tuple[int, int]:
+        if item.user_id is None:
+            user = UserRepository.get_or_create_user_by_email(db, item.email, commit=False)
+        else:
+            user = UserRepository.get_user(db, item.user_id)
+            if user is None:
+                raise LookupError(f"User {item.user_id} not found")
+        resume = ResumeRepository.save_parsed_resume(
+            db, user.id, item.file_name, item.parsed_data, commit=False,
+            resume_text=item.resume_text, parse_version=self.parser.parse_version
+        )
+        return user.id, resume.id
+
+    def _save_batch(self, batch: List[ParsedFile]) -> List[Dict[str, Any]]:
+        """Save a batch in one commit; if that fails, save its resumes one by one to isolate the bad one."""
+        db = self.session_factory()
+        try:
+            try:
+                saved = [self._save_one(db, item) for item in batch]
+                db.commit()
+                return [self._saved(item, *ids) for item, ids in zip(batch, saved)]
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Saving a batch of {len(batch)} resumes failed, saving them one by one: {e}")
+
+            results = []
+            for item in batch:
+                try:
+                    ids = self._save_one(db, item)
+                    db.commit()
+                    results.append(self._saved(item, *ids))
+                except Exception as e:
+                    db.rollback()
+                    results.append({"index": item.index, "file_name": item.file_name, "status": FILE_FAILED,
+                                    "error": f"Failed to save resume: {e}"})
+            return results
+        finally:
+            db.close()
+
+    def _saved(self, item: ParsedFile, user_id: int, resume_id: int) -> Dict[str, Any]:
+        return {"index": item.index, "file_name": item.file_name, "status": FILE_SAVED, "user_id": user_id,
+                "resume_id": resume_id, "email": item.email, "served_by": item.served_by}
+
+    async def _save_loop(self, parsed: asyncio.Queue, report) -> None:
+        """Save parsed resumes once commit_size are waiting or the oldest has waited commit_seconds."""
+        loop = asyncio.get_running_loop()
+        batch: List[ParsedFile] = []
+        deadline = None
+        done = False
+        while not done:
+            try:
+                timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                item = await asyncio.wait_for(parsed.get(), timeout)
+                if item is None:
+                    done = True
+                else:
+                    batch.append(item)
+                    deadline = deadline or loop.time() + self.commit_seconds
+            except asyncio.TimeoutError:
+                pass
+            if batch and (done or len(batch) >= self.commit_size or loop.time() >= deadline):
+                for result in await run_in_threadpool(self._save_batch, batch):
+                    report(result)
+                batch, deadline = [], None
+
+    async def _pipeline(self, files: List[Any], mode: Optional[str], report) -> None:
+        spooled: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        parsed: asyncio.Queue = asyncio.Queue()
+        # The file each user, or email address, in the batch is saved from
+        claims: Dict[Any, str] = {}
+        saver = asyncio.ensure_future(self._save_loop(parsed, report))
+        parsers = [
+            asyncio.ensure_future(self._parse_loop(spooled, parsed, mode, claims, report))
+            for _ in range(self.concurrency)
+        ]
+        try:
+            try:
+                await self._produce(files, spooled, claims, report)
+            finally:
+                for _ in parsers:
+                    await spooled.put(None)
+            await asyncio.gather(*parsers)
+            await parsed.put(None)
+            await saver
+        finally:
+            for task in (*parsers, saver):
+                if not task.done():
+                    task.cancel()
+
+    async def run(self, files: List[Any], mode: Optional[str] = None) -> AsyncIterator[StreamEvent]:
+        """Yield a ("file", result) event as each file is saved or given up on, then ("summary", counts)."""
+        started = time.perf_counter()
+        events: asyncio.Queue = asyncio.Queue()
+        counts = Counter()
+
+        def report(result: Dict[str, Any]) -> None:
+            counts[result["status"]] += 1
+            events.put_nowait((EVENT_FILE, result))
+
+        pipeline = asyncio.ensure_future(self._pipeline(files, mode, report))
+        pipeline.add_done_callback(lambda _: events.put_nowait(None))
+        try:
+            while (event := await events.get()) is not None:
+                yield event
+            pipeline.result()
+        finally:
+            # A client that disconnects stops the batch; resumes already saved stay saved
+            if not pipeline.done():
+                pipeline.cancel()
+
+        summary = {status: counts[status] for status in FILE_STATUSES}
+        yield EVENT_SUMMARY, {"total": sum(summary.values()), **summary,
+                              "seconds": round(time.perf_counter() - started, 3)}
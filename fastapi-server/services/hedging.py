@@ -0,0 +1,151 @@
+import os
+import math
+import asyncio
+import logging
+import threading
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Opt-in: send a second identical call when the first is slower than most recent calls
+LLM_HEDGING = os.getenv("LLM_HEDGING", "false").lower() in ("1", "true", "yes")
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_BUDGET = int(os.getenv("LLM_HEDGE_BUDGET", "1"))  # Extra calls allowed per parse
+LLM_HEDGE_MODEL = os.getenv("LLM_HEDGE_MODEL", "")  # Model for the second call; empty means the same model
+LLM_HEDGE_MIN_SAMPLES = 20  # Don't hedge until the latency percentile means something
+LLM_HEDGE_WINDOW = 200  # Recent latencies kept per kind of call
+
+HEDGE_FIRED = "fired"
+HEDGE_WON = "won"
+HEDGE_LOST = "lost"
+HEDGE_OVER_BUDGET = "over_budget"
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies."""
+
+    def __init__(self, window: int = LLM_HEDGE_WINDOW, min_samples: int = LLM_HEDGE_MIN_SAMPLES):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    async def time(self, work: Callable[[], Awaitable[T]]) -> T:
+        """Await work and record how long it took, whether it answered, failed or timed out.
+
+        A call cancelled before it finished, like a hedge's loser, is not recorded,
+        since it would have taken longer than it got to run.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            result = await work()
+        except Exception:
+            # Timeouts and errors count too: leaving them out would make slow providers look fast
+            self.record(loop.time() - started)
+            raise
+        self.record(loop.time() - started)
+        return result
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Nearest-rank percentile, or None while there are too few samples."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        rank = max(0, min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+
+class Hedger:
+    """Runs a call and, if it is slow, a backup copy of it; the first successful answer wins.
+
+    Latency is tracked per kind of call (model and output schema), since a
+    single-section call and a whole-resume call have very different normal times.
+    """
+
+    def __init__(self, percentile: float = LLM_HEDGE_PERCENTILE, budget: int = LLM_HEDGE_BUDGET,
+                 hedge_model: str = LLM_HEDGE_MODEL, min_samples: int = LLM_HEDGE_MIN_SAMPLES):
+        self.percentile = percentile
+        self.budget = budget
+        self.hedge_model = hedge_model or None
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._counts = Counter()
+
+    def tracker(self, key: str) -> LatencyTracker:
+        with self._lock:
+            if key not in self._trackers:
+                self._trackers[key] = LatencyTracker(min_samples=self.min_samples)
+            return self._trackers[key]
+
+    def _record(self, outcome: str) -> None:
+        with self._lock:
+            self._counts[outcome] += 1
+
+    async def run(self, key: str, primary: Callable[[], Awaitable[T]], backup: Callable[[], Awaitable[T]],
+                  spend: Callable[[], bool]) -> T:
+        """Await primary, starting backup once primary outlives the latency percentile.
+
+        spend is asked before hedging and returns False when the caller's hedge budget is used up.
+        The losing call is cancelled; if one call fails, the other's answer is used. primary and
+        backup record their own latency around just the provider call, so time spent queued for
+        a concurrency slot doesn't count; only primary's goes into tracker(key), which sets the delay.
+        """
+        delay = self.tracker(key).percentile(self.percentile)
+        first = asyncio.ensure_future(primary())
+        tasks = [first]
+        try:
+            if delay is None:
+                return await first
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return first.result()
+            if not spend():
+                self._record(HEDGE_OVER_BUDGET)
+                return await first
+
+            logger.debug(f"Hedging {key} call still running after {delay:.2f}s")
+            self._record(HEDGE_FIRED)
+            second = asyncio.ensure_future(backup())
+            tasks.append(second)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self._record(HEDGE_WON if task is second else HEDGE_LOST)
+                        return task.result()
+            # Both calls failed; report the original error
+            self._record(HEDGE_LOST)
+            return first.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # A loser's error is expected; mark it as seen
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+            keys = list(self._trackers)
+        return {
+            "enabled": LLM_HEDGING,
+            "percentile": self.percentile,
+            "budget": self.budget,
+            "hedge_model": self.hedge_model,
+            "hedges": counts,
+            "delays": {key: self.tracker(key).percentile(self.percentile) for key in keys}
+        }
+
+
+# Process-wide hedger, read by the hedge stats endpoint
+hedger = Hedger()
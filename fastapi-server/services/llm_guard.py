@@ -0,0 +1,322 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import anthropic
+import openai
+
+from services.llm_scheduler import (
+    PRIORITY_INTERACTIVE, PRIORITY_DEADLINES, QueueDeadlineExceeded, WeightedFairQueue, current_priority
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Adaptive concurrency: the limit grows by about one per limit's worth of good calls and halves on overload
+LLM_CONCURRENCY_INITIAL = int(os.getenv("LLM_CONCURRENCY_INITIAL", "16"))
+LLM_CONCURRENCY_MIN = int(os.getenv("LLM_CONCURRENCY_MIN", "2"))
+LLM_CONCURRENCY_MAX = int(os.getenv("LLM_CONCURRENCY_MAX", "64"))
+LLM_LATENCY_TARGET = float(os.getenv("LLM_LATENCY_TARGET", "20"))  # Seconds; slower calls count as overload
+LLM_BACKOFF_INTERVAL = 1.0  # Seconds; overload signals within this window only shrink the limit once
+
+# Circuit breaker: consecutive provider failures that open it, and how long it stays open
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_SLOW = "slow"
+OUTCOME_RATE_LIMITED = "rate_limited"
+OUTCOME_PROVIDER_ERROR = "provider_error"
+OUTCOME_OTHER_ERROR = "other_error"
+OUTCOME_REJECTED = "rejected"
+OUTCOME_DEADLINE_EXCEEDED = "deadline_exceeded"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+
+def classify_error(error: BaseException) -> str:
+    """Rate limits shrink the limiter; outages also count towards opening the breaker."""
+    if isinstance(error, (openai.RateLimitError, anthropic.RateLimitError)):
+        return OUTCOME_RATE_LIMITED
+    if isinstance(error, (
+        openai.APIConnectionError, openai.InternalServerError,
+        anthropic.APIConnectionError, anthropic.InternalServerError,
+        TimeoutError, asyncio.TimeoutError
+    )):
+        return OUTCOME_PROVIDER_ERROR
+    return OUTCOME_OTHER_ERROR
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit shared by blocking and async callers.
+
+    Callers over the limit wait in a weighted fair queue per priority; a
+    released slot is handed straight to the next waiter, so a new caller
+    can't overtake the queue. A waiter gives up after its priority's deadline.
+    """
+
+    def __init__(self, initial: int = LLM_CONCURRENCY_INITIAL, min_limit: int = LLM_CONCURRENCY_MIN,
+                 max_limit: int = LLM_CONCURRENCY_MAX, backoff_interval: float = LLM_BACKOFF_INTERVAL,
+                 weights: Optional[Dict[str, int]] = None, deadlines: Optional[Dict[str, float]] = None):
+        self._lock = threading.Lock()
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_interval = backoff_interval
+        self.deadlines = deadlines or PRIORITY_DEADLINES
+        self._limit = float(max(min_limit, min(initial, max_limit)))
+        self._in_flight = 0
+        self._waiters = WeightedFairQueue(weights)
+        self._expired = Counter()
+        self._last_backoff = float("-inf")
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _dispatch_locked(self) -> None:
+        while self._waiters and self._in_flight < int(self._limit):
+            self._in_flight += 1
+            self._waiters.pop()()
+
+    def _give_up(self, priority: str, wake: Callable[[], None]) -> bool:
+        """Withdraw a waiter; False if a slot was already handed to it."""
+        with self._lock:
+            return self._waiters.remove(priority, wake)
+
+    def _deadline_exceeded(self, priority: str) -> QueueDeadlineExceeded:
+        with self._lock:
+            self._expired[priority] += 1
+        return QueueDeadlineExceeded(f"No LLM capacity for {priority} work within {self.deadlines[priority]}s")
+
+    def acquire(self, priority: str = PRIORITY_INTERACTIVE) -> None:
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return
+            ready = threading.Event()
+            self._waiters.push(priority, ready.set)
+        if not ready.wait(self.deadlines[priority]) and self._give_up(priority, ready.set):
+            raise self._deadline_exceeded(priority)
+
+    async def aacquire(self, priority: str = PRIORITY_INTERACTIVE) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return
+            ready = loop.create_future()
+
+            def wake():
+                loop.call_soon_threadsafe(lambda: ready.done() or ready.set_result(None))
+
+            self._waiters.push(priority, wake)
+        try:
+            await asyncio.wait_for(ready, self.deadlines[priority])
+        except asyncio.TimeoutError:
+            if self._give_up(priority, wake):
+                raise self._deadline_exceeded(priority)
+            # The slot arrived just as the deadline passed; use it
+        except asyncio.CancelledError:
+            if not self._give_up(priority, wake):
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._dispatch_locked()
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._dispatch_locked()
+
+    def on_overload(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_backoff < self.backoff_interval:
+                return
+            self._last_backoff = now
+            self._limit = max(self.min_limit, self._limit / 2)
+            logger.warning(f"LLM overloaded, concurrency limit reduced to {int(self._limit)}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "queued": len(self._waiters),
+                "queued_by_priority": self._waiters.depths(),
+                "deadline_exceeded": dict(self._expired)
+            }
+
+
+class CircuitBreaker:
+    """Fails fast after repeated provider failures, letting one trial call through after a cool-down."""
+
+    def __init__(self, threshold: int = LLM_BREAKER_THRESHOLD, reset_seconds: float = LLM_BREAKER_RESET_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self._lock = threading.Lock()
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == BREAKER_OPEN and self.clock() - self._opened_at >= self.reset_seconds:
+                return BREAKER_HALF_OPEN
+            return self._state
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go to the provider now."""
+        with self._lock:
+            if self._state == BREAKER_OPEN:
+                if self.clock() - self._opened_at < self.reset_seconds:
+                    raise CircuitOpenError("LLM provider is unavailable, try again shortly")
+                self._state = BREAKER_HALF_OPEN
+            if self._state == BREAKER_HALF_OPEN:
+                if self._trial_running:
+                    raise CircuitOpenError("LLM provider is recovering, try again shortly")
+                self._trial_running = True
+
+    def on_success(self) -> None:
+        with self._lock:
+            if self._state != BREAKER_CLOSED:
+                logger.info("LLM circuit breaker closed")
+            self._state = BREAKER_CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def on_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._state == BREAKER_HALF_OPEN or self._failures >= self.threshold:
+                if self._state != BREAKER_OPEN:
+                    logger.warning(f"LLM circuit breaker opened after {self._failures} failures")
+                self._state = BREAKER_OPEN
+                self._opened_at = self.clock()
+
+    def on_neutral(self) -> None:
+        """A call that says nothing about provider health (rate limited or cancelled); ends a trial without a verdict."""
+        with self._lock:
+            self._trial_running = False
+
+
+class LLMGuard:
+    """Breaker check, prioritised adaptive concurrency and outcome accounting around each LLM call.
+
+    Calls are queued at the priority of the calling context (see llm_scheduler.llm_priority).
+    """
+
+    def __init__(self, limiter: Optional[AdaptiveLimiter] = None, breaker: Optional[CircuitBreaker] = None,
+                 latency_target: float = LLM_LATENCY_TARGET):
+        self.limiter = limiter or AdaptiveLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self.latency_target = latency_target
+        self._lock = threading.Lock()
+        self._outcomes = Counter()
+
+    def _record(self, outcome: str) -> None:
+        with self._lock:
+            self._outcomes[outcome] += 1
+
+    def _finish(self, started: float, error: Optional[BaseException]) -> None:
+        if error is None:
+            self.breaker.on_success()
+            if time.perf_counter() - started > self.latency_target:
+                self._record(OUTCOME_SLOW)
+                self.limiter.on_overload()
+            else:
+                self._record(OUTCOME_SUCCESS)
+                self.limiter.on_success()
+            return
+        outcome = classify_error(error)
+        self._record(outcome)
+        if outcome == OUTCOME_RATE_LIMITED:
+            self.breaker.on_neutral()
+            self.limiter.on_overload()
+        elif outcome == OUTCOME_PROVIDER_ERROR:
+            self.breaker.on_failure()
+            self.limiter.on_overload()
+        else:
+            # The provider answered, just not usefully (e.g. a rejected request)
+            self.breaker.on_success()
+
+    def _check_breaker(self) -> None:
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self._record(OUTCOME_REJECTED)
+            raise
+
+    def _missed_deadline(self) -> None:
+        self._record(OUTCOME_DEADLINE_EXCEEDED)
+        self.breaker.on_neutral()
+
+    def call(self, work: Callable[[], T]) -> T:
+        self._check_breaker()
+        try:
+            self.limiter.acquire(current_priority())
+        except QueueDeadlineExceeded:
+            self._missed_deadline()
+            raise
+        started = time.perf_counter()
+        try:
+            result = work()
+        except Exception as e:
+            self._finish(started, e)
+            raise
+        finally:
+            self.limiter.release()
+        self._finish(started, None)
+        return result
+
+    async def acall(self, work: Callable[[], Awaitable[T]]) -> T:
+        self._check_breaker()
+        try:
+            await self.limiter.aacquire(current_priority())
+        except QueueDeadlineExceeded:
+            self._missed_deadline()
+            raise
+        except asyncio.CancelledError:
+            self.breaker.on_neutral()
+            raise
+        started = time.perf_counter()
+        try:
+            result = await work()
+        except asyncio.CancelledError:
+            self.breaker.on_neutral()
+            raise
+        except Exception as e:
+            self._finish(started, e)
+            raise
+        finally:
+            self.limiter.release()
+        self._finish(started, None)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            outcomes = dict(self._outcomes)
+        return {**self.limiter.stats(), "breaker": self.breaker.state, "outcomes": outcomes}
+
+
+# Process-wide guard for the LLM provider, read by the LLM stats endpoint
+llm_guard = LLMGuard()
@@ -0,0 +1,293 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import anthropic
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+
+from services.llm_guard import (
+    CircuitBreaker, CircuitOpenError, classify_error, OUTCOME_OTHER_ERROR, BREAKER_OPEN
+)
+from services.resume_parser import build_structured_llm, build_streaming_llm, LLM_MAX_RETRIES, LLM_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+BACKEND_OPENAI = "openai"
+BACKEND_ANTHROPIC = "anthropic"
+BACKEND_LOCAL = "local"
+BACKENDS = (BACKEND_OPENAI, BACKEND_ANTHROPIC, BACKEND_LOCAL)
+
+# Backends the router may send calls to, in order of preference while their latency is unknown
+LLM_BACKENDS = os.getenv("LLM_BACKENDS", BACKEND_OPENAI)
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+# Which Anthropic model stands in for each model in the parser's chain
+ANTHROPIC_MODELS = os.getenv("ANTHROPIC_MODELS", "gpt-3.5-turbo-0125=claude-3-5-haiku-latest,gpt-4o=claude-sonnet-4-5")
+# Chat-completions server for the "local" backend, e.g. the stand-in from services.stand_in_llm
+LOCAL_LLM_BASE_URL = os.getenv("LOCAL_LLM_BASE_URL", "http://127.0.0.1:8099/v1")
+LLM_ROUTER_EWMA_ALPHA = 0.2  # Weight of the newest latency sample in each backend's moving average
+
+
+def parse_backend_list(value: str) -> List[str]:
+    """Split a comma-separated backend list, rejecting unknown names."""
+    names = []
+    for name in value.split(","):
+        name = name.strip().lower()
+        if not name or name in names:
+            continue
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown LLM backend: {name}")
+        names.append(name)
+    if not names:
+        raise ValueError("No LLM backends configured")
+    return names
+
+
+def parse_model_map(value: str) -> Dict[str, str]:
+    """Parse "chain-model=backend-model,..." pairs."""
+    pairs = (item.split("=", 1) for item in value.split(",") if "=" in item)
+    return {source.strip(): target.strip() for source, target in pairs if source.strip() and target.strip()}
+
+
+class AnthropicStructuredLLM:
+    """Anthropic Messages API with a forced tool call, shaped like with_structured_output(include_raw=True).
+
+    Returns {"raw", "parsed", "parsing_error"} so the parser's local repair works the same for every backend.
+    """
+
+    def __init__(self, model_name: str, schema: type, api_key: Optional[str] = None,
+                 http_client=None, http_async_client=None):
+        self.model_name = model_name
+        self.schema = schema
+        options = dict(api_key=api_key or ANTHROPIC_API_KEY, timeout=LLM_TIMEOUT, max_retries=LLM_MAX_RETRIES)
+        self.client = anthropic.Anthropic(http_client=http_client, **options)
+        self.async_client = anthropic.AsyncAnthropic(http_client=http_async_client, **options)
+        self.tool = {
+            "name": schema.__name__,
+            "description": schema.__doc__ or f"Return the {schema.__name__}",
+            "input_schema": schema.model_json_schema()
+        }
+
+    def _request(self, messages: List[BaseMessage]) -> Dict[str, Any]:
+        system = "\n\n".join(m.content for m in messages if isinstance(m, SystemMessage))
+        turns = [
+            {"role": "assistant" if m.type == "ai" else "user", "content": m.content}
+            for m in messages if not isinstance(m, SystemMessage)
+        ]
+        return dict(
+            model=self.model_name,
+            max_tokens=4000,
+            temperature=0.3,
+            system=system,
+            messages=turns,
+            tools=[self.tool],
+            tool_choice={"type": "tool", "name": self.tool["name"]}
+        )
+
+    def _structured(self, response) -> Dict[str, Any]:
+        tool_calls = [
+            {"name": block.name, "args": block.input, "id": block.id}
+            for block in response.content if block.type == "tool_use"
+        ]
+        raw = AIMessage(content="", tool_calls=tool_calls)
+        if not tool_calls:
+            return {"raw": raw, "parsed": None, "parsing_error": ValueError("Anthropic returned no tool call")}
+        try:
+            return {"raw": raw, "parsed": self.schema.model_validate(tool_calls[0]["args"]), "parsing_error": None}
+        except Exception as e:
+            return {"raw": raw, "parsed": None, "parsing_error": e}
+
+    def invoke(self, messages: List[BaseMessage]) -> Dict[str, Any]:
+        return self._structured(self.client.messages.create(**self._request(messages)))
+
+    async def ainvoke(self, messages: List[BaseMessage]) -> Dict[str, Any]:
+        return self._structured(await self.async_client.messages.create(**self._request(messages)))
+
+
+@dataclass
+class LLMBackend:
+    """One provider the router can send calls to."""
+    name: str
+    build: Callable[[str, type], Any]  # (backend model, schema) -> structured LLM
+    models: Optional[Dict[str, str]] = None  # Chain model -> backend model; None serves every model by its own name
+    build_stream: Optional[Callable[[str, type], Any]] = None  # Like build, for streamed calls; None can't stream
+
+    def model_for(self, model_name: str) -> Optional[str]:
+        if self.models is None:
+            return model_name
+        return self.models.get(model_name)
+
+
+def make_backend(name: str, http_client=None, http_async_client=None, base_url: Optional[str] = None) -> LLMBackend:
+    """Backend for a configured name, sharing the given httpx connection pools."""
+    if name in (BACKEND_OPENAI, BACKEND_LOCAL):
+        options = dict(http_client=http_client, http_async_client=http_async_client)
+        if name == BACKEND_LOCAL:
+            options.update(base_url=base_url or LOCAL_LLM_BASE_URL, api_key="stand-in")
+        return LLMBackend(
+            name,
+            lambda model_name, schema: build_structured_llm(model_name, schema=schema, **options),
+            build_stream=lambda model_name, schema: build_streaming_llm(model_name, schema=schema, **options)
+        )
+    if name == BACKEND_ANTHROPIC:
+        return LLMBackend(name, lambda model_name, schema: AnthropicStructuredLLM(
+            model_name, schema, http_client=http_client, http_async_client=http_async_client
+        ), models=parse_model_map(ANTHROPIC_MODELS))
+    raise ValueError(f"Unknown LLM backend: {name}")
+
+
+class BackendHealth:
+    """Latency moving average, circuit breaker and call counts for one backend."""
+
+    def __init__(self, breaker: Optional[CircuitBreaker] = None):
+        self._lock = threading.Lock()
+        self.breaker = breaker or CircuitBreaker()
+        self.latency: Optional[float] = None
+        self.counts = Counter()
+
+    def record_success(self, seconds: float) -> None:
+        self.breaker.on_success()
+        with self._lock:
+            self.counts["calls"] += 1
+            self.latency = seconds if self.latency is None else (
+                LLM_ROUTER_EWMA_ALPHA * seconds + (1 - LLM_ROUTER_EWMA_ALPHA) * self.latency
+            )
+
+    def record_failure(self, outcome: str) -> None:
+        if outcome == OUTCOME_OTHER_ERROR:
+            self.breaker.on_success()
+        else:
+            self.breaker.on_failure()
+        with self._lock:
+            self.counts["calls"] += 1
+            self.counts[outcome] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.breaker.state, "latency": self.latency, **self.counts}
+
+
+class RoutedLLM:
+    """Structured LLM that sends each call to the fastest healthy backend and fails over to the next.
+
+    Only provider trouble (outages, timeouts, rate limits, open breakers) fails
+    over; any other error is the request's fault and is raised straight away.
+    """
+
+    def __init__(self, router: "ProviderRouter", model_name: str, schema: type):
+        self.router = router
+        self.model_name = model_name
+        self.schema = schema
+
+    def _attempts(self):
+        for backend in self.router.ranked(self.model_name):
+            health = self.router.health[backend.name]
+            try:
+                health.breaker.before_call()
+            except CircuitOpenError:
+                continue
+            yield backend, health, self.router.structured_llm_for(backend, self.model_name, self.schema)
+
+    def _failed(self, backend: LLMBackend, health: BackendHealth, error: Exception) -> None:
+        outcome = classify_error(error)
+        health.record_failure(outcome)
+        if outcome == OUTCOME_OTHER_ERROR:
+            raise error
+        logger.warning(f"LLM backend {backend.name} failed ({outcome}), failing over: {error}")
+
+    def _exhausted(self, error: Optional[Exception]) -> Exception:
+        return error or CircuitOpenError(f"No LLM backend available for {self.model_name}")
+
+    def invoke(self, messages):
+        error = None
+        for backend, health, llm in self._attempts():
+            started = time.perf_counter()
+            try:
+                result = llm.invoke(messages)
+            except Exception as e:
+                self._failed(backend, health, e)
+                error = e
+                continue
+            health.record_success(time.perf_counter() - started)
+            return result
+        raise self._exhausted(error)
+
+    async def ainvoke(self, messages):
+        error = None
+        for backend, health, llm in self._attempts():
+            started = time.perf_counter()
+            try:
+                result = await llm.ainvoke(messages)
+            except asyncio.CancelledError:
+                health.breaker.on_neutral()
+                raise
+            except Exception as e:
+                self._failed(backend, health, e)
+                error = e
+                continue
+            health.record_success(time.perf_counter() - started)
+            return result
+        raise self._exhausted(error)
+
+
+class ProviderRouter:
+    """Routes structured LLM calls across the configured backends by latency and health."""
+
+    def __init__(self, backends: List[LLMBackend], breakers: Optional[Dict[str, CircuitBreaker]] = None):
+        if not backends:
+            raise ValueError("No LLM backends configured")
+        self.backends = backends
+        self.health = {b.name: BackendHealth((breakers or {}).get(b.name)) for b in backends}
+        self._lock = threading.Lock()
+        self._llms: Dict[tuple, Any] = {}
+
+    def structured_llm_for(self, backend: LLMBackend, model_name: str, schema: type):
+        """The backend's own client for a chain model, built once."""
+        key = (backend.name, model_name, schema.__name__)
+        with self._lock:
+            llm = self._llms.get(key)
+            if llm is None:
+                llm = self._llms[key] = backend.build(backend.model_for(model_name), schema)
+            return llm
+
+    def ranked(self, model_name: str) -> List[LLMBackend]:
+        """Backends serving a model: healthy before open, then fastest first.
+
+        A backend without a latency yet sorts first, so each one gets measured; ties keep config order.
+        """
+        candidates = [(i, b) for i, b in enumerate(self.backends) if b.model_for(model_name)]
+
+        def key(item):
+            index, backend = item
+            health = self.health[backend.name]
+            return (health.breaker.state == BREAKER_OPEN, health.latency or 0.0, index)
+
+        return [backend for _, backend in sorted(candidates, key=key)]
+
+    def structured_llm(self, model_name: str, schema: type):
+        """Structured LLM for a chain model; with a single backend, that backend's client itself."""
+        if len(self.backends) == 1:
+            return self.structured_llm_for(self.backends[0], model_name, schema)
+        return RoutedLLM(self, model_name, schema)
+
+    def streaming_llm(self, model_name: str, schema: type):
+        """Streaming client of the best-ranked backend that can stream, or None.
+
+        A stream can't fail over once it has started, so it goes to one backend as is.
+        """
+        for backend in self.ranked(model_name):
+            if backend.build_stream is None or self.health[backend.name].breaker.state == BREAKER_OPEN:
+                continue
+            key = ("stream", backend.name, model_name, schema.__name__)
+            with self._lock:
+                if key not in self._llms:
+                    self._llms[key] = backend.build_stream(backend.model_for(model_name), schema)
+                return self._llms[key]
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {backend.name: self.health[backend.name].stats() for backend in self.backends}
@@ -0,0 +1,136 @@
+import os
+import time
+import logging
+import httpx
+from typing import Any, Dict, List, Optional, Tuple
+
+from schemas.resume_schemas import ResumeData, PartialResumeData
+from services.resume_parser import (
+    ResumeParser, RESUME_PARSER_MODEL, OPENAI_API_KEY, SECTION_SCHEMAS
+)
+from services.llm_providers import LLM_BACKENDS, BACKEND_OPENAI, ProviderRouter, make_backend, parse_backend_list
+
+logger = logging.getLogger(__name__)
+
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20"))
+LLM_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "60"))
+LLM_WARMUP_URL = os.getenv("LLM_WARMUP_URL", "https://api.openai.com/v1/models")
+
+
+class LLMClientRegistry:
+    """Process-wide LLM clients and the shared ResumeParser.
+
+    Every client built here shares one pair of keep-alive httpx connection pools
+    (sync and async), so requests reuse warm TLS connections instead of opening
+    new ones, and the structured-output schema is compiled once per model.
+    Clients come from the provider router over the configured backends.
+    """
+
+    def __init__(self, backends: Optional[List[str]] = None, local_base_url: Optional[str] = None):
+        self.backend_names = backends or parse_backend_list(LLM_BACKENDS)
+        self.local_base_url = local_base_url
+        self._http_client: Optional[httpx.Client] = None
+        self._http_async_client: Optional[httpx.AsyncClient] = None
+        self._router: Optional[ProviderRouter] = None
+        self._llms: Dict[Tuple[str, str], Any] = {}
+        self._parser: Optional[ResumeParser] = None
+        self.warmup_seconds: Optional[float] = None
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY
+        )
+
+    @property
+    def http_client(self) -> httpx.Client:
+        if self._http_client is None:
+            self._http_client = httpx.Client(limits=self._limits())
+        return self._http_client
+
+    @property
+    def http_async_client(self) -> httpx.AsyncClient:
+        if self._http_async_client is None:
+            self._http_async_client = httpx.AsyncClient(limits=self._limits())
+        return self._http_async_client
+
+    @property
+    def router(self) -> ProviderRouter:
+        if self._router is None:
+            self._router = ProviderRouter([
+                make_backend(name, self.http_client, self.http_async_client, base_url=self.local_base_url)
+                for name in self.backend_names
+            ])
+        return self._router
+
+    def get_structured_llm(self, model_name: str = RESUME_PARSER_MODEL, schema=ResumeData):
+        """Structured-output LLM for a model and output schema, built once and reused."""
+        key = (model_name, schema.__name__)
+        llm = self._llms.get(key)
+        if llm is None:
+            llm = self.router.structured_llm(model_name, schema)
+            self._llms[key] = llm
+        return llm
+
+    def get_streaming_llm(self, model_name: str = RESUME_PARSER_MODEL, schema=ResumeData):
+        """Streaming LLM for a model and output schema from the currently best backend."""
+        return self.router.streaming_llm(model_name, schema)
+
+    def get_parser(self) -> ResumeParser:
+        """The shared ResumeParser; callers pass their own DB session per call."""
+        if self._parser is None:
+            self._parser = ResumeParser(llm_factory=self.get_structured_llm, stream_factory=self.get_streaming_llm)
+        return self._parser
+
+    async def startup(self, warm_connections: bool = True) -> None:
+        """Build the shared clients and parser and warm them before the first request."""
+        started = time.perf_counter()
+        parser = self.get_parser()
+
+        # Pay the one-off schema and prompt costs now rather than on the first upload
+        ResumeData.model_json_schema()
+        models = list(parser.model_chain)
+        if parser.hedging and parser.hedger.hedge_model and parser.hedger.hedge_model not in models:
+            models.append(parser.hedger.hedge_model)
+        for model_name in models:
+            for schema in (ResumeData, PartialResumeData, *SECTION_SCHEMAS.values()):
+                parser.structured_llm(schema, model_name)
+        parser.streaming_llm(ResumeData)
+        parser.prompt.format_messages(resume_text="warm-up")
+
+        # Open a keep-alive TLS connection to the provider
+        if warm_connections and OPENAI_API_KEY and BACKEND_OPENAI in self.backend_names:
+            try:
+                await self.http_async_client.get(
+                    LLM_WARMUP_URL,
+                    headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
+                    timeout=5
+                )
+            except Exception as e:
+                logger.warning(f"LLM connection warm-up failed: {e}")
+
+        self.warmup_seconds = time.perf_counter() - started
+        logger.info(f"LLM client registry warmed up in {self.warmup_seconds * 1000:.0f}ms")
+
+    async def shutdown(self) -> None:
+        """Close the shared connection pools."""
+        if self._http_async_client is not None:
+            await self._http_async_client.aclose()
+        if self._http_client is not None:
+            self._http_client.close()
+        self._http_client = None
+        self._http_async_client = None
+        self._router = None
+        self._llms = {}
+        self._parser = None
+
+
+# Process-wide registry, started and shut down with the app
+llm_registry = LLMClientRegistry()
+
+
+def get_resume_parser() -> ResumeParser:
+    """Dependency returning the shared ResumeParser"""
+    return llm_registry.get_parser()
@@ -0,0 +1,94 @@
+import os
+import logging
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BACKGROUND = "background"
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND)
+
+# Share of queued LLM slots each priority gets while both are waiting
+PRIORITY_WEIGHTS = {
+    PRIORITY_INTERACTIVE: int(os.getenv("LLM_INTERACTIVE_WEIGHT", "16")),
+    PRIORITY_BACKGROUND: 1
+}
+# Longest a call of each priority may wait for an LLM slot before giving up
+PRIORITY_DEADLINES = {
+    PRIORITY_INTERACTIVE: float(os.getenv("LLM_INTERACTIVE_DEADLINE", "15")),
+    PRIORITY_BACKGROUND: float(os.getenv("LLM_BACKGROUND_DEADLINE", "600"))
+}
+
+_current_priority: ContextVar[str] = ContextVar("llm_priority", default=PRIORITY_INTERACTIVE)
+
+
+class QueueDeadlineExceeded(Exception):
+    """Raised when an LLM call waited longer than its priority's deadline for a slot."""
+
+
+def current_priority() -> str:
+    """Priority of LLM calls made from the current context; interactive unless set otherwise."""
+    return _current_priority.get()
+
+
+@contextmanager
+def llm_priority(priority: str) -> Iterator[None]:
+    """Run the LLM calls made inside the block at the given priority."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority: {priority}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class WeightedFairQueue:
+    """Per-priority FIFO queues served by weighted fair queueing.
+
+    Each dispatch advances its priority's virtual time by 1/weight, and the
+    priority whose next waiter would finish first in virtual time goes next,
+    so interactive work jumps ahead of a long background backlog without
+    starving it. A priority that was idle restarts at the current virtual
+    time instead of cashing in the time it spent idle. Not thread-safe: the
+    owning limiter's lock guards it.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, int]] = None):
+        self.weights = weights or PRIORITY_WEIGHTS
+        self._queues = {priority: deque() for priority in self.weights}
+        self._virtual = {priority: 0.0 for priority in self.weights}
+        self._clock = 0.0
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def push(self, priority: str, waiter: Callable[[], None]) -> None:
+        queue = self._queues[priority]
+        if not queue:
+            self._virtual[priority] = max(self._virtual[priority], self._clock)
+        queue.append(waiter)
+
+    def pop(self) -> Callable[[], None]:
+        # Serve the head waiter that would finish first in virtual time
+        priority = min(
+            (p for p, queue in self._queues.items() if queue),
+            key=lambda p: (self._virtual[p] + 1 / self.weights[p], -self.weights[p])
+        )
+        self._clock = self._virtual[priority]
+        self._virtual[priority] += 1 / self.weights[priority]
+        return self._queues[priority].popleft()
+
+    def remove(self, priority: str, waiter: Callable[[], None]) -> bool:
+        """Drop a waiter that gave up; False if it was already dispatched."""
+        try:
+            self._queues[priority].remove(waiter)
+            return True
+        except ValueError:
+            return False
+
+    def depths(self) -> Dict[str, Any]:
+        return {priority: len(queue) for priority, queue in self._queues.items()}
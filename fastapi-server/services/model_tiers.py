@@ -0,0 +1,77 @@
+import os
+import logging
+import threading
+from collections import Counter
+from typing import Any, Dict, List
+
+from schemas.resume_schemas import ResumeData
+
+logger = logging.getLogger(__name__)
+
+# Cheapest model first; each later model is only tried when the one before it fails
+RESUME_PARSER_MODEL_CHAIN = os.getenv("RESUME_PARSER_MODEL_CHAIN", "gpt-3.5-turbo-0125,gpt-4o")
+
+ESCALATION_ERROR = "error"
+ESCALATION_VALIDATION = "validation"
+ESCALATION_LOW_CONFIDENCE = "low_confidence"
+
+
+def parse_model_chain(value: str) -> List[str]:
+    """Split a comma-separated model chain, dropping blanks and duplicates."""
+    chain = []
+    for model_name in value.split(","):
+        model_name = model_name.strip()
+        if model_name and model_name not in chain:
+            chain.append(model_name)
+    if not chain:
+        raise ValueError("The resume parser model chain is empty")
+    return chain
+
+
+def find_confidence_issues(parsed_data: ResumeData) -> List[str]:
+    """Cheap checks on a schema-valid result that suggest a stronger model would do better."""
+    issues = []
+    if not (parsed_data.personal_info.name or "").strip():
+        issues.append("missing name")
+    if any(not (e.institution or e.degree) for e in parsed_data.education):
+        issues.append("education entry without institution or degree")
+    if any(not (w.company or w.job_title) for w in parsed_data.work_experience):
+        issues.append("work entry without company or job title")
+    if not any(s.name.strip() for s in parsed_data.skills):
+        issues.append("no named skills")
+    return issues
+
+
+class TierStats:
+    """Counts of which tier served each parse and why parses escalated."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._served = Counter()
+        self._escalations = Counter()
+
+    def record_served(self, model_name: str) -> None:
+        with self._lock:
+            self._served[model_name] += 1
+
+    def record_escalation(self, model_name: str, reason: str) -> None:
+        with self._lock:
+            self._escalations[f"{model_name}:{reason}"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self._served.values())
+            return {
+                "served": dict(self._served),
+                "escalations": dict(self._escalations),
+                "total": total
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._served.clear()
+            self._escalations.clear()
+
+
+# Process-wide counters, read by the tier stats endpoint
+tier_stats = TierStats()
@@ -0,0 +1,150 @@
+import os
+import re
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from repository.parse_cache_repository import ParseCacheRepository
+
+logger = logging.getLogger(__name__)
+
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "256"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_resume_text(text: str) -> str:
+    """Normalize extracted text so cosmetic differences don't change its hash."""
+    text = unicodedata.normalize("NFKC", text or "")
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def compute_content_hash(text: str) -> str:
+    """SHA-256 of the normalized resume text."""
+    return hashlib.sha256(normalize_resume_text(text).encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    """Two-tier cache of parsed resumes: an in-process LRU in front of the parse_cache table.
+
+    Entries are keyed on the content hash, the prompt version and the model name,
+    so changing either the prompt or the model naturally misses the old entries.
+    """
+
+    def __init__(self, max_entries: int = PARSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(content_hash: str, prompt_version: str, model_name: str) -> str:
+        """Build the cache key for a content hash, prompt version and model."""
+        raw = f"{content_hash}:{prompt_version}:{model_name}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _remember(self, cache_key: str, content_hash: str, parsed_data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[cache_key] = (content_hash, parsed_data)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, db: Optional[Session], cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached parsed data for a key, or None on a miss.
+
+        A durable-tier hit bumps the entry's hit count on db without committing; it is saved
+        with the caller's next commit.
+        """
+        with self._lock:
+            cached = self._entries.get(cache_key)
+            if cached is not None:
+                self._entries.move_to_end(cache_key)
+                self.memory_hits += 1
+                return cached[1]
+
+        if db is not None:
+            try:
+                entry = ParseCacheRepository.get_entry(db, cache_key)
+                if entry is not None:
+                    ParseCacheRepository.record_hit(db, cache_key)
+                    self._remember(cache_key, entry.content_hash, entry.parsed_data)
+                    with self._lock:
+                        self.db_hits += 1
+                    return entry.parsed_data
+            except Exception as e:
+                logger.error(f"Error reading parse cache: {e}")
+                db.rollback()
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(
+        self,
+        db: Optional[Session],
+        cache_key: str,
+        content_hash: str,
+        prompt_version: str,
+        model_name: str,
+        parsed_data: Dict[str, Any]
+    ) -> None:
+        """Store parsed data in both tiers. Write failures are logged, never raised."""
+        self._remember(cache_key, content_hash, parsed_data)
+        if db is None:
+            return
+        try:
+            ParseCacheRepository.save_entry(db, cache_key, content_hash, prompt_version, model_name, parsed_data)
+        except Exception as e:
+            logger.error(f"Error writing parse cache: {e}")
+            db.rollback()
+
+    def invalidate(
+        self,
+        db: Optional[Session] = None,
+        content_hash: Optional[str] = None,
+        prompt_version: Optional[str] = None,
+        model_name: Optional[str] = None
+    ) -> int:
+        """Drop cached entries; with no filters the whole cache is cleared.
+
+        Returns the number of rows removed from the durable tier.
+        """
+        with self._lock:
+            if content_hash is None and prompt_version is None and model_name is None:
+                self._entries.clear()
+            elif content_hash is not None:
+                for key in [k for k, (h, _) in self._entries.items() if h == content_hash]:
+                    del self._entries[key]
+            else:
+                # The memory tier doesn't track prompt/model, so drop it wholesale
+                self._entries.clear()
+
+        if db is None:
+            return 0
+        return ParseCacheRepository.delete_entries(db, content_hash, prompt_version, model_name)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the cache."""
+        with self._lock:
+            hits = self.memory_hits + self.db_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "db_hits": self.db_hits,
+                "hits": hits,
+                "misses": self.misses,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._entries),
+                "max_entries": self.max_entries
+            }
+
+
+# Process-wide cache shared by every ResumeParser
+parse_cache = ParseCache()
@@ -0,0 +1,195 @@
+"""Durable resume parse jobs and the worker that runs them.
+
+/api/resume/parse?queue=true stores the extracted resume text as a row in the
+parse_jobs table and returns its id. Workers claim jobs under a lease, renew
+the lease while parsing, and either record the result or requeue the job with
+exponential backoff until it runs out of attempts. A job whose worker died is
+claimed again once its lease runs out. Run as many workers, on as many nodes,
+as the LLM provider allows:
+
+    python -m services.parse_jobs --concurrency 4
+"""
+import os
+import uuid
+import signal
+import socket
+import asyncio
+import logging
+import argparse
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+import models
+from database import SessionLocal
+from repository.parse_job_repository import ParseJobRepository
+from services.llm_scheduler import PRIORITY_BACKGROUND, llm_priority
+
+logger = logging.getLogger(__name__)
+
+PARSE_JOB_MAX_ATTEMPTS = int(os.getenv("PARSE_JOB_MAX_ATTEMPTS", "3"))
+PARSE_JOB_LEASE_SECONDS = float(os.getenv("PARSE_JOB_LEASE_SECONDS", "120"))
+PARSE_JOB_RETRY_BASE_SECONDS = float(os.getenv("PARSE_JOB_RETRY_BASE_SECONDS", "10"))
+PARSE_JOB_RETRY_MAX_SECONDS = float(os.getenv("PARSE_JOB_RETRY_MAX_SECONDS", "600"))
+PARSE_WORKER_CONCURRENCY = int(os.getenv("PARSE_WORKER_CONCURRENCY", "4"))  # Jobs each worker process runs at once
+PARSE_WORKER_POLL_SECONDS = float(os.getenv("PARSE_WORKER_POLL_SECONDS", "1"))  # Idle wait between empty claims
+
+
+def enqueue_parse_job(db: Session, user_id: int, file_name: str, resume_text: str,
+                      mode: Optional[str] = None) -> models.ParseJob:
+    """Queue a resume text for a worker to parse and save."""
+    return ParseJobRepository.enqueue(db, user_id, file_name, resume_text, mode, max_attempts=PARSE_JOB_MAX_ATTEMPTS)
+
+
+def retry_delay(attempts: int, base: float = PARSE_JOB_RETRY_BASE_SECONDS,
+                cap: float = PARSE_JOB_RETRY_MAX_SECONDS) -> float:
+    """Seconds to wait before the next try after the given number of failed attempts."""
+    return min(cap, base * 2 ** (attempts - 1))
+
+
+@dataclass
+class ClaimedJob:
+    """What a worker needs from a claimed job row, read before its session closes."""
+    id: int
+    user_id: int
+    file_name: str
+    resume_text: str
+    mode: Optional[str]
+    attempts: int
+    max_attempts: int
+
+
+class ParseWorker:
+    """Claims parse jobs and runs them with the resume parser at background LLM priority."""
+
+    def __init__(self, parser, session_factory: Callable[[], Session] = SessionLocal,
+                 worker_id: Optional[str] = None, concurrency: int = PARSE_WORKER_CONCURRENCY,
+                 lease_seconds: float = PARSE_JOB_LEASE_SECONDS, poll_seconds: float = PARSE_WORKER_POLL_SECONDS,
+                 retry_base: float = PARSE_JOB_RETRY_BASE_SECONDS, retry_max: float = PARSE_JOB_RETRY_MAX_SECONDS):
+        self.parser = parser
+        self.session_factory = session_factory
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+    def _with_session(self, work: Callable[[Session], object]):
+        db = self.session_factory()
+        try:
+            return work(db)
+        finally:
+            db.close()
+
+    def _claim(self) -> Optional[ClaimedJob]:
+        def claim(db: Session) -> Optional[ClaimedJob]:
+            job = ParseJobRepository.claim(db, self.worker_id, self.lease_seconds)
+            if job is None:
+                return None
+            return ClaimedJob(job.id, job.user_id, job.file_name, job.resume_text, job.mode, job.attempts,
+                              job.max_attempts)
+        return self._with_session(claim)
+
+    async def _keep_lease(self, job_id: int) -> None:
+        """Renew the job's lease every third of its length until cancelled."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            held = await run_in_threadpool(self._with_session, lambda db: ParseJobRepository.extend_lease(
+                db, job_id, self.worker_id, self.lease_seconds
+            ))
+            if not held:
+                logger.warning(f"Worker {self.worker_id} lost the lease on parse job {job_id}")
+                return
+
+    async def _parse(self, job: ClaimedJob):
+        db = self.session_factory()
+        try:
+            with llm_priority(PRIORITY_BACKGROUND):
+                return await self.parser.aparse_resume(job.resume_text, job.user_id, job.file_name, db, job.mode)
+        finally:
+            await run_in_threadpool(db.close)
+
+    async def run_job(self, job: ClaimedJob) -> None:
+        """Parse a claimed job and record the outcome; failed attempts are retried with backoff."""
+        lease = asyncio.ensure_future(self._keep_lease(job.id))
+        response, error = None, None
+        try:
+            response = await self._parse(job)
+            if response.status == "error":
+                error = response.error or response.message
+        except Exception as e:
+            error = str(e)
+        finally:
+            lease.cancel()
+
+        if error is None:
+            await run_in_threadpool(self._with_session, lambda db: ParseJobRepository.complete(
+                db, job.id, self.worker_id, response.model_dump(mode="json")
+            ))
+            logger.info(f"Parse job {job.id} succeeded on attempt {job.attempts}")
+            return
+
+        retry_at = None
+        if job.attempts < job.max_attempts:
+            retry_at = datetime.utcnow() + timedelta(seconds=retry_delay(job.attempts, self.retry_base, self.retry_max))
+        result = response.model_dump(mode="json") if response is not None else None
+        await run_in_threadpool(self._with_session, lambda db: ParseJobRepository.release(
+            db, job.id, self.worker_id, error, retry_at, result
+        ))
+        if retry_at is None:
+            logger.error(f"Parse job {job.id} failed after {job.attempts} attempts: {error}")
+        else:
+            logger.warning(f"Parse job {job.id} attempt {job.attempts} failed, retrying at {retry_at}: {error}")
+
+    async def run_once(self) -> bool:
+        """Claim and run one job; False if there was none to claim."""
+        job = await run_in_threadpool(self._claim)
+        if job is None:
+            return False
+        await self.run_job(job)
+        return True
+
+    async def _loop(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                worked = await self.run_once()
+            except Exception as e:
+                logger.error(f"Parse worker {self.worker_id} error: {e}")
+                worked = False
+            if not worked:
+                try:
+                    await asyncio.wait_for(stop.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Run concurrency job loops until stop is set; jobs already started are finished first."""
+        logger.info(f"Parse worker {self.worker_id} running {self.concurrency} job loops")
+        await asyncio.gather(*(self._loop(stop) for _ in range(self.concurrency)))
+
+
+async def _main(concurrency: int) -> None:
+    from migrate import upgrade_database
+    from services.llm_registry import llm_registry
+
+    upgrade_database()
+    await llm_registry.startup()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        await ParseWorker(llm_registry.get_parser(), concurrency=concurrency).run(stop)
+    finally:
+        await llm_registry.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a resume parse job worker")
+    parser.add_argument("--concurrency", type=int, default=PARSE_WORKER_CONCURRENCY, help="Jobs to run at once")
+    args = parser.parse_args()
+    asyncio.run(_main(args.concurrency))
@@ -0,0 +1,219 @@
+import os
+import time
+import signal
+import asyncio
+import logging
+import multiprocessing
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "8"))
+PDF_EXTRACT_TIMEOUT = float(os.getenv("PDF_EXTRACT_TIMEOUT", "20"))
+
+# Pages are joined with a form feed so later stages can still see page boundaries
+PAGE_BREAK = "\f"
+
+# Extra time the parent waits past the in-worker deadline before recycling the pool
+_BACKSTOP_GRACE = 2.0
+
+
+class PdfExtractionTimeout(Exception):
+    """Raised when a document takes longer than the per-document timeout to extract."""
+
+
+@dataclass
+class PageTiming:
+    page_number: int
+    seconds: float
+    characters: int
+
+
+@dataclass
+class PdfExtractionResult:
+    text: str
+    page_count: int
+    seconds: float
+    page_timings: List[PageTiming] = field(default_factory=list)
+
+    def slowest_pages(self, limit: int = 3) -> List[PageTiming]:
+        return sorted(self.page_timings, key=lambda t: t.seconds, reverse=True)[:limit]
+
+    def timings(self, limit: int = 3) -> Dict[str, float]:
+        """Seconds for the whole document and its slowest pages, keyed like the parse response's LLM timings."""
+        timings = {"pdf_extract": round(self.seconds, 4)}
+        for timing in self.slowest_pages(limit):
+            timings[f"pdf_page_{timing.page_number + 1}"] = round(timing.seconds, 4)
+        return timings
+
+
+def _on_deadline(signum, frame):
+    raise PdfExtractionTimeout("PDF extraction exceeded its deadline")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _open_reader(source: Union[bytes, str]) -> PdfReader:
+    # Spooled uploads on disk are passed by path so the bytes aren't pickled to every worker
+    return PdfReader(source if isinstance(source, str) else BytesIO(source))
+
+
+def _count_pages(source: Union[bytes, str]) -> int:
+    return len(_open_reader(source).pages)
+
+
+def extract_page_range(source: Union[bytes, str], start: int, end: int, deadline: Optional[float] = None) -> List[Tuple[int, str, float]]:
+    """Extract pages [start, end) and time each one. Runs inside a pool worker.
+
+    When a deadline is given the worker arms a real-time timer, so a pathological
+    page raises PdfExtractionTimeout instead of pinning the process.
+    """
+    armed = deadline is not None and hasattr(signal, "setitimer")
+    if armed:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise PdfExtractionTimeout("PDF extraction exceeded its deadline")
+        previous = signal.signal(signal.SIGALRM, _on_deadline)
+        signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        reader = _open_reader(source)
+        pages = []
+        for page_number in range(start, min(end, len(reader.pages))):
+            page_start = time.perf_counter()
+            text = reader.pages[page_number].extract_text() or ""
+            pages.append((page_number, text, time.perf_counter() - page_start))
+        return pages
+    finally:
+        if armed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def join_pages(page_texts: List[str]) -> str:
+    """Join page texts in a single pass, separated by PAGE_BREAK."""
+    return PAGE_BREAK.join(page_texts)
+
+
+class PdfExtractionEngine:
+    """Bounded process pool that extracts PDF text off the event loop and the GIL.
+
+    Documents longer than pages_per_task pages are split into page ranges that are
+    extracted in parallel and joined back in page order.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = PDF_EXTRACT_WORKERS,
+        pages_per_task: int = PDF_PAGES_PER_TASK,
+        timeout: float = PDF_EXTRACT_TIMEOUT
+    ):
+        self.max_workers = max_workers
+        self.pages_per_task = pages_per_task
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn keeps workers independent of the server's threads and open connections
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        """Kill a pool's workers; used when a document overruns even the in-worker deadline.
+
+        The pool can't tell which worker is stuck, so all of them go. Work still
+        pending on the pool fails with BrokenProcessPool, and extract runs those
+        documents again on the new pool.
+        """
+        if executor is not self._executor:
+            # Another overrun already replaced it
+            return
+        self._executor = None
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False)
+
+    async def start(self) -> None:
+        """Spawn the workers ahead of the first upload."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*[
+            loop.run_in_executor(executor, _ping) for _ in range(self.max_workers)
+        ])
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _page_ranges(self, page_count: int) -> List[Tuple[int, int]]:
+        return [
+            (start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        ]
+
+    async def _extract(self, executor: ProcessPoolExecutor, source: Union[bytes, str],
+                       deadline: float) -> PdfExtractionResult:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+
+        page_count = await loop.run_in_executor(executor, _count_pages, source)
+        chunks = await asyncio.gather(*[
+            loop.run_in_executor(executor, extract_page_range, source, start, end, deadline)
+            for start, end in self._page_ranges(page_count)
+        ])
+
+        pages = [page for chunk in chunks for page in chunk]
+        pages.sort(key=lambda page: page[0])
+        return PdfExtractionResult(
+            text=join_pages([text for _, text, _ in pages]),
+            page_count=page_count,
+            seconds=time.perf_counter() - started,
+            page_timings=[
+                PageTiming(page_number=number, seconds=seconds, characters=len(text))
+                for number, text, seconds in pages
+            ]
+        )
+
+    async def extract(self, source: Union[bytes, str], timeout: Optional[float] = None) -> PdfExtractionResult:
+        """Extract all text from PDF bytes or a PDF path, raising PdfExtractionTimeout past the per-document timeout."""
+        timeout = self.timeout if timeout is None else timeout
+        retried = False
+        while True:
+            executor = self._get_executor()
+            try:
+                result = await asyncio.wait_for(
+                    self._extract(executor, source, time.time() + timeout), timeout + _BACKSTOP_GRACE
+                )
+                break
+            except asyncio.TimeoutError:
+                logger.error("PDF extraction ignored its in-worker deadline; recycling the extraction pool")
+                self._recycle(executor)
+                raise PdfExtractionTimeout(f"PDF extraction took longer than {timeout}s")
+            except BrokenProcessPool:
+                # Another document's overrun recycled the pool under this one; start over on the new pool
+                if retried or executor is self._executor:
+                    raise
+                logger.warning("PDF extraction pool was recycled mid-extraction; extracting again")
+                retried = True
+
+        slowest = ", ".join(f"p{t.page_number + 1}={t.seconds * 1000:.1f}ms" for t in result.slowest_pages())
+        logger.info(
+            f"Extracted {result.page_count} PDF pages in {result.seconds * 1000:.1f}ms (slowest: {slowest})"
+        )
+        return result
+
+
+# Process-wide extraction engine, started and shut down with the app
+pdf_extraction_engine = PdfExtractionEngine()
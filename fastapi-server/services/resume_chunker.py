@@ -0,0 +1,142 @@
+import os
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from schemas.resume_schemas import PartialResumeData
+from services.pdf_extractor import PAGE_BREAK
+
+RESUME_CHUNK_TOKENS = int(os.getenv("RESUME_CHUNK_TOKENS", "1500"))
+RESUME_MAX_CHUNKS = int(os.getenv("RESUME_MAX_CHUNKS", "8"))
+
+# Rough but stable estimate; good enough to size chunks well inside the model's context
+CHARS_PER_TOKEN = 4
+
+SECTION_KEYWORDS = (
+    "summary", "professional summary", "profile", "objective", "about me",
+    "experience", "work experience", "professional experience", "employment",
+    "employment history", "work history", "career history",
+    "education", "academic background", "qualifications",
+    "skills", "technical skills", "core competencies", "technologies",
+    "projects", "certifications", "certificates", "awards", "achievements",
+    "publications", "languages", "interests", "volunteering", "references",
+)
+
+# A header is a short line made of one of the keywords, optionally followed by a colon
+SECTION_HEADER_RE = re.compile(
+    r"^[ \t\f]*(?:" + "|".join(re.escape(k) for k in sorted(SECTION_KEYWORDS, key=len, reverse=True)) + r")[ \t]*:?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def split_sections(text: str) -> List[str]:
+    """Split resume text into blocks at page breaks and section headers.
+
+    Each header starts a new block, so a block is a header plus its body; text
+    before the first header (name and contact details) is its own block.
+    """
+    blocks = []
+    for page in text.split(PAGE_BREAK):
+        starts = [0] + [m.start() for m in SECTION_HEADER_RE.finditer(page) if m.start() > 0]
+        for start, end in zip(starts, starts[1:] + [len(page)]):
+            block = page[start:end].strip()
+            if block:
+                blocks.append(block)
+    return blocks
+
+
+def _split_oversized(block: str, max_tokens: int) -> List[str]:
+    """Split a block over the budget at paragraph, then line, then character boundaries."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces = []
+    current = ""
+    for separator, parts in (("\n\n", block.split("\n\n")), ("\n", block.split("\n"))):
+        if all(len(p) <= max_chars for p in parts):
+            for part in parts:
+                candidate = f"{current}{separator}{part}" if current else part
+                if len(candidate) <= max_chars:
+                    current = candidate
+                else:
+                    pieces.append(current)
+                    current = part
+            if current:
+                pieces.append(current)
+            return pieces
+    return [block[i:i + max_chars] for i in range(0, len(block), max_chars)]
+
+
+def chunk_resume_text(text: str, max_tokens: int = RESUME_CHUNK_TOKENS) -> List[str]:
+    """Pack section blocks into chunks of at most max_tokens, keeping blocks whole where possible."""
+    chunks = []
+    current: List[str] = []
+    current_tokens = 0
+    for block in split_sections(text):
+        block_tokens = estimate_tokens(block)
+        if block_tokens > max_tokens:
+            if current:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            chunks.extend(_split_oversized(block, max_tokens))
+            continue
+        if current and current_tokens + block_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(block)
+        current_tokens += block_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _norm(value: Any) -> str:
+    return re.sub(r"\s+", " ", str(value or "")).strip().casefold()
+
+
+def _merge_entries(entries: Iterable[Dict[str, Any]], key: Callable[[Dict[str, Any]], Tuple]) -> List[Dict[str, Any]]:
+    """Deduplicate entries by key, keeping first-seen order and filling gaps from later duplicates."""
+    merged: Dict[Tuple, Dict[str, Any]] = {}
+    for entry in entries:
+        entry_key = key(entry)
+        if not any(entry_key):
+            continue
+        existing = merged.get(entry_key)
+        if existing is None:
+            merged[entry_key] = dict(entry)
+            continue
+        for field_name, value in entry.items():
+            if existing.get(field_name) in (None, "") and value not in (None, ""):
+                existing[field_name] = value
+            elif field_name == "description" and value and _norm(value) not in _norm(existing.get(field_name)):
+                # A role split across chunks keeps both halves of its description
+                existing[field_name] = f"{existing[field_name]} {value}"
+    return list(merged.values())
+
+
+def merge_partial_results(partials: List[PartialResumeData]) -> Dict[str, Any]:
+    """Deterministically merge per-chunk results, in chunk order, into ResumeData-shaped data."""
+    dumped = [p.model_dump(mode="json") for p in partials]
+
+    personal_info: Dict[str, Any] = {}
+    for partial in dumped:
+        for field_name, value in (partial.get("personal_info") or {}).items():
+            if personal_info.get(field_name) in (None, "") and value not in (None, ""):
+                personal_info[field_name] = value
+
+    return {
+        "personal_info": personal_info,
+        "education": _merge_entries(
+            (e for p in dumped for e in p["education"]),
+            key=lambda e: (_norm(e.get("institution")), _norm(e.get("degree")), _norm(e.get("field_of_study")))
+        ),
+        "work_experience": _merge_entries(
+            (w for p in dumped for w in p["work_experience"]),
+            key=lambda w: (_norm(w.get("company")), _norm(w.get("job_title")), _norm(w.get("start_date")))
+        ),
+        "skills": _merge_entries(
+            (s for p in dumped for s in p["skills"]),
+            key=lambda s: (_norm(s.get("name")),)
+        ),
+    }
@@ -1,9 +1,19 @@
 import os
-from typing import Dict, Any, List, Optional
+import time
+import asyncio
+import hashlib
+import functools
+import contextvars
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Callable
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
-from pydantic import BaseModel, Field, ConfigDict
+from langchain_core.output_parsers.openai_tools import JsonOutputKeyToolsParser
+from langchain_core.messages import SystemMessage, HumanMessage
+from pydantic import BaseModel, Field, ConfigDict, ValidationError
+from langchain_core.exceptions import OutputParserException
 from pypdf import PdfReader
 import tempfile
 import json
@@ -12,10 +22,33 @@ from dotenv import load_dotenv
 from openai import OpenAI
 from sqlalchemy.orm import Session
 from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
+from concurrent.futures import ThreadPoolExecutor
 
-from schemas.resume_schemas import ResumeData, ResumeResponse
+from schemas.resume_schemas import (
+    ResumeData, PartialResumeData, ResumeResponse,
+    PersonalInfoSection, EducationSection, WorkExperienceSection, SkillsSection
+)
 from prompts.resume_prompts import ResumeSystemPrompts
 from repository.resume_repository import ResumeRepository
+from services.parse_cache import ParseCache, parse_cache, compute_content_hash
+from services.pdf_extractor import pdf_extraction_engine, join_pages
+from services.upload_spooler import SpooledUpload, spool_upload
+from services.model_tiers import (
+    RESUME_PARSER_MODEL_CHAIN, ESCALATION_ERROR, ESCALATION_VALIDATION, ESCALATION_LOW_CONFIDENCE,
+    TierStats, tier_stats, parse_model_chain, find_confidence_issues
+)
+from services.schema_repair import repair_resume_data, repair_stats
+from services.single_flight import SingleFlight, parse_flights
+from services.llm_guard import LLMGuard, CircuitOpenError, llm_guard
+from services.llm_scheduler import QueueDeadlineExceeded
+from services.hedging import LLM_HEDGING, Hedger, LatencyTracker, hedger as default_hedger
+from services.resume_preextractor import RESUME_PREEXTRACT, PreExtraction, pre_extract
+from services.resume_stream import EVENT_RESULT, PartialResumeEmitter, StreamEvent
+from services.resume_sections import RESUME_INCREMENTAL_PARSE, changed_sections, segment_resume
+from services.resume_chunker import (
+    RESUME_CHUNK_TOKENS, RESUME_MAX_CHUNKS, estimate_tokens, chunk_resume_text, merge_partial_results
+)
 
 # Configure logging
 logging.basicConfig(
@@ -27,6 +60,37 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+RESUME_PARSER_MODEL = "gpt-3.5-turbo-0125"  # Using GPT-3.5-turbo which has better token efficiency
+# Failed calls escalate to the next model tier rather than repeating the same call
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "1"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+
+# "single" sends the whole schema in one call; "sections" fans out one smaller call per section
+EXTRACTION_MODE_SINGLE = "single"
+EXTRACTION_MODE_SECTIONS = "sections"
+EXTRACTION_MODES = (EXTRACTION_MODE_SINGLE, EXTRACTION_MODE_SECTIONS)
+RESUME_EXTRACTION_MODE = os.getenv("RESUME_EXTRACTION_MODE", EXTRACTION_MODE_SINGLE)
+
+SECTION_SCHEMAS = {
+    "personal_info": PersonalInfoSection,
+    "education": EducationSection,
+    "work_experience": WorkExperienceSection,
+    "skills": SkillsSection
+}
+
+# served_by for a re-upload whose sections all match the previous parse
+SERVED_BY_PREVIOUS = "previous"
+
+# Structured-output tool names back to their schemas, for repairing raw tool-call arguments
+SECTION_OR_RESUME_SCHEMAS = {
+    schema.__name__: schema for schema in (ResumeData, PartialResumeData, *SECTION_SCHEMAS.values())
+}
+
+
+def schema_version(schema: type) -> str:
+    """Short fingerprint of a pydantic model's JSON schema."""
+    serialized = json.dumps(schema.model_json_schema(), sort_keys=True)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:12]
 
 class PersonalInfo(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -60,24 +124,100 @@ class Skill(BaseModel):
     name: str = Field(..., description="Name of the skill")
     category: Optional[str] = Field(None, description="Category of the skill")
 
+def _chat_model(model_name: str, http_client, http_async_client, base_url: Optional[str], api_key: Optional[str]):
+    return ChatOpenAI(
+        model=model_name,
+        temperature=0.3,  # Lower temperature for more consistent output
+        max_tokens=4000,  # Reduced max tokens
+        timeout=LLM_TIMEOUT,
+        max_retries=LLM_MAX_RETRIES,
+        api_key=api_key or OPENAI_API_KEY,
+        base_url=base_url,
+        http_client=http_client,
+        http_async_client=http_async_client
+    )
+
+def build_structured_llm(model_name: str = RESUME_PARSER_MODEL, http_client=None, http_async_client=None, schema=ResumeData,
+                         base_url: Optional[str] = None, api_key: Optional[str] = None):
+    """Build the ChatOpenAI client wrapped for structured output (ResumeData by default).
+
+    base_url and api_key point it at another chat-completions server, such as the local stand-in.
+    """
+    return _chat_model(model_name, http_client, http_async_client, base_url, api_key).with_structured_output(
+        schema, method="function_calling", include_raw=True  # raw output feeds local repair
+    )
+
+def build_streaming_llm(model_name: str = RESUME_PARSER_MODEL, http_client=None, http_async_client=None, schema=ResumeData,
+                        base_url: Optional[str] = None, api_key: Optional[str] = None):
+    """Build a ChatOpenAI client forced to call the schema's tool, whose astream yields the arguments parsed so far."""
+    return _chat_model(model_name, http_client, http_async_client, base_url, api_key).bind_tools(
+        [schema], tool_choice=schema.__name__
+    ) | JsonOutputKeyToolsParser(key_name=schema.__name__, first_tool_only=True)
+
+@dataclass
+class ParseTrace:
+    """What happened while parsing one resume: per-call timings, local schema repairs and hedged calls."""
+    timings: Dict[str, float] = field(default_factory=dict)
+    repairs: Counter = field(default_factory=Counter)
+    hedges: int = 0
+
 class ResumeParser:
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None, llm=None, cache: Optional[ParseCache] = None, chunk_llm=None,
+                 chunk_tokens: int = RESUME_CHUNK_TOKENS, max_chunks: int = RESUME_MAX_CHUNKS,
+                 llm_factory: Optional[Callable[[str, type], Any]] = None,
+                 extraction_mode: str = RESUME_EXTRACTION_MODE, preextract: bool = RESUME_PREEXTRACT,
+                 model_chain: Optional[List[str]] = None, stats: Optional[TierStats] = None,
+                 flights: Optional[SingleFlight] = None, guard: Optional[LLMGuard] = None,
+                 hedging: bool = LLM_HEDGING, hedger: Optional[Hedger] = None,
+                 stream_factory: Optional[Callable[[str, type], Any]] = None,
+                 incremental: bool = RESUME_INCREMENTAL_PARSE):
+        """Build a parser; the DB session can be bound here or passed per call."""
         logger.debug("Initializing ResumeParser...")
         self.db = db
         self.resume_repo = ResumeRepository
+        # Models tried in order; the first is the cheap default, later ones are escalation tiers
+        self.model_chain = model_chain or parse_model_chain(RESUME_PARSER_MODEL_CHAIN)
+        self.model_name = self.model_chain[0]
+        # Cached parses are keyed on the whole chain, since any tier may have produced them
+        self.cache_model_name = ">".join(self.model_chain)
+        self.tier_stats = stats if stats is not None else tier_stats
+        self.cache = cache if cache is not None else parse_cache
+        # Concurrent parses of the same content share one LLM call and one save
+        self.flights = flights if flights is not None else parse_flights
+        # Adaptive concurrency limit and circuit breaker shared by every call to the provider
+        self.guard = guard if guard is not None else llm_guard
+        # Opt-in backup calls for async calls that run slower than usual
+        self.hedging = hedging
+        self.hedger = hedger if hedger is not None else default_hedger
         
         # Initialize the output parser with ResumeData schema
         self.output_parser = PydanticOutputParser(pydantic_object=ResumeData)
         
+        # Structured LLMs per model and output schema; anything not passed in is built on first use
+        self.llm_factory = llm_factory or (lambda model_name, schema: build_structured_llm(model_name, schema=schema))
+        self._llms: Dict[Tuple[str, type], Any] = {}
+        # Streaming clients for the SSE endpoint, asked for on every streamed call so the provider
+        # router can pick the best backend each time; a parser built around its own LLMs has none unless given
+        if stream_factory is None and llm_factory is None:
+            stream_factory = functools.lru_cache(maxsize=None)(
+                lambda model_name, schema: build_streaming_llm(model_name, schema=schema)
+            )
+        self.stream_factory = stream_factory
+        if chunk_llm is not None:
+            self._llms[(self.model_name, PartialResumeData)] = chunk_llm
+        
         # Initialize the LLM with optimized configuration
-        self.llm = ChatOpenAI(
-            model="gpt-3.5-turbo-0125",  # Using GPT-3.5-turbo which has better token efficiency
-            temperature=0.3,  # Lower temperature for more consistent output
-            max_tokens=4000,  # Reduced max tokens
-            timeout=30,  # Added timeout
-            max_retries=3,  # Increased retries
-            api_key=OPENAI_API_KEY
-        ).with_structured_output(ResumeData, method="function_calling")
+        self.llm = llm if llm is not None else self.structured_llm(ResumeData)
+        self._llms[(self.model_name, ResumeData)] = self.llm
+        # Long resumes are parsed in chunks of at most chunk_tokens
+        self.chunk_tokens = chunk_tokens
+        self.max_chunks = max_chunks
+        # Default for calls that don't pick a mode themselves
+        self.extraction_mode = extraction_mode
+        # Rule-based pass that fills contact details and trims the text before the LLM sees it
+        self.preextract = preextract
+        # A user's re-upload only re-parses the sections that differ from their last parse
+        self.incremental = incremental
         
         logger.debug("Initialized OpenAI client")
         
@@ -88,16 +228,35 @@ class ResumeParser:
             ("system", system_prompt),
             ("human", "{resume_text}")
         ])
+        self.prompt_version = ResumeSystemPrompts.get_prompt_version()
+        # Stored with each saved parse and part of the cache key, so a prompt or schema change reparses
+        self.parse_version = f"{self.prompt_version}-{schema_version(ResumeData)}"
         logger.debug("Initialized prompt template")
     
+    def structured_llm(self, schema: type, model_name: Optional[str] = None):
+        """Structured-output LLM for a schema and model (the first tier by default), built once per parser."""
+        key = (model_name or self.model_name, schema)
+        llm = self._llms.get(key)
+        if llm is None:
+            llm = self.llm_factory(key[0], schema)
+            self._llms[key] = llm
+        return llm
+    
+    def streaming_llm(self, schema: type, model_name: Optional[str] = None):
+        """Streaming LLM for a schema and model, or None when streaming isn't available."""
+        if self.stream_factory is None:
+            return None
+        return self.stream_factory(model_name or self.model_name, schema)
+    
+    @property
+    def chunk_llm(self):
+        return self.structured_llm(PartialResumeData)
+    
     def _extract_text_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF file."""
         try:
             reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + " "
-            return text
+            return join_pages([page.extract_text() or "" for page in reader.pages])
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {e}")
             return ""
@@ -120,105 +279,704 @@ class ResumeParser:
         else:
             return ""
     
-    def parse_resume(self, resume_text: str, user_id: int, file_name: str) -> ResumeResponse:
+    def _cache_lookup_key(self, resume_text: str) -> Tuple[str, str]:
+        """Content hash and parse-cache key for a resume text."""
+        content_hash = compute_content_hash(resume_text)
+        return content_hash, ParseCache.make_key(content_hash, self.parse_version, self.cache_model_name)
+    
+    def _format_prompt(self, resume_text: str):
+        """Format the prompt messages for a single-call parse."""
+        return self.prompt.format_messages(
+            resume_text=resume_text
+        )
+    
+    def _format_chunk_prompt(self, chunk_text: str, chunk_number: int, total_chunks: int):
+        """Format the prompt messages for one chunk of a long resume."""
+        return [
+            SystemMessage(content=ResumeSystemPrompts.get_resume_chunk_prompt(chunk_number, total_chunks)),
+            HumanMessage(content=chunk_text)
+        ]
+    
+    def _plan_chunks(self, resume_text: str) -> List[str]:
+        """Split resume text into at most max_chunks chunks; short resumes stay whole."""
+        if estimate_tokens(resume_text) <= self.chunk_tokens:
+            return [resume_text]
+        
+        # Very long documents get bigger chunks rather than more calls
+        chunk_tokens = self.chunk_tokens
+        chunks = chunk_resume_text(resume_text, chunk_tokens)
+        while len(chunks) > self.max_chunks:
+            chunk_tokens *= 2
+            chunks = chunk_resume_text(resume_text, chunk_tokens)
+        return chunks
+    
+    def _chunk_prompts(self, chunks: List[str]) -> List[Any]:
+        total_chunks = len(chunks)
+        logger.debug(f"Parsing resume in {total_chunks} chunks")
+        return [self._format_chunk_prompt(chunk, i + 1, total_chunks) for i, chunk in enumerate(chunks)]
+    
+    def _merge_chunks(self, partials: List[PartialResumeData]) -> ResumeData:
+        return ResumeData.model_validate(merge_partial_results(partials))
+    
+    def _format_section_prompt(self, resume_text: str, section: str):
+        """Format the prompt messages for one section in fan-out mode."""
+        return [
+            SystemMessage(content=ResumeSystemPrompts.get_resume_section_prompt(section)),
+            HumanMessage(content=resume_text)
+        ]
+    
+    def _assemble_sections(self, results: Dict[str, Any]) -> ResumeData:
+        return ResumeData.model_validate({section: getattr(result, section) for section, result in results.items()})
+    
+    def _invoke(self, llm, messages):
+        """Single point through which every blocking LLM call goes."""
+        return self.guard.call(lambda: llm.invoke(messages))
+    
+    async def _ainvoke(self, llm, messages, latency: Optional[LatencyTracker] = None):
+        """Single point through which every async LLM call goes; latency, if given, times the provider call."""
+        if latency is None:
+            return await self.guard.acall(lambda: llm.ainvoke(messages))
+        return await self.guard.acall(lambda: latency.time(lambda: llm.ainvoke(messages)))
+    
+    def _structured_result(self, result: Any, trace: ParseTrace):
+        """Return the parsed output of a structured call, repairing the raw output locally if it failed validation."""
+        if not (isinstance(result, dict) and "raw" in result):
+            return result
+        if result.get("parsed") is not None:
+            return result["parsed"]
+        
+        raw = result["raw"]
+        tool_calls = getattr(raw, "tool_calls", None) or []
+        if not tool_calls:
+            raise result.get("parsing_error") or ValueError("LLM returned no structured output")
+        return self._repair_structured(SECTION_OR_RESUME_SCHEMAS[tool_calls[0]["name"]], tool_calls[0]["args"], trace)
+    
+    def _repair_structured(self, schema: type, args: Dict[str, Any], trace: ParseTrace):
+        """Repair structured output that failed validation, then validate it again."""
+        args = dict(args)
+        if "personal_info" in schema.model_fields and "personal_info" not in args:
+            args["personal_info"] = None
+        
+        repaired, counts = repair_resume_data(args)
+        try:
+            parsed = schema.model_validate(repaired)
+        except ValidationError:
+            repair_stats.record(counts, saved=False)
+            raise
+        repair_stats.record(counts, saved=True)
+        trace.repairs.update(counts)
+        logger.info(f"Repaired {schema.__name__} output locally: {dict(counts)}")
+        return parsed
+    
+    def _timed_invoke(self, label: str, schema: type, model_name: str, messages, trace: ParseTrace):
+        started = time.perf_counter()
+        try:
+            result = self._invoke(self.structured_llm(schema, model_name), messages)
+        finally:
+            trace.timings[label] = round(time.perf_counter() - started, 4)
+        return self._structured_result(result, trace)
+    
+    async def _timed_ainvoke(self, label: str, schema: type, model_name: str, messages, trace: ParseTrace):
+        started = time.perf_counter()
+        try:
+            if self.hedging:
+                result = await self._ahedged_invoke(schema, model_name, messages, trace)
+            else:
+                result = await self._ainvoke(self.structured_llm(schema, model_name), messages)
+        finally:
+            trace.timings[label] = round(time.perf_counter() - started, 4)
+        return self._structured_result(result, trace)
+    
+    async def _ahedged_invoke(self, schema: type, model_name: str, messages, trace: ParseTrace):
+        """Async call that sends a backup copy if it runs past the usual latency, within the parse's hedge budget."""
+        hedge_model = self.hedger.hedge_model or model_name
+        
+        def spend() -> bool:
+            if trace.hedges >= self.hedger.budget:
+                return False
+            trace.hedges += 1
+            return True
+        
+        key = f"{model_name}:{schema.__name__}"
+        # Backups run on their own clock, often on another model, and only finish when they win; kept
+        # in the primary's window they would pull its delay down and make hedges fire ever sooner
+        backup_latency = self.hedger.tracker(f"hedge:{hedge_model}:{schema.__name__}")
+        return await self.hedger.run(
+            key,
+            lambda: self._ainvoke(self.structured_llm(schema, model_name), messages, self.hedger.tracker(key)),
+            lambda: self._ainvoke(self.structured_llm(schema, hedge_model), messages, backup_latency),
+            spend
+        )
+    
+    def _plan_calls(self, resume_text: str, mode: str) -> List[Tuple[str, type, Any]]:
+        """(label, output schema, messages) for each LLM call needed to parse the text.
+
+        Long resumes are always chunked; otherwise "single" makes one call and
+        "sections" one call per ResumeData section.
+        """
+        chunks = self._plan_chunks(resume_text)
+        if len(chunks) > 1:
+            prompts = self._chunk_prompts(chunks)
+            return [(f"chunk_{i + 1}", PartialResumeData, messages) for i, messages in enumerate(prompts)]
+        if mode == EXTRACTION_MODE_SECTIONS:
+            return [
+                (section, schema, self._format_section_prompt(resume_text, section))
+                for section, schema in SECTION_SCHEMAS.items()
+            ]
+        return [("resume", ResumeData, self._format_prompt(resume_text))]
+    
+    def _combine_results(self, calls: List[Tuple[str, type, Any]], results: List[Any]) -> ResumeData:
+        labels = [label for label, _, _ in calls]
+        if labels == ["resume"]:
+            return results[0]
+        if labels[0].startswith("chunk_"):
+            return self._merge_chunks(results)
+        return self._assemble_sections(dict(zip(labels, results)))
+    
+    def _timing_label(self, label: str, model_name: str) -> str:
+        # Calls made by escalation tiers are told apart by their model
+        return label if model_name == self.model_name else f"{model_name}:{label}"
+    
+    def _call_llm(self, resume_text: str, mode: str, model_name: str, trace: ParseTrace) -> ResumeData:
+        """Parse resume text with one model, recording per-call timings and repairs."""
+        calls = self._plan_calls(resume_text, mode)
+        timed_calls = [
+            (self._timing_label(label, model_name), schema, model_name, messages) for label, schema, messages in calls
+        ]
+        if len(calls) == 1:
+            results = [self._timed_invoke(*timed_calls[0], trace)]
+        else:
+            # Each worker runs in a copy of this context so the calls keep the caller's LLM priority
+            context = contextvars.copy_context()
+            with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+                results = list(pool.map(
+                    lambda call: context.copy().run(self._timed_invoke, *call, trace), timed_calls
+                ))
+        return self._combine_results(calls, results)
+    
+    async def _acall_llm(self, resume_text: str, mode: str, model_name: str, trace: ParseTrace) -> ResumeData:
+        """Async _call_llm; multiple calls run concurrently, so latency tracks the slowest one."""
+        calls = self._plan_calls(resume_text, mode)
+        results = await asyncio.gather(*(
+            self._timed_ainvoke(self._timing_label(label, model_name), schema, model_name, messages, trace)
+            for label, schema, messages in calls
+        ))
+        return self._combine_results(calls, list(results))
+    
+    def _check_tier_result(self, model_name: str, is_last: bool, parsed_data: Optional[ResumeData],
+                           error: Optional[Exception]) -> bool:
+        """Decide whether a tier's result is final; records escalations and the serving tier."""
+        if error is not None:
+            if isinstance(error, (CircuitOpenError, QueueDeadlineExceeded)):
+                # Every tier goes to the same provider and queue, so there is nothing to escalate to
+                raise error
+            reason = ESCALATION_VALIDATION if isinstance(error, (ValidationError, OutputParserException)) else ESCALATION_ERROR
+            if is_last:
+                raise error
+            logger.warning(f"Escalating resume parse past {model_name} ({reason}): {error}")
+            self.tier_stats.record_escalation(model_name, reason)
+            return False
+        
+        issues = find_confidence_issues(parsed_data)
+        if issues and not is_last:
+            logger.warning(f"Escalating resume parse past {model_name} ({ESCALATION_LOW_CONFIDENCE}): {', '.join(issues)}")
+            self.tier_stats.record_escalation(model_name, ESCALATION_LOW_CONFIDENCE)
+            return False
+        
+        self.tier_stats.record_served(model_name)
+        return True
+    
+    def _parse_with_tiers(self, pre: PreExtraction, mode: str) -> Tuple[ResumeData, ParseTrace, str]:
+        """Try each model in the chain until one returns a valid, plausible result."""
+        trace = ParseTrace()
+        for tier, model_name in enumerate(self.model_chain):
+            parsed_data, error = None, None
+            try:
+                parsed_data = self._apply_pre_extraction(self._call_llm(pre.text, mode, model_name, trace), pre)
+            except Exception as e:
+                error = e
+            if self._check_tier_result(model_name, tier == len(self.model_chain) - 1, parsed_data, error):
+                return parsed_data, trace, model_name
+    
+    async def _aparse_with_tiers(self, pre: PreExtraction, mode: str, first_tier: int = 0,
+                                 trace: Optional[ParseTrace] = None) -> Tuple[ResumeData, ParseTrace, str]:
+        """Async _parse_with_tiers, optionally starting further down the chain."""
+        trace = trace if trace is not None else ParseTrace()
+        for tier, model_name in enumerate(self.model_chain[first_tier:], start=first_tier):
+            parsed_data, error = None, None
+            try:
+                parsed_data = self._apply_pre_extraction(await self._acall_llm(pre.text, mode, model_name, trace), pre)
+            except Exception as e:
+                error = e
+            if self._check_tier_result(model_name, tier == len(self.model_chain) - 1, parsed_data, error):
+                return parsed_data, trace, model_name
+    
+    def _cache_parsed_data(self, db: Session, content_hash: str, cache_key: str, parsed_data: ResumeData) -> None:
+        """Store a fresh LLM result in the parse cache."""
+        self.cache.put(
+            db,
+            cache_key,
+            content_hash,
+            self.parse_version,
+            self.cache_model_name,
+            parsed_data.model_dump(mode="json")
+        )
+    
+    def _failure_response(self, error: Exception, parsed_data: Optional[ResumeData]) -> ResumeResponse:
+        """Build a partial response if the LLM produced data, otherwise an error response."""
+        logger.error(f"Error parsing resume: {error}")
+        if isinstance(error, (CircuitOpenError, QueueDeadlineExceeded)):
+            return ResumeResponse(
+                status="error",
+                message="Resume parsing is temporarily unavailable",
+                data=None,
+                error=str(error)
+            )
+        # Try to return partial data if available
+        try:
+            if parsed_data is not None:
+                return ResumeResponse(
+                    status="partial",
+                    message="Resume partially parsed",
+                    data=parsed_data.dict(),
+                    error=str(error)
+                )
+        except:
+            pass
+            
+        return ResumeResponse(
+            status="error",
+            message="Failed to parse resume",
+            data=None,
+            error=str(error)
+        )
+    
+    def _pre_extract(self, resume_text: str) -> PreExtraction:
+        """Run the rule-based pre-pass, or pass the text through untouched when it is disabled."""
+        if not self.preextract:
+            tokens = estimate_tokens(resume_text)
+            return PreExtraction(text=resume_text, original_tokens=tokens, tokens=tokens)
+        pre = pre_extract(resume_text)
+        logger.debug(
+            f"Pre-extraction saved {pre.tokens_saved} of {pre.original_tokens} tokens "
+            f"in {pre.seconds * 1000:.3f}ms, found {sorted(pre.personal_info)}"
+        )
+        return pre
+    
+    def _apply_pre_extraction(self, parsed_data: ResumeData, pre: PreExtraction) -> ResumeData:
+        """Fill personal info with the deterministically extracted contact details."""
+        if pre.personal_info:
+            parsed_data.personal_info = parsed_data.personal_info.model_copy(update=pre.personal_info)
+        return parsed_data
+    
+    def _resolve_mode(self, mode: Optional[str]) -> str:
+        mode = mode or self.extraction_mode
+        if mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {mode}")
+        return mode
+    
+    def parse_resume(self, resume_text: str, user_id: int, file_name: str, db: Optional[Session] = None,
+                     mode: Optional[str] = None) -> ResumeResponse:
         """Parse resume text using LangChain and save to database."""
+        db = db if db is not None else self.db
+        parsed_data = None
         try:
-            # Truncate resume text if it's too long
-            max_length = 6000  # Leave room for system prompt and function definitions
-            if len(resume_text) > max_length:
-                resume_text = resume_text[:max_length] + "..."
-                logger.warning("Resume text was truncated to fit token limits")
+            mode = self._resolve_mode(mode)
+            # Identical text parsed with the same prompt and model is served from the cache
+            content_hash, cache_key = self._cache_lookup_key(resume_text)
+            cached_data = self.cache.get(db, cache_key)
+            if cached_data is not None:
+                logger.debug(f"Parse cache hit for content hash {content_hash[:12]}")
+                parsed_data = ResumeData.model_validate(cached_data)
+                return self._save_parsed_data(db, parsed_data, user_id, file_name, resume_text=resume_text, served_by="cache")
+
+            pre = self._pre_extract(resume_text)
             
-            # Format the prompt with the resume text
-            formatted_prompt = self.prompt.format_messages(
-                resume_text=resume_text
-            )
+            # Get response from LLM with structured output, escalating through the model tiers
+            parsed_data, trace, served_by = self._parse_with_tiers(pre, mode)
+            logger.debug(f"Response from {served_by} ({mode} mode, timings {trace.timings}): {parsed_data}")
             
-            # Get response from LLM with structured output
-            response = self.llm.invoke(formatted_prompt)
-            logger.debug(f"Response from LLM: {response}")
+            self._cache_parsed_data(db, content_hash, cache_key, parsed_data)
+
+            return self._save_parsed_data(
+                db, parsed_data, user_id, file_name, resume_text=resume_text,
+                timings=trace.timings, repairs=dict(trace.repairs), tokens_saved=pre.tokens_saved, served_by=served_by
+            )
             
-            # The response is already in the correct format due to with_structured_output
-            parsed_data = response
-
-            # Save to database using repository
-            saved_resume = ResumeRepository.save_parsed_resume(
-                self.db,
-                user_id,
-                file_name,
-                parsed_data.dict()
+        except Exception as e:
+            return self._failure_response(e, parsed_data)
+    
+    async def aparse_resume(self, resume_text: str, user_id: int, file_name: str, db: Optional[Session] = None,
+                            mode: Optional[str] = None) -> ResumeResponse:
+        """Parse resume text without blocking the event loop and save to database.
+
+        The LLM call is awaited via ainvoke; cache and database work runs in the threadpool.
+        Concurrent calls for the same content and user are coalesced into one parse and save.
+        """
+        db = db if db is not None else self.db
+        parsed_data = None
+        try:
+            mode = self._resolve_mode(mode)
+            content_hash, cache_key = self._cache_lookup_key(resume_text)
+            cached_data = await run_in_threadpool(self.cache.get, db, cache_key)
+            if cached_data is not None:
+                logger.debug(f"Parse cache hit for content hash {content_hash[:12]}")
+                parsed_data = ResumeData.model_validate(cached_data)
+                return await run_in_threadpool(
+                    self._save_parsed_data, db, parsed_data, user_id, file_name, resume_text=resume_text, served_by="cache"
+                )
+
+            return await self.flights.run(
+                f"save:{user_id}:{mode}:{cache_key}",
+                lambda: self._aparse_and_save(resume_text, user_id, file_name, db, mode, content_hash, cache_key)
             )
             
-            # Transform the saved resume data to match the response schema
-            response_data = {
-                "personal_info": saved_resume.parsed_data.get("personal_info", {}),
-                "education": saved_resume.parsed_data.get("education", []),
-                "work_experience": saved_resume.parsed_data.get("work_experience", []),
-                "skills": saved_resume.parsed_data.get("skills", [])
-            }
+        except Exception as e:
+            return self._failure_response(e, parsed_data)
+
+    async def _aparse_and_save(self, resume_text: str, user_id: int, file_name: str, db: Optional[Session],
+                               mode: str, content_hash: str, cache_key: str) -> ResumeResponse:
+        """Cache-miss path of aparse_resume, run once per coalesced group of callers.
+
+        It uses its own session on the caller's database, since the caller that started it
+        may be cancelled and have its request session closed while this is still running.
+        """
+        flight_db = Session(bind=db.get_bind()) if db is not None else None
+        parsed_data = None
+        try:
+            pre = self._pre_extract(resume_text)
+            tokens_saved = pre.tokens_saved
+            previous = await run_in_threadpool(self._previous_parse, flight_db, user_id)
+            if flight_db is not None:
+                # Give the connection back for the LLM call; the save checks one out again
+                await run_in_threadpool(flight_db.close)
+            sections = self._changed_section_texts(previous, resume_text, pre)
+            
+            if sections is not None:
+                parsed_data, trace, served_by = await self._aparse_sections_with_tiers(pre, previous[1], sections)
+                tokens_saved = pre.original_tokens - sum(estimate_tokens(text) for text in sections.values())
+                logger.info(f"Re-parsed changed sections {sorted(sections)} for user {user_id}")
+            else:
+                # Get response from LLM with structured output, escalating through the model tiers;
+                # different users uploading the same file at once still share the call
+                parsed_data, trace, served_by = await self.flights.run(
+                    f"parse:{mode}:{cache_key}", lambda: self._aparse_with_tiers(pre, mode)
+                )
+            logger.debug(f"Response from {served_by} ({mode} mode, timings {trace.timings}): {parsed_data}")
             
-            # Return successful response with the transformed data
-            return ResumeResponse(
-                status="success",
-                message="Resume parsed and saved successfully",
-                data=response_data,
-                error=None
+            await run_in_threadpool(self._cache_parsed_data, flight_db, content_hash, cache_key, parsed_data)
+
+            return await run_in_threadpool(
+                self._save_parsed_data, flight_db, parsed_data, user_id, file_name, resume_text=resume_text,
+                timings=trace.timings, repairs=dict(trace.repairs), tokens_saved=tokens_saved, served_by=served_by
             )
             
         except Exception as e:
-            logger.error(f"Error parsing resume: {e}")
-            # Try to return partial data if available
+            return self._failure_response(e, parsed_data)
+        finally:
+            if flight_db is not None:
+                await run_in_threadpool(flight_db.close)
+    
+    def _previous_parse(self, db: Optional[Session], user_id: int) -> Optional[Tuple[str, ResumeData]]:
+        """Text and result of the user's saved parse, if it came from this parser version."""
+        if not self.incremental or db is None:
+            return None
+        resume = ResumeRepository.get_resume(db, user_id)
+        if resume is None or not resume.resume_text or resume.parse_version != self.parse_version:
+            return None
+        try:
+            return resume.resume_text, ResumeData.model_validate(resume.parsed_data)
+        except ValidationError:
+            return None
+    
+    def _changed_section_texts(self, previous: Optional[Tuple[str, ResumeData]], resume_text: str,
+                               pre: PreExtraction) -> Optional[Dict[str, str]]:
+        """Pre-extracted text of each section changed since the previous parse, or None for a full parse."""
+        if previous is None:
+            return None
+        changed = changed_sections(previous[0], resume_text)
+        # Once most of the resume changed, one full call is cheaper than a call per section
+        if changed is None or len(changed) > len(SECTION_SCHEMAS) // 2:
+            return None
+        segments, raw_segments = segment_resume(pre.text), segment_resume(resume_text)
+        texts = {section: segments.get(section) or raw_segments[section] for section in changed}
+        # A section too long for one call is left to the full parse, which chunks it
+        if any(estimate_tokens(text) > self.chunk_tokens for text in texts.values()):
+            return None
+        return texts
+    
+    async def _aparse_sections_with_tiers(self, pre: PreExtraction, previous: ResumeData,
+                                          sections: Dict[str, str]) -> Tuple[ResumeData, ParseTrace, str]:
+        """Re-parse only the given sections' text and merge them into the previous result, escalating like a full parse."""
+        trace = ParseTrace()
+        if not sections:
+            return self._apply_pre_extraction(previous.model_copy(), pre), trace, SERVED_BY_PREVIOUS
+        for tier, model_name in enumerate(self.model_chain):
+            parsed_data, error = None, None
             try:
-                if 'parsed_data' in locals():
-                    return ResumeResponse(
-                        status="partial",
-                        message="Resume partially parsed",
-                        data=parsed_data.dict(),
-                        error=str(e)
+                results = await asyncio.gather(*(
+                    self._timed_ainvoke(
+                        self._timing_label(section, model_name), SECTION_SCHEMAS[section], model_name,
+                        self._format_section_prompt(text, section), trace
                     )
-            except:
-                pass
-                
-            return ResumeResponse(
-                status="error",
-                message="Failed to parse resume",
-                data=None,
-                error=str(e)
+                    for section, text in sections.items()
+                ))
+                merged = previous.model_dump()
+                merged.update({section: getattr(result, section) for section, result in zip(sections, results)})
+                parsed_data = self._apply_pre_extraction(ResumeData.model_validate(merged), pre)
+            except Exception as e:
+                error = e
+            if self._check_tier_result(model_name, tier == len(self.model_chain) - 1, parsed_data, error):
+                return parsed_data, trace, model_name
+    
+    async def aparse_text(self, resume_text: str, db: Optional[Session] = None,
+                          mode: Optional[str] = None) -> ResumeResponse:
+        """Parse resume text without saving it, for callers that save results themselves.
+
+        The parse is cached and coalesced with identical parses in flight, like aparse_resume.
+        """
+        db = db if db is not None else self.db
+        parsed_data = None
+        try:
+            mode = self._resolve_mode(mode)
+            content_hash, cache_key = self._cache_lookup_key(resume_text)
+            cached_data = await run_in_threadpool(self.cache.get, db, cache_key)
+            if cached_data is not None:
+                logger.debug(f"Parse cache hit for content hash {content_hash[:12]}")
+                if db is not None:
+                    # Nothing is saved here, so commit the cache entry's hit count now
+                    await run_in_threadpool(db.commit)
+                return self._parsed_response(ResumeData.model_validate(cached_data), served_by="cache")
+            
+            pre = self._pre_extract(resume_text)
+            parsed_data, trace, served_by = await self.flights.run(
+                f"parse:{mode}:{cache_key}", lambda: self._aparse_with_tiers(pre, mode)
             )
+            await run_in_threadpool(self._cache_parsed_data, db, content_hash, cache_key, parsed_data)
+            return self._parsed_response(
+                parsed_data,
+                timings=trace.timings, repairs=dict(trace.repairs), tokens_saved=pre.tokens_saved, served_by=served_by
+            )
+        
+        except Exception as e:
+            return self._failure_response(e, parsed_data)
     
-    async def parse_uploaded_resume(self, file, user_id: int) -> ResumeResponse:
-        """Parse an uploaded resume file and save to database."""
+    def _parsed_response(self, parsed_data: ResumeData, **details: Any) -> ResumeResponse:
+        return ResumeResponse(status="success", message="Resume parsed", data=parsed_data, error=None, **details)
+    
+    async def _astream_call(self, llm, call: Tuple[str, type, Any], on_partial: Callable[[Any], None],
+                            trace: ParseTrace):
+        """One streamed call through the guard, handing each partial result to on_partial."""
+        label, schema, messages = call
+        
+        async def consume():
+            args = None
+            async for partial in llm.astream(messages):
+                args = partial
+                on_partial(partial)
+            return args
+        
+        started = time.perf_counter()
+        try:
+            args = await self.guard.acall(consume)
+        finally:
+            trace.timings[label] = round(time.perf_counter() - started, 4)
+        if not args:
+            raise ValueError("LLM returned no structured output")
+        try:
+            return schema.model_validate(args)
+        except ValidationError:
+            return self._repair_structured(schema, args, trace)
+    
+    async def _astream_with_tiers(self, pre: PreExtraction, mode: str,
+                                  on_partial: Callable[[Any], None]) -> Tuple[ResumeData, ParseTrace, str]:
+        """_aparse_with_tiers whose first tier streams, when it is a single whole-resume call.
+
+        Chunked and per-section parses, and escalation tiers, run unstreamed.
+        """
+        calls = self._plan_calls(pre.text, mode)
+        llm = self.streaming_llm(ResumeData) if [schema for _, schema, _ in calls] == [ResumeData] else None
+        if llm is None:
+            return await self._aparse_with_tiers(pre, mode)
+        
+        trace = ParseTrace()
+        parsed_data, error = None, None
+        try:
+            parsed_data = self._apply_pre_extraction(await self._astream_call(llm, calls[0], on_partial, trace), pre)
+        except Exception as e:
+            error = e
+        if self._check_tier_result(self.model_name, len(self.model_chain) == 1, parsed_data, error):
+            return parsed_data, trace, self.model_name
+        return await self._aparse_with_tiers(pre, mode, first_tier=1, trace=trace)
+    
+    async def astream_resume(self, resume_text: str, user_id: int, file_name: str, db: Optional[Session] = None,
+                             mode: Optional[str] = None) -> AsyncIterator[StreamEvent]:
+        """aparse_resume that yields each piece of the result as soon as the LLM has finished writing it.
+
+        Yields (event, data): personal_info, then education, work_experience and skills
+        entries, then ("result", ResumeResponse). Pieces from a tier that is later
+        escalated past may differ from the final data; the result event is authoritative.
+        """
+        db = db if db is not None else self.db
+        # The response outlives the request's own session, so the stream has its own
+        stream_db = Session(bind=db.get_bind()) if db is not None else None
+        parsed_data = None
+        task = None
         try:
-            file_name = getattr(file, 'filename', file)
-            logger.debug(f"Processing uploaded resume: {file_name}")
+            mode = self._resolve_mode(mode)
+            content_hash, cache_key = self._cache_lookup_key(resume_text)
+            cached_data = await run_in_threadpool(self.cache.get, stream_db, cache_key)
+            if cached_data is not None:
+                logger.debug(f"Parse cache hit for content hash {content_hash[:12]}")
+                parsed_data = ResumeData.model_validate(cached_data)
+                for event in PartialResumeEmitter().feed(parsed_data.model_dump(mode="json"), final=True):
+                    yield event
+                yield EVENT_RESULT, await run_in_threadpool(
+                    self._save_parsed_data, stream_db, parsed_data, user_id, file_name, resume_text=resume_text, served_by="cache"
+                )
+                return
             
-            # Extract text directly from the uploaded file
-            file_extension = os.path.splitext(file_name)[1]
-            content = await file.read()
+            pre = self._pre_extract(resume_text)
+            emitter = PartialResumeEmitter(pre.personal_info)
+            events: asyncio.Queue = asyncio.Queue()
             
-            # Create a temporary file-like object
-            from io import BytesIO
-            file_obj = BytesIO(content)
+            def on_partial(partial: Any) -> None:
+                for event in emitter.feed(partial):
+                    events.put_nowait(event)
             
-            # Extract text based on file type
-            if file_extension.lower() == ".pdf":
-                reader = PdfReader(file_obj)
-                resume_text = ""
-                for page in reader.pages:
-                    resume_text += page.extract_text() + " "
-            elif file_extension.lower() == ".txt":
-                resume_text = content.decode('utf-8')
-            else:
-                raise Exception(f"Unsupported file type: {file_extension}")
+            # The parse runs as a task so events can be yielded while the call is still streaming
+            task = asyncio.ensure_future(self._astream_with_tiers(pre, mode, on_partial))
+            task.add_done_callback(lambda _: events.put_nowait(None))
+            while (event := await events.get()) is not None:
+                yield event
+            parsed_data, trace, served_by = task.result()
+            logger.debug(f"Streamed response from {served_by} ({mode} mode, timings {trace.timings}): {parsed_data}")
+            for event in emitter.feed(parsed_data.model_dump(mode="json"), final=True):
+                yield event
+            
+            await run_in_threadpool(self._cache_parsed_data, stream_db, content_hash, cache_key, parsed_data)
+            yield EVENT_RESULT, await run_in_threadpool(
+                self._save_parsed_data, stream_db, parsed_data, user_id, file_name, resume_text=resume_text,
+                timings=trace.timings, repairs=dict(trace.repairs), tokens_saved=pre.tokens_saved, served_by=served_by
+            )
+        
+        except Exception as e:
+            yield EVENT_RESULT, self._failure_response(e, parsed_data)
+        finally:
+            # A client that disconnects mid-stream stops the parse
+            if task is not None and not task.done():
+                task.cancel()
+            if stream_db is not None:
+                await run_in_threadpool(stream_db.close)
+    
+    def _save_parsed_data(self, db: Session, parsed_data: ResumeData, user_id: int, file_name: str,
+                          resume_text: Optional[str] = None, **details: Any) -> ResumeResponse:
+        """Save parsed resume data to the database and build the success response.
+
+        details (timings, repairs, tokens_saved, served_by) are passed through to the response.
+        """
+        # Save to database using repository
+        saved_resume = ResumeRepository.save_parsed_resume(
+            db,
+            user_id,
+            file_name,
+            parsed_data.model_dump(mode="json"),
+            resume_text=resume_text,
+            parse_version=self.parse_version
+        )
+        
+        # Transform the saved resume data to match the response schema
+        response_data = {
+            "personal_info": saved_resume.parsed_data.get("personal_info", {}),
+            "education": saved_resume.parsed_data.get("education", []),
+            "work_experience": saved_resume.parsed_data.get("work_experience", []),
+            "skills": saved_resume.parsed_data.get("skills", [])
+        }
+        
+        # Return successful response with the transformed data
+        return ResumeResponse(
+            status="success",
+            message="Resume parsed and saved successfully",
+            data=response_data,
+            error=None,
+            **details
+        )
+    
+    async def extract_text_from_upload(self, upload: SpooledUpload) -> str:
+        """Extract text from a spooled upload based on its extension."""
+        resume_text, _ = await self._extract_upload(upload)
+        return resume_text
+    
+    async def _extract_upload(self, upload: SpooledUpload) -> Tuple[str, Dict[str, float]]:
+        """Text of a spooled upload, and the time spent extracting it for the response timings."""
+        if upload.file_extension == ".pdf":
+            # PDF extraction is CPU-bound, so it runs in the extraction process pool
+            result = await pdf_extraction_engine.extract(upload.source)
+            return result.text, result.timings()
+        elif upload.file_extension == ".txt":
+            return upload.read_bytes().decode('utf-8'), {}
+        else:
+            raise Exception(f"Unsupported file type: {upload.file_extension}")
+    
+    @staticmethod
+    def _with_extraction_timings(response: ResumeResponse, extraction_timings: Dict[str, float]) -> ResumeResponse:
+        if extraction_timings:
+            response.timings = {**extraction_timings, **(response.timings or {})}
+        return response
+    
+    async def parse_spooled_upload(self, upload: SpooledUpload, user_id: int, db: Optional[Session] = None,
+                                   mode: Optional[str] = None) -> ResumeResponse:
+        """Parse a spooled upload and save to database."""
+        try:
+            logger.debug(f"Processing uploaded resume: {upload.file_name} (sha256 {upload.sha256[:12]})")
+            resume_text, extraction_timings = await self._extract_upload(upload)
             
             if not resume_text:
                 raise Exception("Could not extract text from file")
             logger.debug(f"Successfully extracted text from file (length: {len(resume_text)} characters)")
 
             # Parse the resume text and save to database
-            result = self.parse_resume(resume_text, user_id, file_name)
+            response = await self.aparse_resume(resume_text, user_id, upload.file_name, db, mode)
+            return self._with_extraction_timings(response, extraction_timings)
 
-            return result
+        except Exception as e:
+            logger.error(f"Error in parse_spooled_upload: {str(e)}")
+            return ResumeResponse(
+                status="error",
+                message="Failed to process uploaded resume",
+                data=None,
+                error=str(e)
+            )
+    
+    async def astream_spooled_upload(self, upload: SpooledUpload, user_id: int, db: Optional[Session] = None,
+                                     mode: Optional[str] = None) -> AsyncIterator[StreamEvent]:
+        """astream_resume for a spooled upload."""
+        try:
+            resume_text, extraction_timings = await self._extract_upload(upload)
+            if not resume_text:
+                raise Exception("Could not extract text from file")
+        except Exception as e:
+            logger.error(f"Error in astream_spooled_upload: {str(e)}")
+            yield EVENT_RESULT, ResumeResponse(
+                status="error",
+                message="Failed to process uploaded resume",
+                data=None,
+                error=str(e)
+            )
+            return
+        
+        async for name, payload in self.astream_resume(resume_text, user_id, upload.file_name, db, mode):
+            if name == EVENT_RESULT:
+                payload = self._with_extraction_timings(payload, extraction_timings)
+            yield name, payload
+    
+    async def parse_uploaded_resume(self, file, user_id: int, db: Optional[Session] = None,
+                                    mode: Optional[str] = None) -> ResumeResponse:
+        """Parse an uploaded resume file and save to database."""
+        try:
+            # Stream the upload in chunks instead of reading it into memory whole
+            with await spool_upload(file) as upload:
+                return await self.parse_spooled_upload(upload, user_id, db, mode)
 
         except Exception as e:
             logger.error(f"Error in parse_uploaded_resume: {str(e)}")
@@ -227,4 +985,4 @@ class ResumeParser:
                 message="Failed to process uploaded resume",
                 data=None,
                 error=str(e)
-            ) 
\ No newline at end of file
+            )
\ No newline at end of file
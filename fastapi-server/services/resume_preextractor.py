@@ -0,0 +1,128 @@
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from services.resume_chunker import SECTION_HEADER_RE, estimate_tokens
+
+RESUME_PREEXTRACT = os.getenv("RESUME_PREEXTRACT", "true").lower() == "true"
+
+# Contact details are only taken from the header block, so project links and dates in the body are left alone
+HEADER_BLOCK_MAX_LINES = 15
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-zA-Z]{2,}")
+PHONE_RE = re.compile(r"(?<![\w/])\+?\(?\d{1,4}\)?(?:[ .-]?\(?\d{2,5}\)?){2,5}(?![\w/])")
+# Date ranges such as "2019.01-2020.05" have phone-like digit counts
+DATE_LIKE_RE = re.compile(r"^(?:19|20)\d{2}[./-]\d{1,2}(?!\d)")
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/(?:in|pub)/[\w%-]+/?", re.IGNORECASE)
+# Bare domains must be lowercase so things like "ASP.NET" in a summary line are not taken for links
+WEBSITE_RE = re.compile(
+    r"(?i:https?://|www\.)[^\s|,;]+|\b[a-z0-9-]+(?:\.[a-z0-9-]+)*\.(?:com|dev|io|me|net|org|app|tech|ai|co)(?:/[^\s|,;]*)?"
+)
+CONTACT_LABEL_RE = re.compile(
+    r"\b(?:e-?mail|phone|tel|mobile|cell|linkedin|website|portfolio|web)\s*:?", re.IGNORECASE
+)
+# What is left of a line once contact details are removed: separators, bullets and stray punctuation
+SEPARATORS_RE = re.compile(r"^[\s|•·,;:/()\[\]–—-]*$")
+SEPARATOR_RUN_RE = re.compile(r"(?:\s*[|•·;]\s*)+")
+
+BOILERPLATE_RE = re.compile(
+    r"^[ \t]*(?:"
+    r"page \d+(?: of \d+)?"
+    r"|\d+ ?/ ?\d+"
+    r"|curriculum vitae|resume|résumé|cv"
+    r"|references(?: are)? available (?:up)?on request\.?"
+    r")[ \t]*$\n?",
+    re.IGNORECASE | re.MULTILINE
+)
+SPACE_RUN_RE = re.compile(r"[ \t]+")
+TRAILING_SPACE_RE = re.compile(r"[ \t]+$", re.MULTILINE)
+BLANK_LINES_RE = re.compile(r"\n[ \t]*(?:\n[ \t]*)+")
+
+
+@dataclass
+class PreExtraction:
+    """Outcome of the rule-based pass over one resume."""
+    text: str
+    personal_info: Dict[str, str] = field(default_factory=dict)
+    sections: List[str] = field(default_factory=list)
+    original_tokens: int = 0
+    tokens: int = 0
+    seconds: float = 0.0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.tokens
+
+
+def _find_phone(line: str) -> Optional[str]:
+    for match in PHONE_RE.finditer(line):
+        candidate = match.group().strip()
+        if DATE_LIKE_RE.match(candidate):
+            continue
+        digits = sum(c.isdigit() for c in candidate)
+        if 10 <= digits <= 15 or (candidate.startswith("+") and digits >= 8):
+            return candidate
+    return None
+
+
+def _extract_contacts(line: str, personal_info: Dict[str, str]) -> str:
+    """Record contact details found in a header line and return the line without them."""
+    # Emails and LinkedIn links go first so their domains are not mistaken for a website
+    for key, pattern in (("email", EMAIL_RE), ("linkedin", LINKEDIN_RE), ("website", WEBSITE_RE)):
+        match = pattern.search(line)
+        if match:
+            personal_info.setdefault(key, match.group())
+            line = line.replace(match.group(), " ")
+
+    phone = _find_phone(line)
+    if phone:
+        personal_info.setdefault("phone", phone)
+        line = line.replace(phone, " ")
+
+    return line
+
+
+def pre_extract(text: str) -> PreExtraction:
+    """Pull contact details out of the resume header and strip boilerplate from the text.
+
+    Emails, phone numbers and links found in the header block go straight into
+    personal_info and are removed from the text, as are lines that only held
+    contact details, page numbers or stock phrases. Everything else is kept.
+    """
+    started = time.perf_counter()
+    personal_info: Dict[str, str] = {}
+
+    header_match = SECTION_HEADER_RE.search(text)
+    header_end = header_match.start() if header_match else len(text)
+    header_lines = text[:header_end].split("\n")
+    if len(header_lines) > HEADER_BLOCK_MAX_LINES:
+        header_end = len("\n".join(header_lines[:HEADER_BLOCK_MAX_LINES]))
+        header_lines = header_lines[:HEADER_BLOCK_MAX_LINES]
+
+    kept_lines = []
+    for line in header_lines:
+        remainder = _extract_contacts(line, personal_info)
+        if remainder == line:
+            kept_lines.append(line)
+            continue
+        remainder = CONTACT_LABEL_RE.sub(" ", remainder)
+        if not SEPARATORS_RE.match(remainder):
+            # Keep whatever else was on the line, such as the location
+            kept_lines.append(SEPARATOR_RUN_RE.sub(" | ", remainder).strip(" |,;"))
+
+    stripped = "\n".join(kept_lines) + text[header_end:]
+    stripped = BOILERPLATE_RE.sub("", stripped)
+    stripped = SPACE_RUN_RE.sub(" ", stripped)
+    stripped = TRAILING_SPACE_RE.sub("", stripped)
+    stripped = BLANK_LINES_RE.sub("\n\n", stripped).strip()
+
+    return PreExtraction(
+        text=stripped,
+        personal_info=personal_info,
+        sections=[m.group().strip(" \t\f:").lower() for m in SECTION_HEADER_RE.finditer(stripped)],
+        original_tokens=estimate_tokens(text),
+        tokens=estimate_tokens(stripped),
+        seconds=time.perf_counter() - started
+    )
@@ -0,0 +1,220 @@
+"""Re-parse stored resumes after a prompt or schema change.
+
+Every parsed resume is saved with its extracted text and the parser's
+parse_version, a fingerprint of the prompts and the ResumeData schema. This
+command pages through the resumes table by id, re-parses those saved at
+another version with bounded concurrency at background LLM priority, and
+saves each page in one transaction together with the run's checkpoint, so a
+crashed run picks up after the last saved page:
+
+    python -m services.resume_reparse --dry-run     # print what would change
+    python -m services.resume_reparse --concurrency 4
+"""
+import os
+import sys
+import json
+import signal
+import asyncio
+import logging
+import argparse
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+import models
+from database import SessionLocal
+from repository.resume_repository import ResumeRepository
+from repository.reparse_checkpoint_repository import ReparseCheckpointRepository, REPARSE_COUNTS
+from services.llm_scheduler import PRIORITY_BACKGROUND, llm_priority
+
+logger = logging.getLogger(__name__)
+
+REPARSE_CONCURRENCY = int(os.getenv("REPARSE_CONCURRENCY", "4"))  # Resumes re-parsed at once
+REPARSE_PAGE_SIZE = int(os.getenv("REPARSE_PAGE_SIZE", "50"))  # Resumes read, saved and checkpointed together
+
+REPARSE_UPDATED = "updated"
+REPARSE_UNCHANGED = "unchanged"
+REPARSE_FAILED = "failed"
+REPARSE_SKIPPED = "skipped"
+
+RESUME_SECTIONS = ("education", "work_experience", "skills")
+
+
+def diff_parsed_data(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Changed personal_info fields as [old, new], and the entries added to or removed from each section."""
+    changes: Dict[str, Any] = {}
+    old_info, new_info = old.get("personal_info") or {}, new.get("personal_info") or {}
+    fields = {
+        key: [old_info.get(key), new_info.get(key)]
+        for key in sorted(set(old_info) | set(new_info))
+        if old_info.get(key) != new_info.get(key)
+    }
+    if fields:
+        changes["personal_info"] = fields
+    for section in RESUME_SECTIONS:
+        old_entries, new_entries = old.get(section) or [], new.get(section) or []
+        added = [entry for entry in new_entries if entry not in old_entries]
+        removed = [entry for entry in old_entries if entry not in new_entries]
+        if added or removed:
+            changes[section] = {"added": added, "removed": removed}
+    return changes
+
+
+@dataclass
+class StoredResume:
+    """A resume row as read for re-parsing, before its session closes."""
+    id: int
+    user_id: int
+    file_name: str
+    resume_text: str
+    parsed_data: Dict[str, Any]
+    parse_version: str
+
+
+class ResumeReparser:
+    """Brings stored resumes up to the parser's current parse_version, one checkpointed page at a time.
+
+    With dry_run set nothing is saved: each result carries the diff the re-parse would apply.
+    """
+
+    def __init__(self, parser, session_factory: Callable[[], Session] = SessionLocal, name: str = "default",
+                 concurrency: int = REPARSE_CONCURRENCY, page_size: int = REPARSE_PAGE_SIZE,
+                 mode: Optional[str] = None, dry_run: bool = False):
+        self.parser = parser
+        self.session_factory = session_factory
+        self.name = name
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.mode = mode
+        self.dry_run = dry_run
+        self._slots = asyncio.Semaphore(concurrency)
+
+    def _with_session(self, work: Callable[[Session], Any]):
+        db = self.session_factory()
+        try:
+            return work(db)
+        finally:
+            db.close()
+
+    def _read_page(self, after_id: int) -> List[StoredResume]:
+        return self._with_session(lambda db: [
+            StoredResume(r.id, r.user_id, r.file_name, r.resume_text, r.parsed_data, r.parse_version)
+            for r in ResumeRepository.get_resumes_to_reparse(db, self.parser.parse_version, after_id, self.page_size)
+        ])
+
+    async def _reparse(self, resume: StoredResume) -> Dict[str, Any]:
+        result = {"resume_id": resume.id, "user_id": resume.user_id, "file_name": resume.file_name}
+        async with self._slots:
+            db = self.session_factory()
+            try:
+                with llm_priority(PRIORITY_BACKGROUND):
+                    response = await self.parser.aparse_text(resume.resume_text, db, self.mode)
+            finally:
+                await run_in_threadpool(db.close)
+        if response.status != "success":
+            return {**result, "status": REPARSE_FAILED, "error": response.error or response.message}
+        parsed_data = response.data.model_dump(mode="json")
+        changes = diff_parsed_data(resume.parsed_data or {}, parsed_data)
+        status = REPARSE_UPDATED if changes else REPARSE_UNCHANGED
+        return {**result, "status": status, "changes": changes, "parsed_data": parsed_data}
+
+    def _save_page(self, checkpoint_id: int, page: List[StoredResume], results: List[Dict[str, Any]]) -> None:
+        """Save a page's re-parses and advance the checkpoint past it in one transaction."""
+        db = self.session_factory()
+        try:
+            for resume, result in zip(page, results):
+                if result["status"] == REPARSE_FAILED:
+                    continue
+                row = db.get(models.Resume, resume.id)
+                # A resume uploaded or edited since the page was read is newer than this re-parse
+                if row is None or row.parse_version != resume.parse_version or row.resume_text != resume.resume_text:
+                    result["status"] = REPARSE_SKIPPED
+                elif result["status"] == REPARSE_UPDATED:
+                    ResumeRepository.save_parsed_resume(
+                        db, row.user_id, row.file_name, result["parsed_data"], commit=False,
+                        resume_text=resume.resume_text, parse_version=self.parser.parse_version
+                    )
+                else:
+                    row.parse_version = self.parser.parse_version
+            counts = Counter(result["status"] for result in results)
+            ReparseCheckpointRepository.advance(db, checkpoint_id, page[-1].id, counts)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def run(self, restart: bool = False,
+                  report: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Re-parse until no stale resumes are left; returns this run's counts.
+
+        report is called with each resume's result (status, changes and the new parsed_data).
+        """
+        checkpoint_id, after_id = None, 0
+        if not self.dry_run:
+            checkpoint = await run_in_threadpool(self._with_session, lambda db: ReparseCheckpointRepository.start(
+                db, self.name, self.parser.parse_version, restart
+            ))
+            checkpoint_id, after_id = checkpoint.id, checkpoint.last_resume_id
+            if after_id:
+                logger.info(f"Resuming re-parse {self.name} after resume {after_id}")
+
+        counts = Counter()
+        while page := await run_in_threadpool(self._read_page, after_id):
+            results = await asyncio.gather(*(self._reparse(resume) for resume in page))
+            if not self.dry_run:
+                await run_in_threadpool(self._save_page, checkpoint_id, page, results)
+            for result in results:
+                counts[result["status"]] += 1
+                if report is not None:
+                    report(result)
+            after_id = page[-1].id
+            logger.info(f"Re-parse {self.name} done up to resume {after_id}: {dict(counts)}")
+
+        if not self.dry_run:
+            await run_in_threadpool(self._with_session, lambda db: ReparseCheckpointRepository.finish(
+                db, checkpoint_id
+            ))
+        return {"parse_version": self.parser.parse_version, "dry_run": self.dry_run,
+                **{count: counts[count] for count in REPARSE_COUNTS}}
+
+
+def _print_result(result: Dict[str, Any]) -> None:
+    if result["status"] in (REPARSE_UPDATED, REPARSE_FAILED):
+        print(json.dumps({key: value for key, value in result.items() if key != "parsed_data"}, default=str))
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from migrate import upgrade_database
+    from services.llm_registry import llm_registry
+
+    upgrade_database()
+    await llm_registry.startup()
+    reparser = ResumeReparser(llm_registry.get_parser(), name=args.name, concurrency=args.concurrency,
+                              page_size=args.page_size, mode=args.mode, dry_run=args.dry_run)
+    run = asyncio.ensure_future(reparser.run(restart=args.restart, report=_print_result))
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        # Pages already saved stay saved; the next run starts after the last of them
+        loop.add_signal_handler(sig, run.cancel)
+    try:
+        print(json.dumps(await run), file=sys.stderr)
+    except asyncio.CancelledError:
+        logger.warning(f"Re-parse {args.name} stopped; run it again to continue from its checkpoint")
+    finally:
+        await llm_registry.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-parse stored resumes saved with an older prompt or schema")
+    parser.add_argument("--dry-run", action="store_true", help="Print the changes as JSON lines without saving")
+    parser.add_argument("--concurrency", type=int, default=REPARSE_CONCURRENCY, help="Resumes to re-parse at once")
+    parser.add_argument("--page-size", type=int, default=REPARSE_PAGE_SIZE, help="Resumes saved per checkpoint")
+    parser.add_argument("--mode", default=None, help="Extraction mode, single or sections")
+    parser.add_argument("--name", default="default", help="Checkpoint name; separate names run separate passes")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start from the first resume")
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,66 @@
+import os
+from typing import Dict, List, Optional
+
+from services.resume_chunker import SECTION_HEADER_RE, split_sections
+
+# Re-uploads by the same user only send the sections that changed to the LLM
+RESUME_INCREMENTAL_PARSE = os.getenv("RESUME_INCREMENTAL_PARSE", "true").lower() == "true"
+
+EDUCATION_HEADERS = ("education", "academic background", "qualifications")
+WORK_HEADERS = (
+    "experience", "work experience", "professional experience", "employment",
+    "employment history", "work history", "career history"
+)
+SKILL_HEADERS = ("skills", "technical skills", "core competencies", "technologies")
+SUMMARY_HEADERS = ("summary", "professional summary", "profile", "objective", "about me")
+
+# The ResumeData section each kind of resume section feeds
+SECTION_FOR_HEADER = {
+    **{header: "personal_info" for header in SUMMARY_HEADERS},
+    **{header: "education" for header in EDUCATION_HEADERS},
+    **{header: "work_experience" for header in WORK_HEADERS},
+    **{header: "skills" for header in SKILL_HEADERS},
+}
+RESUME_SECTIONS = ("personal_info", "education", "work_experience", "skills")
+# Projects, awards, references and the like, which any ResumeData section may draw on
+OTHER_SECTION = "other"
+
+
+def header_name(block: str) -> Optional[str]:
+    """The section header a split_sections block starts with, lower-cased, or None for the text before any header."""
+    header = block.partition("\n")[0]
+    return header.strip(" \t\f:").lower() if SECTION_HEADER_RE.match(header) else None
+
+
+def segment_resume(text: str) -> Dict[str, str]:
+    """Resume text grouped by the ResumeData section it feeds, keeping each block's header.
+
+    Text before the first header (name and contact details) goes with personal_info.
+    """
+    segments: Dict[str, List[str]] = {}
+    for block in split_sections(text):
+        header = header_name(block)
+        section = "personal_info" if header is None else SECTION_FOR_HEADER.get(header, OTHER_SECTION)
+        segments.setdefault(section, []).append(block)
+    return {section: "\n\n".join(blocks) for section, blocks in segments.items()}
+
+
+def _normalized(segment: str) -> str:
+    return " ".join(segment.split())
+
+
+def changed_sections(old_text: str, new_text: str) -> Optional[List[str]]:
+    """ResumeData sections whose text differs between two versions of a resume.
+
+    None when the change can't be pinned to sections: a resume without section
+    headers, a change outside the four mapped sections, or a section removed.
+    """
+    old, new = segment_resume(old_text), segment_resume(new_text)
+    if set(old) <= {"personal_info", OTHER_SECTION} or set(old) != set(new):
+        return None
+    if _normalized(old.get(OTHER_SECTION, "")) != _normalized(new.get(OTHER_SECTION, "")):
+        return None
+    return [
+        section for section in RESUME_SECTIONS
+        if section in new and _normalized(old[section]) != _normalized(new[section])
+    ]
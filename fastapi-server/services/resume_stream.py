@@ -0,0 +1,78 @@
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+
+from schemas.resume_schemas import PersonalInfo
+from services.schema_repair import SECTION_MODELS, SchemaRepair
+
+logger = logging.getLogger(__name__)
+
+EVENT_PERSONAL_INFO = "personal_info"
+EVENT_RESULT = "result"  # Closing event carrying the full /api/resume/parse response
+
+StreamEvent = Tuple[str, Any]
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Event, encoding data the way FastAPI encodes JSON responses."""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+class PartialResumeEmitter:
+    """Turns the growing ResumeData arguments of a streamed call into one event per finished piece.
+
+    A piece is finished once something follows it: personal_info when a later
+    key appears, an entry when the next entry or section starts, and anything
+    left when the stream ends. Each piece is repaired and validated on its own
+    and emitted at most once; pieces that don't validate are left to the final result.
+    """
+
+    def __init__(self, personal_info: Optional[Dict[str, Any]] = None):
+        # Contact details found by pre-extraction override what the model wrote, as in the final result
+        self.personal_info = personal_info or {}
+        self.personal_info_sent = False
+        self.entries_seen = {section: 0 for section in SECTION_MODELS}
+
+    def _personal_info_event(self, value: Any) -> Optional[StreamEvent]:
+        repaired = SchemaRepair().repair({"personal_info": value})["personal_info"]
+        try:
+            info = PersonalInfo.model_validate({**repaired, **self.personal_info})
+        except ValidationError:
+            return None
+        return EVENT_PERSONAL_INFO, info.model_dump(mode="json")
+
+    def _entry_event(self, section: str, value: Any) -> Optional[StreamEvent]:
+        repaired = SchemaRepair().repair({section: [value]})[section]
+        if not repaired:
+            return None
+        try:
+            entry = SECTION_MODELS[section].model_validate(repaired[0])
+        except ValidationError:
+            return None
+        return section, entry.model_dump(mode="json")
+
+    def feed(self, partial: Any, final: bool = False) -> List[StreamEvent]:
+        """Events for the pieces of partial that finished since the last call."""
+        if not isinstance(partial, dict):
+            return []
+        events = []
+        keys = list(partial)
+        for position, key in enumerate(keys):
+            closed = final or position < len(keys) - 1
+            value = partial[key]
+            if key == "personal_info":
+                if closed and not self.personal_info_sent:
+                    self.personal_info_sent = True
+                    events.append(self._personal_info_event(value))
+            elif key in SECTION_MODELS and isinstance(value, list):
+                finished = len(value) if closed else len(value) - 1
+                while self.entries_seen[key] < finished:
+                    events.append(self._entry_event(key, value[self.entries_seen[key]]))
+                    self.entries_seen[key] += 1
+        if final and not self.personal_info_sent and self.personal_info:
+            self.personal_info_sent = True
+            events.append(self._personal_info_event({}))
+        return [event for event in events if event is not None]
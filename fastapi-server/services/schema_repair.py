@@ -0,0 +1,214 @@
+import re
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from schemas.resume_schemas import PersonalInfo, Education, WorkExperience, Skill
+
+logger = logging.getLogger(__name__)
+
+# Repair kinds, counted per parse and process-wide
+REPAIR_WRAPPED_SCALAR = "wrapped_scalar"
+REPAIR_DROPPED_UNKNOWN_KEY = "dropped_unknown_key"
+REPAIR_COERCED_TYPE = "coerced_type"
+REPAIR_COERCED_DATE = "coerced_date"
+REPAIR_UNPARSEABLE_DATE = "unparseable_date"
+REPAIR_CURRENT_JOB = "current_job"
+REPAIR_SWAPPED_DATES = "swapped_dates"
+REPAIR_FILLED_DEFAULT = "filled_default"
+REPAIR_DROPPED_EMPTY_ENTRY = "dropped_empty_entry"
+
+SECTION_MODELS = {
+    "education": Education,
+    "work_experience": WorkExperience,
+    "skills": Skill
+}
+
+# Fields that are not plain strings, so numbers in them are not stringified
+NON_STRING_FIELDS = {WorkExperience: ("start_date", "end_date", "is_current_job")}
+
+CURRENT_JOB_RE = re.compile(r"^\s*(?:present|current(?:ly)?|now|ongoing|to date|till date|today)\s*$", re.IGNORECASE)
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12
+}
+MONTH_YEAR_RE = re.compile(r"^\s*([a-z]+)\.?,?\s+(\d{4})\s*$", re.IGNORECASE)
+NUMERIC_MONTH_YEAR_RE = re.compile(r"^\s*(\d{1,2})\s*[/.-]\s*(\d{4})\s*$")
+YEAR_MONTH_RE = re.compile(r"^\s*(\d{4})(?:\s*[/.-]\s*(\d{1,2}))?(?:\s*[/.-]\s*(\d{1,2}))?\s*$")
+
+
+def coerce_date(value: Any) -> Optional[datetime]:
+    """Best-effort parse of the date formats resumes and LLMs actually produce."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, int) and 1900 <= value <= 2100:
+        return datetime(value, 1, 1)
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return datetime.fromisoformat(value.strip().replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        pass
+
+    match = YEAR_MONTH_RE.match(value)
+    if match:
+        year, month, day = match.group(1), match.group(2) or 1, match.group(3) or 1
+        parts = (int(year), int(month), int(day))
+    else:
+        match = NUMERIC_MONTH_YEAR_RE.match(value)
+        if match:
+            parts = (int(match.group(2)), int(match.group(1)), 1)
+        else:
+            match = MONTH_YEAR_RE.match(value)
+            if not match:
+                return None
+            name = match.group(1).lower()
+            month = MONTHS.get(name[:4]) or MONTHS.get(name[:3])
+            if not month:
+                return None
+            parts = (int(match.group(2)), month, 1)
+    try:
+        return datetime(*parts)
+    except ValueError:
+        return None
+
+
+class SchemaRepair:
+    """One deterministic repair pass over raw structured output, counting every fix."""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def _record(self, kind: str) -> None:
+        self.counts[kind] += 1
+
+    def _clean_entry(self, entry: Dict[str, Any], model) -> Dict[str, Any]:
+        """Drop keys the model doesn't know and turn stray numbers into strings."""
+        cleaned = {}
+        for key, value in entry.items():
+            if key not in model.model_fields:
+                self._record(REPAIR_DROPPED_UNKNOWN_KEY)
+                continue
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and key not in NON_STRING_FIELDS.get(model, ()):
+                value = str(value)
+                self._record(REPAIR_COERCED_TYPE)
+            elif isinstance(value, str) and not value.strip():
+                value = None
+            cleaned[key] = value
+        return cleaned
+
+    def _as_list(self, value: Any) -> List[Any]:
+        if value is None:
+            return []
+        if isinstance(value, list):
+            return value
+        self._record(REPAIR_WRAPPED_SCALAR)
+        if isinstance(value, str):
+            return [part.strip() for part in value.split(",") if part.strip()]
+        return [value]
+
+    def _repair_personal_info(self, value: Any) -> Dict[str, Any]:
+        if isinstance(value, list):
+            value = value[0] if value else None
+            self._record(REPAIR_WRAPPED_SCALAR)
+        if value is None:
+            self._record(REPAIR_FILLED_DEFAULT)
+            return {}
+        if isinstance(value, str):
+            self._record(REPAIR_COERCED_TYPE)
+            return {"name": value}
+        return self._clean_entry(value, PersonalInfo)
+
+    def _repair_work_dates(self, entry: Dict[str, Any]) -> None:
+        if entry.get("is_current_job") is None:
+            entry["is_current_job"] = False
+            self._record(REPAIR_FILLED_DEFAULT)
+        elif not isinstance(entry["is_current_job"], bool):
+            entry["is_current_job"] = str(entry["is_current_job"]).strip().lower() in ("true", "yes", "1")
+            self._record(REPAIR_COERCED_TYPE)
+
+        end_date = entry.get("end_date")
+        if isinstance(end_date, str) and CURRENT_JOB_RE.match(end_date):
+            entry["end_date"] = None
+            entry["is_current_job"] = True
+            self._record(REPAIR_CURRENT_JOB)
+
+        for key in ("start_date", "end_date"):
+            value = entry.get(key)
+            if value is None:
+                continue
+            parsed = coerce_date(value)
+            if parsed is None:
+                self._record(REPAIR_UNPARSEABLE_DATE)
+            elif not (isinstance(value, str) and value.startswith(parsed.strftime("%Y-%m-%d"))):
+                self._record(REPAIR_COERCED_DATE)
+            entry[key] = parsed.strftime("%Y-%m-%d") if parsed else None
+
+        if entry.get("start_date") and entry.get("end_date") and entry["end_date"] < entry["start_date"]:
+            entry["start_date"], entry["end_date"] = entry["end_date"], entry["start_date"]
+            self._record(REPAIR_SWAPPED_DATES)
+
+    def _repair_section(self, section: str, value: Any) -> List[Dict[str, Any]]:
+        model = SECTION_MODELS[section]
+        entries = []
+        for entry in self._as_list(value):
+            if isinstance(entry, str):
+                if section != "skills":
+                    self._record(REPAIR_DROPPED_EMPTY_ENTRY)
+                    continue
+                entry = {"name": entry}
+                self._record(REPAIR_COERCED_TYPE)
+            if not isinstance(entry, dict):
+                self._record(REPAIR_DROPPED_EMPTY_ENTRY)
+                continue
+            entry = self._clean_entry(entry, model)
+            if section == "work_experience":
+                self._repair_work_dates(entry)
+            meaningful = {k: v for k, v in entry.items() if v is not None and k != "is_current_job"}
+            if not meaningful or (section == "skills" and not entry.get("name")):
+                self._record(REPAIR_DROPPED_EMPTY_ENTRY)
+                continue
+            entries.append(entry)
+        return entries
+
+    def repair(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Repair whichever resume sections are present in raw."""
+        repaired = {}
+        for key, value in (raw or {}).items():
+            if key == "personal_info":
+                repaired[key] = self._repair_personal_info(value)
+            elif key in SECTION_MODELS:
+                repaired[key] = self._repair_section(key, value)
+            else:
+                self._record(REPAIR_DROPPED_UNKNOWN_KEY)
+        return repaired
+
+
+def repair_resume_data(raw: Dict[str, Any]) -> Tuple[Dict[str, Any], Counter]:
+    """Repair raw resume output; returns the repaired data and the count of each repair."""
+    repair = SchemaRepair()
+    return repair.repair(raw), repair.counts
+
+
+class RepairStats:
+    """Process-wide totals of repaired outputs and repairs by kind."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._repairs = Counter()
+        self._outcomes = Counter()
+
+    def record(self, counts: Counter, saved: bool) -> None:
+        with self._lock:
+            self._repairs.update(counts)
+            self._outcomes["saved" if saved else "failed"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"outputs": dict(self._outcomes), "repairs": dict(self._repairs)}
+
+
+# Process-wide counters, read by the repair stats endpoint
+repair_stats = RepairStats()
@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one in-flight computation.
+
+    The first caller for a key starts the work as its own task; callers that
+    arrive while it is running await that same task and get the same result or
+    exception. Each caller awaits through asyncio.shield, so a caller being
+    cancelled (for example its client disconnecting) only stops that caller
+    from waiting: the work carries on for everyone else.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, work: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(work())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+            logger.debug(f"Joining in-flight computation for {key[:40]}")
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Nobody may be left to await a failed task; retrieve the exception so it isn't reported as lost
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._in_flight),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced
+        }
+
+
+# Process-wide flights for resume parsing
+parse_flights = SingleFlight()
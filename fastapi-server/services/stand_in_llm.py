@@ -0,0 +1,201 @@
+"""Local stand-in for an OpenAI-compatible chat-completions server.
+
+Answers structured-output (tool call) requests for the resume schemas with a
+deterministic, rule-based parse of the resume text, so the whole parsing
+pipeline can be exercised and load-tested without network access. Streaming
+requests get the tool arguments in small deltas spread over the latency. Point
+the "local" LLM backend at it, or mount the app on an httpx ASGITransport in tests.
+
+    python -m services.stand_in_llm --port 8099 --latency 0.5
+"""
+import json
+import asyncio
+import hashlib
+import argparse
+import itertools
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from schemas.resume_schemas import PersonalInfoSection, EducationSection, WorkExperienceSection, SkillsSection
+from services.resume_chunker import SECTION_HEADER_RE, estimate_tokens, split_sections
+from services.resume_preextractor import pre_extract
+from services.resume_sections import EDUCATION_HEADERS, WORK_HEADERS, SKILL_HEADERS, SUMMARY_HEADERS
+
+# Section tools answer with just their one field
+SECTION_TOOLS = {
+    schema.__name__: next(iter(schema.model_fields))
+    for schema in (PersonalInfoSection, EducationSection, WorkExperienceSection, SkillsSection)
+}
+BULLETS = " \t-*•·"
+STREAM_DELTA_CHARS = 24  # Tool-argument characters per streamed chunk
+STREAM_FIRST_CHUNK_SHARE = 0.1  # Share of the latency spent before the first streamed chunk
+
+
+def _entries(body: str) -> List[str]:
+    return [line.strip(BULLETS) for line in body.split("\n") if line.strip(BULLETS)]
+
+
+def _work_entry(line: str) -> Dict[str, Any]:
+    title, separator, company = line.partition(" at ")
+    if not separator:
+        company, separator, title = line.partition(" | ")
+    return {"company": company.strip() or None, "job_title": title.strip() or None}
+
+
+def parse_resume_text(text: str) -> Dict[str, Any]:
+    """Deterministic rule-based ResumeData arguments for a resume text."""
+    personal_info: Dict[str, Any] = dict(pre_extract(text).personal_info)
+    data = {"personal_info": personal_info, "education": [], "work_experience": [], "skills": []}
+
+    for block in split_sections(text):
+        header, _, body = block.partition("\n")
+        if not SECTION_HEADER_RE.match(header):
+            # Text before the first header: the name is its first line that isn't contact details
+            lines = [line for line in _entries(pre_extract(block).text) if not SECTION_HEADER_RE.match(line)]
+            if lines and "name" not in personal_info:
+                personal_info["name"] = lines[0]
+            continue
+        section = header.strip(" \t\f:").lower()
+        if section in EDUCATION_HEADERS:
+            data["education"] += [{"institution": line} for line in _entries(body)]
+        elif section in WORK_HEADERS:
+            data["work_experience"] += [_work_entry(line) for line in _entries(body)]
+        elif section in SKILL_HEADERS:
+            data["skills"] += [
+                {"name": name.strip()} for line in _entries(body) for name in line.split(",") if name.strip()
+            ]
+        elif section in SUMMARY_HEADERS:
+            personal_info["summary"] = " ".join(_entries(body)) or None
+    return data
+
+
+def tool_arguments(tool_name: str, text: str, canned: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Arguments for a structured-output tool call: the whole parse, or one section of it."""
+    data = canned if canned is not None else parse_resume_text(text)
+    if tool_name in SECTION_TOOLS:
+        section = SECTION_TOOLS[tool_name]
+        return {section: data.get(section)}
+    return data
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content
+
+
+def _stream_chunks(completion: Dict[str, Any], delay: float):
+    """Server-sent chat.completion.chunk events for a tool-call completion."""
+    tool_call = completion["choices"][0]["message"]["tool_calls"][0]
+    arguments = tool_call["function"]["arguments"]
+    pieces = [arguments[i:i + STREAM_DELTA_CHARS] for i in range(0, len(arguments), STREAM_DELTA_CHARS)]
+    base = {key: completion[key] for key in ("id", "created", "model")}
+
+    def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+        choice = {"index": 0, "delta": delta, "finish_reason": finish_reason}
+        return f"data: {json.dumps({**base, 'object': 'chat.completion.chunk', 'choices': [choice]})}\n\n"
+
+    async def events():
+        if delay:
+            await asyncio.sleep(delay * STREAM_FIRST_CHUNK_SHARE)
+        yield chunk({"role": "assistant", "content": None, "tool_calls": [{
+            "index": 0, "id": tool_call["id"], "type": "function",
+            "function": {"name": tool_call["function"]["name"], "arguments": ""}
+        }]})
+        for piece in pieces:
+            if delay:
+                await asyncio.sleep(delay * (1 - STREAM_FIRST_CHUNK_SHARE) / len(pieces))
+            yield chunk({"tool_calls": [{"index": 0, "function": {"arguments": piece}}]})
+        yield chunk({}, "tool_calls")
+        usage = {**base, "object": "chat.completion.chunk", "choices": [], "usage": completion["usage"]}
+        yield f"data: {json.dumps(usage)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return events()
+
+
+def create_stand_in_app(latency: float = 0.0, jitter: float = 0.0, fail_every: int = 0,
+                        canned: Optional[Dict[str, Any]] = None) -> FastAPI:
+    """Build the stand-in app.
+
+    latency: seconds every completion takes; jitter: extra fraction of latency, fixed per prompt.
+    fail_every: answer every n-th completion with a 503 (0 never fails); canned: fixed ResumeData to return.
+    """
+    app = FastAPI(title="LLM stand-in")
+    counter = itertools.count(1)
+    app.state.requests = 0
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "stand-in", "object": "model", "owned_by": "local"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        number = next(counter)
+        app.state.requests = number
+        messages = body.get("messages", [])
+        prompt = "\n".join(_message_text(m) for m in messages)
+        digest = hashlib.sha256(prompt.encode()).hexdigest()
+
+        delay = latency * (1 + jitter * int(digest[:4], 16) / 0xFFFF)
+        streaming = bool(body.get("stream"))
+        if delay and not streaming:
+            await asyncio.sleep(delay)
+        if fail_every and number % fail_every == 0:
+            return JSONResponse(status_code=503, content={"error": {"message": "Stand-in outage", "type": "server_error"}})
+
+        text = _message_text(next((m for m in reversed(messages) if m.get("role") == "user"), {}))
+        tools = body.get("tools") or []
+        tool_name = tools[0]["function"]["name"] if tools else "ResumeData"
+        arguments = json.dumps(tool_arguments(tool_name, text, canned))
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(arguments)
+        completion = {
+            "id": f"chatcmpl-{digest[:24]}",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body.get("model", "stand-in"),
+            "choices": [{
+                "index": 0,
+                "message": {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [{
+                        "id": f"call_{digest[:24]}",
+                        "type": "function",
+                        "function": {"name": tool_name, "arguments": arguments}
+                    }]
+                },
+                "finish_reason": "tool_calls"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+        if streaming:
+            return StreamingResponse(_stream_chunks(completion, delay), media_type="text/event-stream")
+        return completion
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the local LLM stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per completion")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra latency as a fraction, fixed per prompt")
+    parser.add_argument("--fail-every", type=int, default=0, help="Fail every n-th completion with a 503")
+    args = parser.parse_args()
+    uvicorn.run(
+        create_stand_in_app(latency=args.latency, jitter=args.jitter, fail_every=args.fail_every),
+        host=args.host,
+        port=args.port
+    )
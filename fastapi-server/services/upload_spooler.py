@@ -0,0 +1,164 @@
+import os
+import codecs
+import hashlib
+import logging
+import tempfile
+from io import BytesIO
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", str(5 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+UPLOAD_SPOOL_THRESHOLD = int(os.getenv("UPLOAD_SPOOL_THRESHOLD", str(1024 * 1024)))
+
+SUPPORTED_EXTENSIONS = (".pdf", ".txt")
+
+# PDF readers accept the header anywhere in the first kilobyte
+_PDF_MAGIC = b"%PDF-"
+_PDF_MAGIC_WINDOW = 1024
+
+
+class UploadRejected(Exception):
+    """Raised when an upload is too large or not a supported resume file."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class SpooledUpload:
+    """An uploaded file held in memory while small and spilled to a temp file past a threshold.
+
+    The SHA-256 and size are computed while the chunks are written, so neither
+    needs a second pass over the content.
+    """
+
+    def __init__(self, file_name: str, spool_threshold: int = UPLOAD_SPOOL_THRESHOLD):
+        self.file_name = file_name
+        self.file_extension = os.path.splitext(file_name)[1].lower()
+        self.spool_threshold = spool_threshold
+        self.size = 0
+        self._hasher = hashlib.sha256()
+        self._memory: Optional[BytesIO] = BytesIO()
+        self._disk = None
+        self.path: Optional[str] = None
+
+    @property
+    def sha256(self) -> str:
+        return self._hasher.hexdigest()
+
+    @property
+    def on_disk(self) -> bool:
+        return self.path is not None
+
+    def write(self, chunk: bytes) -> None:
+        self._hasher.update(chunk)
+        self.size += len(chunk)
+        if self._memory is not None and self.size > self.spool_threshold:
+            self._spill()
+        (self._disk or self._memory).write(chunk)
+
+    def _spill(self) -> None:
+        self._disk = tempfile.NamedTemporaryFile(prefix="upload-", suffix=self.file_extension, delete=False)
+        self.path = self._disk.name
+        self._disk.write(self._memory.getbuffer())
+        self._memory.close()
+        self._memory = None
+
+    def finish(self) -> None:
+        """Flush the spool so the content can be read back."""
+        if self._disk is not None:
+            self._disk.close()
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """The content for readers that accept either bytes or a file path."""
+        return self.path if self.on_disk else self._memory.getvalue()
+
+    def read_bytes(self) -> bytes:
+        if self.on_disk:
+            with open(self.path, "rb") as f:
+                return f.read()
+        return self._memory.getvalue()
+
+    def cleanup(self) -> None:
+        if self._memory is not None:
+            self._memory.close()
+            self._memory = None
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+        if self.path and os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cleanup()
+
+
+def _check_first_chunk(upload: SpooledUpload, chunk: bytes) -> None:
+    """Reject payloads whose leading bytes don't match the declared file type."""
+    if upload.file_extension == ".pdf" and _PDF_MAGIC not in chunk[:_PDF_MAGIC_WINDOW]:
+        raise UploadRejected("Invalid file format. File does not look like a PDF.", status_code=415)
+    if upload.file_extension == ".txt" and b"\x00" in chunk:
+        raise UploadRejected("Invalid file format. Text resumes must be UTF-8 text.", status_code=415)
+
+
+async def spool_upload(
+    file,
+    max_size: int = MAX_UPLOAD_SIZE,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    spool_threshold: int = UPLOAD_SPOOL_THRESHOLD
+) -> SpooledUpload:
+    """Stream an UploadFile into a SpooledUpload, hashing and size-checking each chunk.
+
+    Unsupported or mismatched file types are rejected on the first chunk and
+    oversized uploads as soon as they cross max_size.
+    """
+    file_name = getattr(file, 'filename', None) or ""
+    upload = SpooledUpload(file_name, spool_threshold=spool_threshold)
+    if upload.file_extension not in SUPPORTED_EXTENSIONS:
+        raise UploadRejected(
+            f"Invalid file format. Please upload a PDF or TXT file (got '{upload.file_extension or file_name}').",
+            status_code=415
+        )
+
+    # Validate UTF-8 incrementally so a multi-byte character split across chunks is fine
+    text_decoder = codecs.getincrementaldecoder("utf-8")() if upload.file_extension == ".txt" else None
+    try:
+        first = True
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            if first:
+                _check_first_chunk(upload, chunk)
+                first = False
+            if upload.size + len(chunk) > max_size:
+                raise UploadRejected(f"File too large. Maximum upload size is {max_size} bytes.", status_code=413)
+            if text_decoder is not None:
+                try:
+                    text_decoder.decode(chunk)
+                except UnicodeDecodeError:
+                    raise UploadRejected("Invalid file format. Text resumes must be UTF-8 text.", status_code=415)
+            upload.write(chunk)
+        if text_decoder is not None:
+            try:
+                text_decoder.decode(b"", final=True)
+            except UnicodeDecodeError:
+                raise UploadRejected("Invalid file format. Text resumes must be UTF-8 text.", status_code=415)
+        if upload.size == 0:
+            raise UploadRejected("Uploaded file is empty.")
+        upload.finish()
+    except BaseException:
+        upload.cleanup()
+        raise
+
+    logger.debug(
+        f"Spooled upload {file_name} ({upload.size} bytes, sha256 {upload.sha256[:12]}, "
+        f"{'disk' if upload.on_disk else 'memory'})"
+    )
+    return upload
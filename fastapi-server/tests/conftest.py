@@ -1,8 +1,9 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
 import os
 import sys
 from typing import Generator, Dict, Any
@@ -12,10 +13,21 @@ from unittest.mock import MagicMock
 # Add the parent directory to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Tests never reach a real provider; the app's own clients point at the local stand-in backend
+os.environ.setdefault("LLM_BACKENDS", "local")
+
+import httpx
+
 from main import app
-from database import get_db
+from database import get_db, get_async_db
 from models import Base
-from services.resume_parser import ResumeParser, MockOpenAIClient
+from services.resume_parser import ResumeParser
+from services.llm_registry import get_resume_parser
+from services.llm_providers import BACKEND_LOCAL, ProviderRouter, make_backend
+from services.llm_guard import LLMGuard
+from services.parse_cache import ParseCache
+from services.single_flight import SingleFlight
+from services.stand_in_llm import create_stand_in_app
 
 # Create an in-memory SQLite database for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -27,6 +39,11 @@ engine = create_engine(
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The async routes reach the same file through aiosqlite; each session gets its own
+# connection, as the TestClient runs the app on an event loop of its own
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Mock resume data for testing
 MOCK_RESUME_DATA = {
     "personal_info": {
@@ -95,7 +112,7 @@ def db() -> Generator[Session, None, None]:
 @pytest.fixture(scope="function")
 def client(db, mock_resume_parser) -> Generator[TestClient, None, None]:
     """
-    Create a test client with a dependency override for the database.
+    Create a test client with dependency overrides for the database and the resume parser.
     """
     def override_get_db():
         try:
@@ -103,54 +120,68 @@ def client(db, mock_resume_parser) -> Generator[TestClient, None, None]:
         finally:
             pass
     
-    # Create a patched version of ResumeParser initialization
-    original_init = ResumeParser.__init__
-    
-    def patched_init(self, mock_client=None):
-        # Use the preconfigured mock client from mock_resume_parser
-        mock_client = mock_resume_parser.client
-        original_init(self, mock_client=mock_client)
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
     
-    # Apply the patch
-    ResumeParser.__init__ = patched_init
-    
-    # Override the dependency
+    # Override the dependencies
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_resume_parser] = lambda: mock_resume_parser
     
     # Create a test client
     with TestClient(app) as client:
         yield client
     
-    # Reset the overrides and restore original init
+    # Reset the overrides
     app.dependency_overrides = {}
-    ResumeParser.__init__ = original_init
 
 
-@pytest.fixture
-def mock_resume_parser(monkeypatch):
+@pytest.fixture(scope="function")
+def statements() -> Generator[list, None, None]:
     """
-    Mock the ResumeParser class to return predictable test data.
+    SQL statements sent to the test database while the test runs; clear it before the part being counted.
     """
-    from services.resume_parser import MockOpenAIClient
-    
-    # Create a mock client with the test data
-    mock_client = MockOpenAIClient(MOCK_RESUME_DATA)
-    
-    # Create the parser with the mock client
-    parser = ResumeParser(mock_client=mock_client)
-    
-    # Override the parse_uploaded_resume method to return the mock data
-    async def mock_parse_uploaded_resume(self, file):
-        # Check file extension to simulate validation
-        if not file.filename.endswith(('.pdf', '.docx', '.txt')):
-            raise ValueError("Invalid file format. Please upload a PDF, DOCX, or TXT file.")
-        return MOCK_RESUME_DATA
-    
-    # Apply the patch to the parser instance
-    parser.parse_uploaded_resume = mock_parse_uploaded_resume.__get__(parser, ResumeParser)
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", record)
+    yield executed
+    for target in (engine, async_engine.sync_engine):
+        event.remove(target, "before_cursor_execute", record)
+
+
+def make_stand_in_parser(**stand_in_options) -> ResumeParser:
+    """
+    Build a ResumeParser whose LLM calls go to the in-process stand-in chat-completions server.
     
-    # Return the parser with mock client
-    return parser
+    Nothing leaves the process: the sync client is a TestClient and the async one an ASGI transport.
+    """
+    stand_in = create_stand_in_app(**stand_in_options)
+    router = ProviderRouter([make_backend(
+        BACKEND_LOCAL,
+        http_client=TestClient(stand_in, base_url="http://stand-in"),
+        http_async_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=stand_in)),
+        base_url="http://stand-in/v1"
+    )])
+    return ResumeParser(
+        llm_factory=router.structured_llm,
+        stream_factory=router.streaming_llm,
+        cache=ParseCache(),
+        flights=SingleFlight(),
+        guard=LLMGuard()
+    )
+
+
+@pytest.fixture
+def mock_resume_parser():
+    """
+    A ResumeParser backed by the stand-in LLM, which always answers with MOCK_RESUME_DATA.
+    """
+    return make_stand_in_parser(canned=MOCK_RESUME_DATA)
 
 
 @pytest.fixture
@@ -167,4 +198,38 @@ def mock_file():
         async def read(self):
             return self._read_data
     
-    return MockFile() 
\ No newline at end of file
+    return MockFile() 
+
+def make_text_pdf(page_texts) -> bytes:
+    """
+    Build a minimal PDF with one line of Helvetica text per page.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for text in page_texts:
+        escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        stream = f"BT /F1 12 Tf 72 720 Td ({escaped}) Tj ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % ref for ref in page_refs)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_refs)
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return pdf
@@ -0,0 +1,69 @@
+import asyncio
+import time
+import aiosqlite
+import pytest
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from main import app
+from database import get_async_db
+from tests.integration.api.test_query_counts import user_with_resume
+
+# Round trip to a database over the network, which SQLite on local disk doesn't have
+STATEMENT_LATENCY = 0.02
+CONCURRENT_CLIENTS = 20
+REQUESTS_PER_CLIENT = 5
+
+
+async def slow_connection():
+    """aiosqlite connection whose driver thread waits STATEMENT_LATENCY on every statement, as a network would"""
+    conn = aiosqlite.connect("./test.db", check_same_thread=False)
+    await conn
+    await conn.set_trace_callback(lambda statement: time.sleep(STATEMENT_LATENCY))
+    return conn
+
+
+@pytest.fixture
+def slow_database_app(db: Session):
+    """App whose async routes reach the test database through a pool of slow connections"""
+    slow_engine = create_async_engine(
+        "sqlite+aiosqlite:///./test.db", async_creator=slow_connection, pool_size=CONCURRENT_CLIENTS, max_overflow=0
+    )
+    SlowSession = async_sessionmaker(slow_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with SlowSession() as async_db:
+            yield async_db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    yield user_with_resume(db, "load@example.com", 20)
+    app.dependency_overrides = {}
+    asyncio.run(slow_engine.dispose())
+
+
+async def _client_loop(client: httpx.AsyncClient, urls):
+    for n in range(REQUESTS_PER_CLIENT):
+        response = await client.get(urls[n % len(urls)])
+        assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_user_endpoints_serve_concurrent_requests_while_queries_wait(slow_database_app):
+    """One worker keeps serving while queries are in flight, instead of one request per round trip"""
+    user_id = slow_database_app
+    urls = [f"/api/users/me?user_id={user_id}", f"/api/users/{user_id}"]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # Open the pool's connections before timing
+        await asyncio.gather(*(client.get(urls[0]) for _ in range(CONCURRENT_CLIENTS)))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(_client_loop(client, urls) for _ in range(CONCURRENT_CLIENTS)))
+        elapsed = time.perf_counter() - start
+
+    requests_per_second = CONCURRENT_CLIENTS * REQUESTS_PER_CLIENT / elapsed
+    # Each request is one query; a worker blocking on its driver would top out at one request per round trip
+    blocking_ceiling = 1 / STATEMENT_LATENCY
+    print(f"{requests_per_second:.0f} requests/s against a blocking ceiling of {blocking_ceiling:.0f}")
+    assert requests_per_second > 2 * blocking_ceiling
@@ -0,0 +1,56 @@
+import io
+import zipfile
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+import models
+from main import app
+from tests.integration.api.test_resume_stream import parse_sse
+from tests.integration.api.test_stand_in_pipeline import resume_text, stand_in_app  # noqa: F401
+
+
+def zipped(entries) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, content in entries:
+            zf.writestr(name, content)
+    return buffer.getvalue()
+
+
+def test_bulk_upload_parses_and_saves_each_resume(stand_in_app, db: Session):
+    archive = zipped([(f"batch/{n}.txt", resume_text(n)) for n in range(1, 4)])
+    files = [
+        ("files", ("resumes.zip", archive, "application/zip")),
+        ("files", ("4.txt", resume_text(4).encode(), "text/plain")),
+        ("files", ("again.txt", resume_text(1).encode(), "text/plain")),
+    ]
+
+    response = TestClient(app).post("/api/resume/bulk?match_email=true", files=files)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    assert events[-1][0] == "summary"
+    assert {key: events[-1][1][key] for key in ("total", "saved", "duplicate")} == {"total": 5, "saved": 4, "duplicate": 1}
+
+    saved = {data["email"]: data for event, data in events if event == "file" and data["status"] == "saved"}
+    assert set(saved) == {f"candidate{n}@example.com" for n in range(1, 5)}
+    resume = db.query(models.Resume).filter(models.Resume.user_id == saved["candidate2@example.com"]["user_id"]).one()
+    assert (resume.file_name, resume.parsed_data["personal_info"]["email"]) == ("batch/2.txt", "candidate2@example.com")
+    # Kept so the resume can be re-parsed after a prompt or schema change
+    assert (resume.resume_text, resume.parse_version) == (resume_text(2), stand_in_app.parse_version)
+
+
+def test_bulk_upload_rejects_unknown_mode(client):
+    response = client.post("/api/resume/bulk?mode=bogus", files=[("files", ("1.txt", b"text", "text/plain"))])
+    assert response.status_code == 400
+
+
+def test_bulk_upload_rejects_invalid_user_map(client):
+    files = [("files", ("1.txt", b"text", "text/plain"))]
+    for user_map in ("not json", '["1.txt"]', '{"1.txt": "one"}'):
+        response = client.post("/api/resume/bulk", files=files, data={"user_map": user_map})
+        assert response.status_code == 400
+    response = client.post("/api/resume/bulk?match_email=true", files=files, data={"user_map": '{"1.txt": 1}'})
+    assert response.status_code == 400
+
@@ -0,0 +1,16 @@
+from sqlalchemy.orm import Session
+
+import models
+from services.parse_cache import parse_cache
+
+
+def test_invalidate_removes_cached_parses(client, db: Session):
+    parse_cache.put(db, "key-1", "hash-1", "v1", "model", {"skills": []})
+    parse_cache.put(db, "key-2", "hash-2", "v1", "model", {"skills": []})
+
+    one = client.delete("/api/resume/cache?content_hash=hash-1")
+    rest = client.delete("/api/resume/cache")
+
+    assert (one.status_code, one.json()["deleted"]) == (200, 1)
+    assert (rest.status_code, rest.json()["deleted"]) == (200, 1)
+    assert db.query(models.ParseCacheEntry).count() == 0
@@ -0,0 +1,41 @@
+import pytest
+
+from services.parse_jobs import ParseWorker
+from tests.conftest import TestingSessionLocal
+
+
+def upload(client, path: str):
+    return client.post(path, files={"file": ("resume.txt", b"John Doe\nSoftware engineer", "text/plain")})
+
+
+@pytest.mark.asyncio
+async def test_queued_parse_is_run_by_a_worker(client, mock_resume_parser):
+    response = upload(client, "/api/resume/parse?queue=true&user_id=7")
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    queued = client.get(f"/api/resume/jobs/{job_id}").json()
+    assert (queued["status"], queued["attempts"], queued["result"]) == ("queued", 0, None)
+    assert client.get("/api/resume/jobs/stats").json()["queued"] == 1
+
+    assert await ParseWorker(mock_resume_parser, session_factory=TestingSessionLocal).run_once()
+
+    finished = client.get(f"/api/resume/jobs/{job_id}").json()
+    assert (finished["status"], finished["attempts"], finished["user_id"]) == ("succeeded", 1, 7)
+    assert finished["result"]["status"] == "success"
+    assert finished["result"]["data"]["personal_info"]["name"] == "John Doe"
+    assert finished["finished_at"] is not None
+
+
+def test_unknown_job_is_404(client):
+    assert client.get("/api/resume/jobs/12345").status_code == 404
+
+
+def test_queued_upload_that_cannot_be_read_is_400(client):
+    response = client.post("/api/resume/parse?queue=true",
+                           files={"file": ("resume.pdf", b"%PDF-1.4 truncated", "application/pdf")})
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Could not extract text from file")
+    assert client.get("/api/resume/jobs/stats").json().get("queued", 0) == 0
+
@@ -0,0 +1,46 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+import schemas
+from repository.resume_repository import ResumeRepository
+from repository.user_repository import UserRepository
+from tests.conftest import MOCK_RESUME_DATA
+
+
+def user_with_resume(db: Session, email: str, skills: int) -> int:
+    """A user with a profile and a saved resume of the given number of skills, with the session cleared"""
+    user_id = UserRepository.create_user(db, schemas.UserCreate(email=email)).id
+    UserRepository.create_user_profile(db, schemas.ProfileCreate(first_name="Jane"), user_id)
+    ResumeRepository.save_parsed_resume(db, user_id, "resume.pdf", {
+        **MOCK_RESUME_DATA, "skills": [{"name": f"Skill {n}", "category": "Tools"} for n in range(skills)]
+    })
+    db.expunge_all()
+    return user_id
+
+
+def test_current_user_takes_at_most_two_queries(client: TestClient, db: Session, statements):
+    """The user, profile and resume load together however much resume data there is"""
+    counts = {}
+    for skills in (1, 200):
+        user_id = user_with_resume(db, f"user{skills}@example.com", skills)
+        statements.clear()
+
+        response = client.get(f"/api/users/me?user_id={user_id}")
+
+        assert response.status_code == 200
+        assert response.json()["profile"]["first_name"] == "Jane"
+        assert len(response.json()["resume"]["parsed_data"]["skills"]) == skills
+        counts[skills] = len(statements)
+
+    assert counts[1] == counts[200] <= 2
+
+
+def test_stored_resume_takes_one_query(client: TestClient, db: Session, statements):
+    user_id = user_with_resume(db, "resume@example.com", 200)
+    statements.clear()
+
+    response = client.get(f"/api/resume/{user_id}")
+
+    assert response.status_code == 200
+    assert response.json()["file_name"] == "resume.pdf"
+    assert len(statements) == 1
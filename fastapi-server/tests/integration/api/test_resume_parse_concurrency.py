@@ -0,0 +1,107 @@
+import asyncio
+import time
+import pytest
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from main import app
+from database import get_db
+from schemas.resume_schemas import ResumeData
+from services.parse_cache import ParseCache
+from services.resume_parser import ResumeParser
+from tests.conftest import SQLALCHEMY_DATABASE_URL
+from services.llm_registry import get_resume_parser
+
+LLM_LATENCY = 0.5
+PARALLEL_PARSES = 8
+
+PARSED_DATA = {
+    "personal_info": {"name": "John Doe", "email": "john@example.com"},
+    "education": [{"institution": "MIT", "degree": "BS"}],
+    "work_experience": [{"company": "Google", "job_title": "Engineer"}],
+    "skills": [{"name": "Python", "category": "Programming"}]
+}
+
+
+class SlowAsyncLLM:
+    """Stand-in for the structured-output LLM that takes LLM_LATENCY seconds to answer"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ainvoke(self, messages):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(LLM_LATENCY)
+            return ResumeData.model_validate(PARSED_DATA)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def async_parse_app(db: Session):
+    """App with one DB session per request and a slow fake LLM behind /api/resume/parse"""
+    llm = SlowAsyncLLM()
+    # The shared test engine uses a single StaticPool connection; concurrent
+    # requests need their own connections to the same database file
+    pooled_engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+    PooledSession = sessionmaker(autocommit=False, autoflush=False, bind=pooled_engine)
+
+    def override_get_db():
+        session = PooledSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    parser = ResumeParser(llm=llm, cache=ParseCache())
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_resume_parser] = lambda: parser
+    yield llm
+    app.dependency_overrides = {}
+    pooled_engine.dispose()
+
+
+async def _timed_get(client: httpx.AsyncClient, url: str) -> float:
+    start = time.perf_counter()
+    response = await client.get(url)
+    assert response.status_code == 200
+    return time.perf_counter() - start
+
+
+@pytest.mark.asyncio
+async def test_user_latency_stays_flat_during_parses(async_parse_app):
+    """/api/users/me must not wait on in-flight LLM calls"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # Warm up and measure idle latency
+        await client.get("/api/users/me")
+        idle = max([await _timed_get(client, "/api/users/me") for _ in range(3)])
+
+        # Every parse uses distinct text so none of them is a cache hit
+        parses = [
+            asyncio.create_task(client.post(
+                "/api/resume/parse",
+                files={"file": (f"resume_{i}.txt", f"John Doe resume {i}".encode(), "text/plain")}
+            ))
+            for i in range(PARALLEL_PARSES)
+        ]
+        # Wait for every parse to reach the LLM, however long the upload handling took
+        deadline = time.perf_counter() + LLM_LATENCY / 2
+        while async_parse_app.in_flight < PARALLEL_PARSES and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+        assert async_parse_app.in_flight == PARALLEL_PARSES
+
+        busy = max([await _timed_get(client, "/api/users/me") for _ in range(3)])
+        # Still in flight: the user requests were served while the LLM calls were pending
+        assert async_parse_app.in_flight == PARALLEL_PARSES
+
+        responses = await asyncio.gather(*parses)
+
+    assert all(r.status_code == 200 for r in responses)
+    assert async_parse_app.max_in_flight == PARALLEL_PARSES
+    assert busy < LLM_LATENCY / 2
+    assert busy < idle + 0.1
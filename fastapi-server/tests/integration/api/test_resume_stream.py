@@ -0,0 +1,47 @@
+import json
+from typing import Any, List, Tuple
+
+from tests.conftest import MOCK_RESUME_DATA
+
+
+def parse_sse(body: str) -> List[Tuple[str, Any]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def upload(client, path: str, text: str = "John Doe\nSoftware engineer"):
+    return client.post(path, files={"file": ("resume.txt", text.encode(), "text/plain")})
+
+
+def test_stream_emits_pieces_then_the_parse_response(client):
+    response = upload(client, "/api/resume/parse/stream")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    names = [event for event, _ in events]
+    assert names == ["personal_info", "education", "work_experience", "skills", "skills", "skills", "result"]
+    assert events[0][1]["name"] == MOCK_RESUME_DATA["personal_info"]["name"]
+    assert events[1][1]["institution"] == "Stanford University"
+    assert [data["name"] for event, data in events if event == "skills"] == ["Python", "React", "FastAPI"]
+
+    result = events[-1][1]
+    assert result["status"] == "success"
+    assert result["data"]["personal_info"]["name"] == "John Doe"
+
+
+def test_stream_result_matches_parse(client):
+    streamed = parse_sse(upload(client, "/api/resume/parse/stream").text)[-1][1]
+    parsed = upload(client, "/api/resume/parse").json()
+
+    assert parsed["served_by"] == "cache"
+    assert streamed["data"] == parsed["data"]
+    assert set(streamed) == set(parsed)
+
+
+def test_stream_rejects_unknown_mode(client):
+    response = upload(client, "/api/resume/parse/stream?mode=bogus")
+    assert response.status_code == 400
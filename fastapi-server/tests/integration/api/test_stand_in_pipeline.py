@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from main import app
+from database import get_db
+from services.llm_registry import get_resume_parser
+from tests.conftest import SQLALCHEMY_DATABASE_URL, make_stand_in_parser
+
+STAND_IN_LATENCY = 0.2
+UPLOADS = 20
+
+
+def resume_text(number: int) -> str:
+    return (
+        f"Candidate {number}\n"
+        f"candidate{number}@example.com\n\n"
+        "Education\n"
+        "- MIT\n\n"
+        "Experience\n"
+        f"- Engineer at Company {number}\n\n"
+        "Skills\n"
+        "Python, FastAPI\n"
+    )
+
+
+@pytest.fixture
+def stand_in_app(db: Session):
+    """App whose parser talks to the local stand-in LLM, with one DB session per request"""
+    # Each upload holds a request session and a parse session at once
+    pooled_engine = create_engine(
+        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, pool_size=UPLOADS, max_overflow=UPLOADS
+    )
+    PooledSession = sessionmaker(autocommit=False, autoflush=False, bind=pooled_engine)
+
+    def override_get_db():
+        session = PooledSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    parser = make_stand_in_parser(latency=STAND_IN_LATENCY)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_resume_parser] = lambda: parser
+    yield parser
+    app.dependency_overrides = {}
+    pooled_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_uploads_through_the_stand_in(stand_in_app):
+    """The full upload -> parse -> save pipeline under load, with no network access"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+        async def upload(number: int) -> httpx.Response:
+            return await client.post(
+                "/api/resume/parse",
+                data={"user_id": str(number)},
+                files={"file": (f"resume{number}.txt", resume_text(number).encode(), "text/plain")}
+            )
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        responses = await asyncio.gather(*(upload(n) for n in range(1, UPLOADS + 1)))
+        elapsed = loop.time() - started
+
+    for number, response in enumerate(responses, start=1):
+        assert response.status_code == 200, response.text
+        data = response.json()["data"]
+        assert data["personal_info"]["name"] == f"Candidate {number}"
+        assert data["personal_info"]["email"] == f"candidate{number}@example.com"
+        assert data["education"][0]["institution"] == "MIT"
+        assert data["work_experience"][0]["company"] == f"Company {number}"
+        assert [skill["name"] for skill in data["skills"]] == ["Python", "FastAPI"]
+    # Stand-in calls overlap instead of queueing behind each other
+    assert elapsed < UPLOADS * STAND_IN_LATENCY / 2
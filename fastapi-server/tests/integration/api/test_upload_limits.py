@@ -0,0 +1,75 @@
+import pytest
+import httpx
+from fastapi import FastAPI, UploadFile, File
+
+from unittest.mock import MagicMock
+
+from main import app
+from api.middleware import UploadSizeLimitMiddleware
+from services.llm_registry import get_resume_parser
+from services.resume_parser import ResumeParser
+from services.upload_spooler import MAX_UPLOAD_SIZE
+
+
+@pytest.fixture
+def offline_parser():
+    """Keep the parse route from building a real LLM client"""
+    app.dependency_overrides[get_resume_parser] = lambda: ResumeParser(llm=MagicMock())
+    yield
+    app.dependency_overrides = {}
+
+
+@pytest.mark.asyncio
+async def test_declared_oversized_body_is_rejected_with_413():
+    """A Content-Length over the limit is rejected before the body is parsed"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        files = {"file": ("resume.pdf", b"%PDF-" + b"x" * (MAX_UPLOAD_SIZE + 100 * 1024), "application/pdf")}
+        response = await client.post("/api/resume/parse", files=files)
+
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_streamed_oversized_body_is_cut_off():
+    """Bodies without a Content-Length are counted as they arrive"""
+    received_chunks = []
+
+    async def chunked_body():
+        yield (
+            b'--xyz\r\nContent-Disposition: form-data; name="file"; filename="resume.txt"\r\n'
+            b'Content-Type: text/plain\r\n\r\n'
+        )
+        for _ in range(64):
+            received_chunks.append(1)
+            yield b"x" * 1024
+
+    small_app = FastAPI()
+
+    @small_app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"ok": True}
+
+    limited = UploadSizeLimitMiddleware(small_app, limits={"/upload": 8 * 1024})
+    transport = httpx.ASGITransport(app=limited)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/upload",
+            content=chunked_body(),
+            headers={"content-type": "multipart/form-data; boundary=xyz"}
+        )
+
+    assert response.status_code == 413
+    assert len(received_chunks) < 64
+
+
+@pytest.mark.asyncio
+async def test_unsupported_file_type_is_rejected_with_415(offline_parser):
+    """Non-PDF/TXT uploads are rejected before parsing"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        files = {"file": ("photo.jpg", b"\xff\xd8\xff\xe0 jpeg data", "image/jpeg")}
+        response = await client.post("/api/resume/parse", files=files)
+
+    assert response.status_code == 415
+    assert "Invalid file format" in response.json()["detail"]
@@ -2,30 +2,13 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 import json
-from tests.conftest import MOCK_RESUME_DATA
+from tests.conftest import MOCK_RESUME_DATA, make_text_pdf
 
 
-@pytest.fixture
-def mock_resumeparser_in_main(monkeypatch):
-    """Mock the entire ResumeParser class in main.py"""
-    class MockResumeParser:
-        def __init__(self, mock_client=None):
-            pass
-        
-        async def parse_uploaded_resume(self, file):
-            if not file.filename.endswith(('.pdf', '.docx', '.txt')):
-                raise ValueError("Invalid file format. Please upload a PDF, DOCX, or TXT file.")
-            return MOCK_RESUME_DATA
-    
-    # Patch the ResumeParser class in main module
-    import main
-    monkeypatch.setattr(main, "ResumeParser", MockResumeParser)
-
-
-def test_parse_resume(client: TestClient, db: Session, mock_resumeparser_in_main):
-    """Test parsing a resume file"""
-    # Create a mock file upload
-    files = {"file": ("resume.pdf", b"mock pdf data", "application/pdf")}
+def test_parse_resume(client: TestClient, db: Session):
+    """Test parsing a resume file with the shared parser"""
+    # A real one-page PDF, answered by the stand-in LLM with MOCK_RESUME_DATA
+    files = {"file": ("resume.pdf", make_text_pdf(["John Doe", "Software Engineer"]), "application/pdf")}
     
     # Make the request
     response = client.post("/api/resume/parse", files=files)
@@ -33,21 +16,26 @@ def test_parse_resume(client: TestClient, db: Session, mock_resumeparser_in_main
     # Check status code
     assert response.status_code == 200
     
-    # Verify response matches our mock data
+    # Verify the parsed data is the stand-in's answer, and that it was saved
     data = response.json()
-    assert data == MOCK_RESUME_DATA
+    assert data["status"] == "success"
+    assert data["data"]["personal_info"]["name"] == MOCK_RESUME_DATA["personal_info"]["name"]
+    assert [skill["name"] for skill in data["data"]["skills"]] == [
+        skill["name"] for skill in MOCK_RESUME_DATA["skills"]
+    ]
+    assert client.get("/api/resume/1").json()["file_name"] == "resume.pdf"
 
 
-def test_parse_resume_invalid_file(client: TestClient, db: Session, mock_resumeparser_in_main):
+def test_parse_resume_invalid_file(client: TestClient, db: Session):
     """Test parsing with an invalid file format"""
-    # Create an invalid file upload (not a PDF/DOCX/TXT)
+    # Create an invalid file upload (not a PDF/TXT)
     files = {"file": ("invalid.jpg", b"mock image data", "image/jpeg")}
     
     # Make the request
     response = client.post("/api/resume/parse", files=files)
     
-    # Check that we get a 400 error for invalid file format
-    assert response.status_code == 400
+    # Unsupported file types are rejected before the upload is read
+    assert response.status_code == 415
     assert "Invalid file format" in response.json()["detail"]
 
 
@@ -101,7 +89,7 @@ def test_manual_onboarding(client: TestClient, db: Session):
     }
     
     # Make the request
-    response = client.post("/api/onboarding/manual", json=profile_data)
+    response = client.post("/api/users/onboarding/manual", json=profile_data)
     
     # Check status code
     assert response.status_code == 200
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy.orm import Session
+
+import models
+import schemas
+from repository.resume_repository import AsyncResumeRepository
+from repository.user_repository import AsyncUserRepository
+from tests.conftest import MOCK_RESUME_DATA, TestingAsyncSessionLocal
+
+
+@pytest.mark.asyncio
+async def test_user_loads_with_profile_and_resume(db: Session):
+    """Everything /api/users/me serializes is loaded up front, so nothing lazy loads after the query"""
+    async with TestingAsyncSessionLocal() as async_db:
+        user = await AsyncUserRepository.create_user(async_db, schemas.UserCreate(email="async@example.com"))
+        await AsyncUserRepository.create_user_profile(async_db, schemas.ProfileCreate(first_name="Jane"), user.id)
+        await AsyncUserRepository.save_resume(async_db, user.id, "resume.pdf", MOCK_RESUME_DATA)
+
+    async with TestingAsyncSessionLocal() as async_db:
+        loaded = await AsyncUserRepository.get_user_with_profile_and_resume(async_db, user.id)
+
+    response = schemas.UserProfileResumeResponse.model_validate(loaded)
+    assert response.profile.first_name == "Jane"
+    assert response.resume.file_name == "resume.pdf"
+
+
+@pytest.mark.asyncio
+async def test_async_save_replaces_the_resume_and_its_child_rows(db: Session):
+    """The async save upserts the same rows the sync one does"""
+    async with TestingAsyncSessionLocal() as async_db:
+        user = await AsyncUserRepository.create_user(async_db, schemas.UserCreate(email="resave@example.com"))
+        first = await AsyncResumeRepository.save_parsed_resume(async_db, user.id, "old.pdf", MOCK_RESUME_DATA)
+        second = await AsyncResumeRepository.save_parsed_resume(async_db, user.id, "new.pdf", {
+            **MOCK_RESUME_DATA, "skills": [{"name": "Go", "category": "Programming Language"}]
+        })
+
+    assert second.id == first.id
+    assert second.file_name == "new.pdf"
+    assert [skill.name for skill in db.query(models.Skill).all()] == ["Go"]
+    assert db.query(models.Education).count() == len(MOCK_RESUME_DATA["education"])
+
+
+@pytest.mark.asyncio
+async def test_async_delete_removes_the_resume_and_its_child_rows(db: Session):
+    async with TestingAsyncSessionLocal() as async_db:
+        user = await AsyncUserRepository.create_user(async_db, schemas.UserCreate(email="delete@example.com"))
+        await AsyncResumeRepository.save_parsed_resume(async_db, user.id, "resume.pdf", MOCK_RESUME_DATA)
+
+        assert await AsyncResumeRepository.delete_resume(async_db, user.id)
+        assert not await AsyncResumeRepository.delete_resume(async_db, user.id)
+
+    assert db.query(models.Resume).count() == 0
+    assert db.query(models.Skill).count() == 0
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from repository.parse_job_repository import (
+    ParseJobRepository, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, JOB_FAILED
+)
+from tests.conftest import engine
+
+
+def enqueue(db: Session, name: str = "resume.txt", max_attempts: int = 3):
+    return ParseJobRepository.enqueue(db, 1, name, "John Doe resume", max_attempts=max_attempts)
+
+
+def test_claims_oldest_job_once(db: Session):
+    first, second = enqueue(db, "first.txt"), enqueue(db, "second.txt")
+
+    claimed = ParseJobRepository.claim(db, "worker-a", lease_seconds=60)
+    assert claimed.id == first.id
+    assert (claimed.status, claimed.attempts, claimed.worker_id) == (JOB_RUNNING, 1, "worker-a")
+    assert ParseJobRepository.claim(db, "worker-b", lease_seconds=60).id == second.id
+    assert ParseJobRepository.claim(db, "worker-c", lease_seconds=60) is None
+
+
+def test_expired_lease_is_claimed_again(db: Session):
+    job = enqueue(db)
+    ParseJobRepository.claim(db, "crashed", lease_seconds=60)
+
+    later = datetime.utcnow() + timedelta(seconds=61)
+    reclaimed = ParseJobRepository.claim(db, "worker-b", lease_seconds=60, now=later)
+    assert (reclaimed.id, reclaimed.attempts, reclaimed.worker_id) == (job.id, 2, "worker-b")
+    # The worker that lost the lease can no longer record an outcome
+    assert not ParseJobRepository.complete(db, job.id, "crashed", {"status": "success"})
+    assert ParseJobRepository.complete(db, job.id, "worker-b", {"status": "success"})
+    assert ParseJobRepository.get_job(db, job.id).status == JOB_SUCCEEDED
+
+
+def test_expired_lease_on_last_attempt_fails_the_job(db: Session):
+    job = enqueue(db, max_attempts=1)
+    ParseJobRepository.claim(db, "crashed", lease_seconds=60)
+
+    later = datetime.utcnow() + timedelta(seconds=61)
+    assert ParseJobRepository.claim(db, "worker-b", lease_seconds=60, now=later) is None
+    db.expire_all()
+    assert ParseJobRepository.get_job(db, job.id).status == JOB_FAILED
+
+
+def test_claim_fails_an_expired_last_attempt_and_takes_the_next_job(db: Session):
+    exhausted = enqueue(db, "exhausted.txt", max_attempts=1)
+    ParseJobRepository.claim(db, "crashed", lease_seconds=60)
+    waiting = enqueue(db, "waiting.txt")
+
+    later = datetime.utcnow() + timedelta(seconds=61)
+    assert ParseJobRepository.claim(db, "worker-b", lease_seconds=60, now=later).id == waiting.id
+    db.expire_all()
+    assert ParseJobRepository.get_job(db, exhausted.id).status == JOB_FAILED
+
+
+def test_idle_claim_does_not_write(db: Session):
+    """Workers poll an empty queue constantly; those polls must not each be a write transaction"""
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert ParseJobRepository.claim(db, "worker-a", lease_seconds=60) is None
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert statements and all(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+
+
+def test_released_job_waits_for_its_retry_time(db: Session):
+    job = enqueue(db)
+    ParseJobRepository.claim(db, "worker-a", lease_seconds=60)
+    retry_at = datetime.utcnow() + timedelta(seconds=30)
+    assert ParseJobRepository.release(db, job.id, "worker-a", "provider down", retry_at)
+
+    db.expire_all()
+    queued = ParseJobRepository.get_job(db, job.id)
+    assert (queued.status, queued.error) == (JOB_QUEUED, "provider down")
+    assert ParseJobRepository.claim(db, "worker-a", lease_seconds=60) is None
+    assert ParseJobRepository.claim(db, "worker-a", lease_seconds=60, now=retry_at).id == job.id
+
+    assert ParseJobRepository.release(db, job.id, "worker-a", "still down")
+    db.expire_all()
+    assert ParseJobRepository.count_by_status(db) == {
+        JOB_QUEUED: 0, JOB_RUNNING: 0, JOB_SUCCEEDED: 0, JOB_FAILED: 1
+    }
@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import models
+import schemas
+from migrate import upgrade_database
+from repository.resume_repository import ResumeRepository
+from repository.user_repository import UserRepository
+from tests.conftest import MOCK_RESUME_DATA
+
+
+@pytest.fixture
+def migrated(tmp_path):
+    """A session on a database built by the migrations, and the statements sent to it while recording"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    upgrade_database(engine)
+    sent = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, parameters, *args: sent.append((statement, parameters)))
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield db, sent
+    db.close()
+    engine.dispose()
+
+
+def query_plan(db, statement: str, parameters) -> str:
+    """SQLite's plan for a statement, one step per line"""
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def plans_touching(db, sent, table: str):
+    return [
+        query_plan(db, statement, parameters) for statement, parameters in sent
+        if statement.lstrip().startswith(("SELECT", "DELETE")) and f" {table} " in f"{statement} "
+    ]
+
+
+def assert_searches(plans, index: str):
+    """Each plan looks rows up through the index rather than scanning the table"""
+    assert plans
+    for plan in plans:
+        assert f"INDEX {index} " in plan and "SCAN" not in plan, plan
+
+
+def saved_user(db) -> int:
+    user_id = UserRepository.create_user(db, schemas.UserCreate(email="plans@example.com")).id
+    UserRepository.create_user_profile(db, schemas.ProfileCreate(first_name="Jane"), user_id)
+    ResumeRepository.save_parsed_resume(db, user_id, "resume.pdf", MOCK_RESUME_DATA)
+    db.expunge_all()
+    return user_id
+
+
+def test_resave_finds_child_rows_by_index(migrated):
+    db, sent = migrated
+    user_id = saved_user(db)
+    sent.clear()
+
+    ResumeRepository.save_parsed_resume(db, user_id, "resume.pdf", MOCK_RESUME_DATA)
+
+    for table in ("education", "work_experience", "skills"):
+        assert_searches(plans_touching(db, sent, table), f"ix_{table}_resume_id")
+
+
+def test_user_and_resume_reads_search_by_index(migrated):
+    db, sent = migrated
+    user_id = saved_user(db)
+    sent.clear()
+
+    user = UserRepository.get_user_with_profile_and_resume(db, user_id)
+    resume = ResumeRepository.get_resume(db, user_id)
+    assert [skill.name for skill in resume.skills] == ["Python", "React", "FastAPI"]
+    assert user.profile.first_name == "Jane"
+
+    assert_searches(plans_touching(db, sent, "profiles"), "ix_profiles_user_id")
+    assert_searches(plans_touching(db, sent, "resumes"), "ix_resumes_user_id")
+    assert_searches(plans_touching(db, sent, "skills"), "ix_skills_resume_id")
+
+
+def test_skill_lookup_reads_only_the_index(migrated):
+    db, sent = migrated
+    saved_user(db)
+    sent.clear()
+
+    resume_ids = db.query(models.Skill.resume_id).filter(models.Skill.name == "Python").all()
+
+    assert len(resume_ids) == 1
+    plans = plans_touching(db, sent, "skills")
+    assert_searches(plans, "ix_skills_name_resume_id")
+    # The resume ids come from the index entries themselves
+    assert "COVERING" in plans[0]
@@ -0,0 +1,101 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+import models
+import schemas
+from repository.resume_repository import ResumeRepository
+from repository.user_repository import UserRepository
+from schemas.resume_schemas import ResumeData
+from tests.conftest import MOCK_RESUME_DATA, SQLALCHEMY_DATABASE_URL
+
+
+def test_save_parsed_resume_with_current_job(db: Session):
+    """Parsed output with is_current_job and ISO datetimes saves without errors"""
+    user = UserRepository.create_user(db, schemas.UserCreate(email="resume_repo@example.com"))
+    parsed = ResumeData.model_validate({
+        **MOCK_RESUME_DATA,
+        "work_experience": [
+            {"company": "Acme", "job_title": "Engineer", "start_date": "2021-05-01", "is_current_job": True},
+            {"company": "Initech", "job_title": "Intern", "start_date": "2019-06-01", "end_date": "2020-08-01"},
+            {"company": "Unknown dates"}
+        ]
+    })
+
+    resume = ResumeRepository.save_parsed_resume(db, user.id, "resume.pdf", parsed.model_dump(mode="json"))
+
+    rows = db.query(models.WorkExperience).filter(models.WorkExperience.resume_id == resume.id).all()
+    assert [(r.company, r.start_date, r.end_date) for r in rows] == [
+        ("Acme", "2021-05-01", None),
+        ("Initech", "2019-06-01", "2020-08-01"),
+        ("Unknown dates", None, None)
+    ]
+    # The full parse, including fields without a column, is kept on the resume
+    assert resume.parsed_data["work_experience"][0]["is_current_job"] is True
+
+
+def with_skills(count: int):
+    return {**MOCK_RESUME_DATA, "skills": [{"name": f"Skill {n}", "category": "Tools"} for n in range(count)]}
+
+
+def test_resave_replaces_all_child_rows(db: Session):
+    """Education and skills from an earlier upload don't pile up next to the new ones"""
+    user = UserRepository.create_user(db, schemas.UserCreate(email="resave@example.com"))
+    ResumeRepository.save_parsed_resume(db, user.id, "old.pdf", with_skills(3))
+
+    resume = ResumeRepository.save_parsed_resume(db, user.id, "new.pdf", with_skills(2))
+
+    assert [skill.name for skill in resume.skills] == ["Skill 0", "Skill 1"]
+    assert len(resume.education) == len(MOCK_RESUME_DATA["education"])
+    assert db.query(models.Skill).count() == 2
+    assert db.query(models.Education).count() == len(MOCK_RESUME_DATA["education"])
+
+
+def test_child_rows_are_saved_in_a_fixed_number_of_round_trips(db: Session, statements):
+    """Saving a resume with 200 skills takes as many statements as saving one with a single skill"""
+    user = UserRepository.create_user(db, schemas.UserCreate(email="many_skills@example.com"))
+    ResumeRepository.save_parsed_resume(db, user.id, "first.pdf", with_skills(1))
+
+    round_trips = {}
+    for count in (1, 200):
+        statements.clear()
+        resume = ResumeRepository.save_parsed_resume(db, user.id, "resume.pdf", with_skills(count))
+        round_trips[count] = len(statements)
+
+    assert round_trips[200] == round_trips[1]
+    assert len(resume.skills) == 200
+
+
+def test_concurrent_saves_for_one_user_leave_one_resume(db: Session):
+    """Uploads racing for the same user all succeed and upsert a single resume row"""
+    user = UserRepository.create_user(db, schemas.UserCreate(email="racing@example.com"))
+    uploads = 8
+    pooled_engine = create_engine(
+        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, pool_size=uploads
+    )
+    PooledSession = sessionmaker(autocommit=False, autoflush=False, bind=pooled_engine)
+    start = threading.Barrier(uploads)
+
+    def save(n: int) -> int:
+        session = PooledSession()
+        try:
+            start.wait()
+            return ResumeRepository.save_parsed_resume(session, user.id, f"{n}.pdf", with_skills(n + 1)).id
+        finally:
+            session.close()
+
+    try:
+        with ThreadPoolExecutor(uploads) as pool:
+            ids = list(pool.map(save, range(uploads)))
+    finally:
+        pooled_engine.dispose()
+
+    assert len(set(ids)) == 1
+    resumes = db.query(models.Resume).filter(models.Resume.user_id == user.id).all()
+    assert len(resumes) == 1
+    # The child rows are those of whichever upload saved last
+    skills = db.query(models.Skill).filter(models.Skill.resume_id == resumes[0].id).count()
+    assert resumes[0].file_name == f"{skills - 1}.pdf"
+
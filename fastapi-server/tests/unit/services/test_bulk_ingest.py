@@ -0,0 +1,229 @@
+import io
+import asyncio
+import zipfile
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.datastructures import UploadFile
+
+import models
+import schemas
+from repository.user_repository import UserRepository
+from schemas.resume_schemas import ResumeResponse
+from services.bulk_ingest import BulkIngestor, EVENT_FILE, EVENT_SUMMARY
+from services.llm_scheduler import PRIORITY_BACKGROUND, current_priority
+from tests.conftest import engine
+
+
+def parsed(email):
+    return {
+        "personal_info": {"name": "John Doe", "email": email},
+        "education": [{"institution": "MIT", "degree": "BS"}],
+        "work_experience": [{"company": "Acme", "job_title": "Engineer"}],
+        "skills": [{"name": "Python"}]
+    }
+
+
+class FakeParser:
+    """Answers each resume text with a resume for the email address it holds, if any"""
+
+    parse_version = "v1"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.parsed = []
+        self.priorities = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def extract_text_from_upload(self, upload):
+        return upload.read_bytes().decode()
+
+    async def aparse_text(self, resume_text, db=None, mode=None):
+        self.priorities.append(current_priority())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        self.parsed.append(resume_text)
+        email = resume_text if "@" in resume_text else None
+        return ResumeResponse(status="success", message="Resume parsed", data=parsed(email), served_by="cheap")
+
+
+def upload(name: str, content: bytes) -> UploadFile:
+    return UploadFile(io.BytesIO(content), filename=name)
+
+
+def archive(entries) -> UploadFile:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in entries:
+            zf.writestr(name, content)
+    buffer.seek(0)
+    return upload("resumes.zip", buffer.getvalue())
+
+
+@pytest.fixture
+def counted_sessions(db: Session):
+    """Session factory on the test database that counts commits"""
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    commits = []
+    event.listen(factory, "after_commit", lambda session: commits.append(session))
+    return factory, commits
+
+
+async def ingest(ingestor: BulkIngestor, files):
+    return [event async for event in ingestor.run(files)]
+
+
+@pytest.mark.asyncio
+async def test_zip_and_loose_files_are_deduplicated_and_saved_in_batches(db: Session, counted_sessions):
+    factory, commits = counted_sessions
+    parser = FakeParser()
+    files = [
+        upload("a.txt", b"a@example.com"),
+        archive([
+            ("resumes/b.txt", b"b@example.com"),
+            ("resumes/copy-of-a.txt", b"a@example.com"),
+            ("resumes/c.txt", b"c@example.com"),
+            ("resumes/cover.docx", b"not a resume"),
+            ("__MACOSX/resumes/._b.txt", b"metadata"),
+        ]),
+        upload("d.txt", b"d@example.com"),
+    ]
+
+    events = await ingest(BulkIngestor(parser, factory, match_email=True, concurrency=2, commit_size=2,
+                                         commit_seconds=60), files)
+
+    assert events[-1] == (EVENT_SUMMARY, {**events[-1][1], "total": 6, "saved": 4, "duplicate": 1, "rejected": 1,
+                                          "failed": 0})
+    results = {data["file_name"]: data for name, data in events if name == EVENT_FILE}
+    assert results["resumes/copy-of-a.txt"]["duplicate_of"] == "a.txt"
+    assert results["resumes/cover.docx"]["status"] == "rejected"
+    assert sorted(parser.parsed) == ["a@example.com", "b@example.com", "c@example.com", "d@example.com"]
+    assert parser.priorities == [PRIORITY_BACKGROUND] * 4
+    # Four saved resumes, two to a commit
+    assert len(commits) == 2
+
+    emails = {user.email: user.id for user in db.query(models.User).all()}
+    assert set(emails) == {"a@example.com", "b@example.com", "c@example.com", "d@example.com"}
+    saved = {resume.file_name: resume.user_id for resume in db.query(models.Resume).all()}
+    assert saved["resumes/c.txt"] == emails["c@example.com"]
+    assert results["resumes/c.txt"]["user_id"] == emails["c@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_parses_run_at_most_concurrency_at_once(db: Session, counted_sessions):
+    factory, _ = counted_sessions
+    parser = FakeParser(delay=0.02)
+    files = [upload(f"{i}.txt", f"user{i}@example.com".encode()) for i in range(10)]
+
+    events = await ingest(BulkIngestor(parser, factory, match_email=True, concurrency=3), files)
+
+    assert events[-1][1]["saved"] == 10
+    assert parser.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_bad_archive_and_resume_without_email_are_reported(db: Session, counted_sessions):
+    factory, commits = counted_sessions
+    files = [upload("broken.zip", b"not a zip"), upload("anonymous.txt", b"No contact details")]
+
+    events = await ingest(BulkIngestor(FakeParser(), factory, match_email=True), files)
+
+    results = [data for name, data in events if name == EVENT_FILE]
+    assert [(r["file_name"], r["status"]) for r in results] == [("broken.zip", "rejected"), ("anonymous.txt", "failed")]
+    assert events[-1][1]["total"] == 2
+    assert commits == []
+
+
+@pytest.mark.asyncio
+async def test_files_over_the_batch_limit_are_rejected(db: Session, counted_sessions):
+    factory, _ = counted_sessions
+    files = [upload(f"{i}.txt", f"user{i}@example.com".encode()) for i in range(3)]
+
+    events = await ingest(BulkIngestor(FakeParser(), factory, match_email=True, max_files=2), files)
+
+    assert (events[-1][1]["saved"], events[-1][1]["rejected"]) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_batch_is_saved_for_the_caller_not_the_emails_in_it(db: Session, counted_sessions):
+    """Without match_email, addresses in the resumes don't pick, or create, the user"""
+    factory, _ = counted_sessions
+    owner = UserRepository.create_user(db, schemas.UserCreate(email="owner@example.com"))
+    other = UserRepository.create_user(db, schemas.UserCreate(email="other@example.com"))
+    files = [upload("mine.txt", b"other@example.com"), upload("second.txt", b"new@example.com")]
+
+    events = await ingest(BulkIngestor(FakeParser(), factory, user_id=owner.id), files)
+
+    results = {data["file_name"]: data for name, data in events if name == EVENT_FILE}
+    assert (results["mine.txt"]["status"], results["mine.txt"]["user_id"]) == ("saved", owner.id)
+    # One resume per user, so the second file would replace the first
+    assert results["second.txt"]["status"] == "rejected"
+    assert "mine.txt" in results["second.txt"]["error"]
+    assert [(resume.user_id, resume.file_name) for resume in db.query(models.Resume).all()] == [(owner.id, "mine.txt")]
+    assert db.query(models.User).count() == 2
+    assert UserRepository.get_user(db, other.id).resume is None
+
+
+@pytest.mark.asyncio
+async def test_user_map_assigns_files_to_users(db: Session, counted_sessions):
+    factory, _ = counted_sessions
+    first = UserRepository.create_user(db, schemas.UserCreate(email="first@example.com"))
+    second = UserRepository.create_user(db, schemas.UserCreate(email="second@example.com"))
+    parser = FakeParser()
+    files = [
+        archive([("batch/a.txt", b"Resume A"), ("batch/b.txt", b"Resume B")]),
+        upload("unmapped.txt", b"Resume C"),
+        upload("missing.txt", b"Resume D"),
+    ]
+    user_map = {"batch/a.txt": first.id, "b.txt": second.id, "missing.txt": 999}
+
+    events = await ingest(BulkIngestor(parser, factory, user_map=user_map), files)
+
+    results = {data["file_name"]: data for name, data in events if name == EVENT_FILE}
+    assert results["batch/a.txt"]["user_id"] == first.id
+    assert results["batch/b.txt"]["user_id"] == second.id
+    assert (results["unmapped.txt"]["status"], results["missing.txt"]["status"]) == ("rejected", "failed")
+    assert "User 999 not found" in results["missing.txt"]["error"]
+    # Files without a user aren't parsed at all
+    assert "Resume C" not in parser.parsed
+
+
+@pytest.mark.asyncio
+async def test_same_file_mapped_to_two_users_is_saved_for_both(db: Session, counted_sessions):
+    factory, _ = counted_sessions
+    first = UserRepository.create_user(db, schemas.UserCreate(email="first@example.com"))
+    second = UserRepository.create_user(db, schemas.UserCreate(email="second@example.com"))
+    files = [upload("a.txt", b"Shared resume"), upload("b.txt", b"Shared resume"), upload("c.txt", b"Shared resume")]
+    user_map = {"a.txt": first.id, "b.txt": second.id, "c.txt": first.id}
+
+    events = await ingest(BulkIngestor(FakeParser(), factory, user_map=user_map), files)
+
+    results = {data["file_name"]: data for name, data in events if name == EVENT_FILE}
+    assert (results["a.txt"]["status"], results["b.txt"]["status"]) == ("saved", "saved")
+    # Only a repeat for the same user is a duplicate
+    assert (results["c.txt"]["status"], results["c.txt"]["duplicate_of"]) == ("duplicate", "a.txt")
+    assert sorted(resume.user_id for resume in db.query(models.Resume).all()) == sorted([first.id, second.id])
+
+
+@pytest.mark.asyncio
+async def test_resumes_with_the_same_email_are_reported_not_overwritten(db: Session, counted_sessions):
+    factory, _ = counted_sessions
+    files = [upload("one.txt", b"dup@example.com"), upload("two.txt", b"DUP@example.com")]
+
+    events = await ingest(BulkIngestor(FakeParser(), factory, match_email=True), files)
+
+    assert (events[-1][1]["saved"], events[-1][1]["failed"]) == (1, 1)
+    failed = next(data for name, data in events if name == EVENT_FILE and data["status"] == "failed")
+    assert "same email address" in failed["error"]
+    assert db.query(models.Resume).count() == 1
+
+
+def test_batch_needs_exactly_one_way_to_pick_users():
+    with pytest.raises(ValueError):
+        BulkIngestor(FakeParser(), None)
+    with pytest.raises(ValueError):
+        BulkIngestor(FakeParser(), None, user_id=1, match_email=True)
+
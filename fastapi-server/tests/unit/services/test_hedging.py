@@ -0,0 +1,224 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from services.hedging import Hedger, LatencyTracker
+from services.model_tiers import TierStats
+from services.parse_cache import ParseCache
+from services.resume_parser import ResumeParser
+from services.single_flight import SingleFlight
+
+PARSED = {
+    "personal_info": {"name": "John Doe"},
+    "education": [{"institution": "MIT", "degree": "BS"}],
+    "work_experience": [{"company": "Acme", "job_title": "Engineer"}],
+    "skills": [{"name": "Python"}]
+}
+
+
+def warmed_hedger(delay: float, budget: int = 1, hedge_model: str = "") -> Hedger:
+    """Hedger whose latency percentile for the given key is already delay"""
+    hedger = Hedger(percentile=95, budget=budget, hedge_model=hedge_model, min_samples=1)
+    hedger.tracker("key").record(delay)
+    return hedger
+
+
+async def answer(value, after: float, started: list = None):
+    if started is not None:
+        started.append(value)
+    await asyncio.sleep(after)
+    return value
+
+
+def test_percentile_needs_enough_samples():
+    tracker = LatencyTracker(min_samples=5)
+    for seconds in (0.4, 0.1, 0.5, 0.2):
+        tracker.record(seconds)
+    assert tracker.percentile(95) is None
+    tracker.record(0.3)
+    assert tracker.percentile(50) == 0.3
+    assert tracker.percentile(95) == 0.5
+
+
+@pytest.mark.asyncio
+async def test_failed_and_timed_out_calls_are_timed_but_cancelled_ones_are_not():
+    tracker = LatencyTracker(min_samples=1)
+
+    async def fails():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("provider error")
+
+    with pytest.raises(RuntimeError):
+        await tracker.time(fails)
+    with pytest.raises(asyncio.TimeoutError):
+        await tracker.time(lambda: asyncio.wait_for(asyncio.sleep(1), 0.03))
+    cancelled = asyncio.ensure_future(tracker.time(lambda: asyncio.sleep(1)))
+    await asyncio.sleep(0.01)
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    assert len(tracker._samples) == 2
+    assert tracker.percentile(100) >= 0.03
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_and_backup_wins():
+    """A call past the percentile gets a backup; the faster backup wins and the original is cancelled"""
+    hedger = warmed_hedger(0.02)
+    primary = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            primary.set()
+            raise
+
+    result = await hedger.run("key", slow, lambda: answer("backup", 0.01), lambda: True)
+
+    assert result == "backup"
+    await asyncio.sleep(0.01)
+    assert primary.is_set()
+    assert hedger.stats()["hedges"] == {"fired": 1, "won": 1}
+
+
+@pytest.mark.asyncio
+async def test_fast_call_is_not_hedged():
+    hedger = warmed_hedger(0.5)
+    started = []
+    result = await hedger.run("key", lambda: answer("primary", 0.01, started), lambda: answer("backup", 0, started),
+                              lambda: True)
+    assert result == "primary"
+    assert started == ["primary"]
+    assert hedger.stats()["hedges"] == {}
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_once_budget_is_spent():
+    hedger = warmed_hedger(0.01)
+    started = []
+    result = await hedger.run("key", lambda: answer("primary", 0.05, started), lambda: answer("backup", 0, started),
+                              lambda: False)
+    assert result == "primary"
+    assert started == ["primary"]
+    assert hedger.stats()["hedges"] == {"over_budget": 1}
+
+
+@pytest.mark.asyncio
+async def test_failed_backup_falls_back_to_original():
+    hedger = warmed_hedger(0.01)
+
+    async def failing():
+        raise ConnectionError("backup failed")
+
+    result = await hedger.run("key", lambda: answer("primary", 0.05), failing, lambda: True)
+    assert result == "primary"
+    assert hedger.stats()["hedges"] == {"fired": 1, "lost": 1}
+
+
+class ModelLLM:
+    """Fake structured LLMs for one model, answering any schema after a fixed delay"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+
+    def for_schema(self, schema):
+        model = self
+
+        class StructuredLLM:
+            async def ainvoke(self, messages):
+                model.calls += 1
+                await asyncio.sleep(model.delay)
+                return schema.model_validate(PARSED)
+
+        return StructuredLLM()
+
+
+@pytest.mark.asyncio
+async def test_parser_hedges_to_the_configured_model_within_budget():
+    """Each slow section call may hedge to the backup model, but only budget of them do"""
+    llms = {"cheap": ModelLLM(0.2), "backup": ModelLLM(0.01)}
+    hedger = Hedger(percentile=95, budget=2, hedge_model="backup", min_samples=1)
+    for section in ("PersonalInfoSection", "EducationSection", "WorkExperienceSection", "SkillsSection"):
+        hedger.tracker(f"cheap:{section}").record(0.02)
+    parser = ResumeParser(
+        llm_factory=lambda model_name, schema: llms[model_name].for_schema(schema),
+        cache=ParseCache(),
+        model_chain=["cheap"],
+        stats=TierStats(),
+        preextract=False,
+        flights=SingleFlight(),
+        hedging=True,
+        hedger=hedger
+    )
+    parser._save_parsed_data = MagicMock(side_effect=lambda db, data, user_id, file_name, **details: details)
+
+    details = await parser.aparse_resume("John Doe resume", 1, "resume.txt", mode="sections")
+
+    assert details["served_by"] == "cheap"
+    assert llms["cheap"].calls == 4
+    assert llms["backup"].calls == 2
+    assert hedger.stats()["hedges"] == {"fired": 2, "won": 2, "over_budget": 2}
+
+
+class QueuedGuard:
+    """LLM guard whose calls wait in a queue before they reach the provider"""
+
+    def __init__(self, wait: float):
+        self.wait = wait
+
+    async def acall(self, work):
+        await asyncio.sleep(self.wait)
+        return await work()
+
+
+@pytest.mark.asyncio
+async def test_time_queued_for_a_slot_is_not_part_of_the_latency():
+    hedger = Hedger(percentile=95, budget=1, min_samples=1)
+    llm = ModelLLM(0.01)
+    parser = ResumeParser(
+        llm_factory=lambda model_name, schema: llm.for_schema(schema),
+        cache=ParseCache(),
+        model_chain=["cheap"],
+        stats=TierStats(),
+        preextract=False,
+        flights=SingleFlight(),
+        guard=QueuedGuard(0.2),
+        hedging=True,
+        hedger=hedger
+    )
+    parser._save_parsed_data = MagicMock(side_effect=lambda db, data, user_id, file_name, **details: details)
+
+    await parser.aparse_resume("John Doe resume", 1, "resume.txt")
+
+    assert hedger.tracker("cheap:ResumeData").percentile(95) < 0.1
+
+
+
+@pytest.mark.asyncio
+async def test_backups_to_a_fast_hedge_model_leave_the_primary_delay_alone():
+    """Winning backups finish quickly; counted as the primary's latency they would keep lowering its delay"""
+    llms = {"cheap": ModelLLM(0.2), "fast": ModelLLM(0.01)}
+    hedger = Hedger(percentile=50, budget=1, hedge_model="fast", min_samples=10)
+    for _ in range(10):
+        hedger.tracker("cheap:ResumeData").record(0.05)
+    parser = ResumeParser(
+        llm_factory=lambda model_name, schema: llms[model_name].for_schema(schema),
+        cache=ParseCache(),
+        model_chain=["cheap"],
+        stats=TierStats(),
+        preextract=False,
+        flights=SingleFlight(),
+        hedging=True,
+        hedger=hedger
+    )
+    parser._save_parsed_data = MagicMock(side_effect=lambda db, data, user_id, file_name, **details: details)
+
+    for i in range(12):
+        await parser.aparse_resume(f"John Doe resume {i}", 1, f"resume_{i}.txt")
+
+    assert hedger.stats()["hedges"] == {"fired": 12, "won": 12}
+    assert hedger.tracker("cheap:ResumeData").percentile(50) == 0.05
+    assert hedger.tracker("hedge:fast:ResumeData").percentile(50) < 0.05
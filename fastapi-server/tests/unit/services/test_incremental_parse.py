@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from services.resume_parser import SERVED_BY_PREVIOUS
+from tests.conftest import make_stand_in_parser
+from tests.unit.services.test_resume_sections import RESUME
+
+
+@pytest.mark.asyncio
+async def test_reupload_only_reparses_changed_sections(db: Session):
+    parser = make_stand_in_parser()
+    first = await parser.aparse_resume(RESUME, 1, "resume.txt", db)
+    assert set(first.timings) == {"resume"}
+
+    revised = await parser.aparse_resume(RESUME.replace("Python, Go", "Python, Go, Rust"), 1, "resume.txt", db)
+
+    assert revised.status == "success"
+    assert set(revised.timings) == {"skills"}
+    assert revised.tokens_saved > first.tokens_saved
+    assert [skill.name for skill in revised.data.skills] == ["Python", "Go", "Rust"]
+    assert revised.data.work_experience == first.data.work_experience
+    assert revised.data.personal_info.email == "jane@example.com"
+
+
+@pytest.mark.asyncio
+async def test_unchanged_reupload_missing_from_the_cache_reuses_the_previous_parse(db: Session):
+    parser = make_stand_in_parser()
+    first = await parser.aparse_resume(RESUME, 1, "resume.txt", db)
+    parser.cache.invalidate(db)
+
+    again = await parser.aparse_resume(RESUME, 1, "resume.txt", db)
+
+    assert (again.served_by, again.timings) == (SERVED_BY_PREVIOUS, {})
+    assert again.data == first.data
+
+
+@pytest.mark.asyncio
+async def test_other_users_and_unmapped_changes_get_a_full_parse(db: Session):
+    parser = make_stand_in_parser()
+    await parser.aparse_resume(RESUME, 1, "resume.txt", db)
+
+    other_user = await parser.aparse_resume(RESUME.replace("Python, Go", "Python"), 2, "resume.txt", db)
+    projects = await parser.aparse_resume(RESUME.replace("Resume parser", "Chat bot"), 1, "resume.txt", db)
+
+    assert set(other_user.timings) == set(projects.timings) == {"resume"}
+
+
+@pytest.mark.asyncio
+async def test_changed_section_longer_than_a_chunk_gets_a_full_parse(db: Session):
+    parser = make_stand_in_parser()
+    await parser.aparse_resume(RESUME, 1, "resume.txt", db)
+    parser.chunk_tokens = 50
+
+    long_skills = ", ".join(f"Skill {n}" for n in range(100))
+    revised = await parser.aparse_resume(RESUME.replace("Python, Go", long_skills), 1, "resume.txt", db)
+
+    assert revised.status == "success"
+    assert "skills" not in revised.timings
+    assert all(label.startswith("chunk_") for label in revised.timings)
+
+
+@pytest.mark.asyncio
+async def test_previous_parse_is_read_on_the_flights_own_session(db: Session):
+    """The caller's session may be closed under the shared parse if the caller is cancelled"""
+    parser = make_stand_in_parser()
+    sessions = []
+    previous_parse = parser._previous_parse
+    parser._previous_parse = lambda session, user_id: sessions.append(session) or previous_parse(session, user_id)
+
+    await parser.aparse_resume(RESUME, 1, "resume.txt", db)
+
+    assert sessions and sessions[0] is not db
+
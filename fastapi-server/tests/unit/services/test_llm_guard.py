@@ -0,0 +1,154 @@
+import asyncio
+import httpx
+import pytest
+from openai import APIConnectionError, RateLimitError
+
+from services.model_tiers import TierStats
+from services.parse_cache import ParseCache
+from services.resume_parser import ResumeParser
+from services.single_flight import SingleFlight
+from services.llm_guard import (
+    AdaptiveLimiter, CircuitBreaker, CircuitOpenError, LLMGuard,
+    BREAKER_CLOSED, BREAKER_OPEN, BREAKER_HALF_OPEN
+)
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def rate_limit_error() -> RateLimitError:
+    return RateLimitError("Rate limit reached", response=httpx.Response(429, request=REQUEST), body=None)
+
+
+def connection_error() -> APIConnectionError:
+    return APIConnectionError(request=REQUEST)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_calls_beyond_the_limit():
+    """Calls over the limit wait in order and a cancelled waiter doesn't take a slot"""
+    limiter = AdaptiveLimiter(initial=2, min_limit=1, max_limit=4)
+    await limiter.aacquire()
+    await limiter.aacquire()
+
+    waiters = [asyncio.create_task(limiter.aacquire()) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    assert limiter.stats()["queued"] == 3
+
+    waiters[0].cancel()
+    await asyncio.sleep(0.01)
+    limiter.release()
+    await asyncio.sleep(0.01)
+    assert waiters[1].done() and not waiters[2].done()
+    assert (limiter.stats()["in_flight"], limiter.stats()["queued"]) == (2, 1)
+
+    limiter.release()
+    await waiters[2]
+    assert limiter.stats()["queued"] == 0
+
+
+def test_limiter_is_aimd():
+    """Successes grow the limit slowly; overload halves it, at most once per backoff interval"""
+    limiter = AdaptiveLimiter(initial=8, min_limit=2, max_limit=9, backoff_interval=60)
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.limit == 9
+
+    limiter.on_overload()
+    limiter.on_overload()
+    assert limiter.limit == 4
+
+    limiter.backoff_interval = 0
+    for _ in range(5):
+        limiter.on_overload()
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_shrink_the_limit_without_opening_the_breaker():
+    guard = LLMGuard(limiter=AdaptiveLimiter(initial=8, backoff_interval=0), breaker=CircuitBreaker(threshold=1))
+
+    async def rate_limited():
+        raise rate_limit_error()
+
+    for _ in range(2):
+        with pytest.raises(RateLimitError):
+            await guard.acall(rate_limited)
+
+    stats = guard.stats()
+    assert stats["limit"] == 2
+    assert stats["breaker"] == BREAKER_CLOSED
+    assert stats["outcomes"] == {"rate_limited": 2}
+
+
+def test_breaker_opens_fails_fast_and_recovers():
+    """Repeated outages open the breaker; after the cool-down one trial call decides"""
+    clock = FakeClock()
+    guard = LLMGuard(breaker=CircuitBreaker(threshold=3, reset_seconds=30, clock=clock))
+    calls = []
+
+    def down():
+        calls.append(1)
+        raise connection_error()
+
+    for _ in range(3):
+        with pytest.raises(APIConnectionError):
+            guard.call(down)
+    assert guard.breaker.state == BREAKER_OPEN
+
+    with pytest.raises(CircuitOpenError):
+        guard.call(down)
+    assert len(calls) == 3
+
+    # A failed trial reopens it for another cool-down
+    clock.now = 31
+    assert guard.breaker.state == BREAKER_HALF_OPEN
+    with pytest.raises(APIConnectionError):
+        guard.call(down)
+    with pytest.raises(CircuitOpenError):
+        guard.call(lambda: "ok")
+
+    clock.now = 62
+    assert guard.call(lambda: "ok") == "ok"
+    assert guard.breaker.state == BREAKER_CLOSED
+    assert guard.stats()["outcomes"] == {"provider_error": 4, "rejected": 2, "success": 1}
+
+
+class UnreachableLLM:
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        raise connection_error()
+
+
+@pytest.mark.asyncio
+async def test_parser_fails_fast_while_breaker_is_open():
+    """An open breaker returns a clear error without calling the LLM or escalating"""
+    llm = UnreachableLLM()
+    guard = LLMGuard(breaker=CircuitBreaker(threshold=1))
+    parser = ResumeParser(
+        llm_factory=lambda model_name, schema: llm,
+        cache=ParseCache(),
+        model_chain=["cheap", "strong"],
+        stats=TierStats(),
+        preextract=False,
+        flights=SingleFlight(),
+        guard=guard
+    )
+
+    # The first call trips the breaker on the cheap tier, so the strong tier is never tried
+    first = await parser.aparse_resume("John Doe resume", 1, "resume.txt")
+    second = await parser.aparse_resume("Jane Doe resume", 2, "resume.txt")
+
+    assert llm.calls == 1
+    assert first.status == second.status == "error"
+    assert second.message == "Resume parsing is temporarily unavailable"
@@ -0,0 +1,127 @@
+import asyncio
+import httpx
+import openai
+import pytest
+
+from schemas.resume_schemas import ResumeData
+from services.llm_guard import CircuitBreaker, CircuitOpenError, BREAKER_OPEN
+from services.llm_providers import LLMBackend, ProviderRouter, RoutedLLM, parse_backend_list, parse_model_map
+
+PARSED = {
+    "personal_info": {"name": "John Doe"},
+    "education": [{"institution": "MIT", "degree": "BS"}],
+    "work_experience": [{"company": "Acme", "job_title": "Engineer"}],
+    "skills": [{"name": "Python"}]
+}
+
+
+class FakeLLM:
+    """Structured LLM for one backend that answers, or raises, after a fixed delay"""
+
+    def __init__(self, name: str, delay: float = 0.0, error: Exception = None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = []
+
+    def invoke(self, messages):
+        self.calls.append(messages)
+        if self.error:
+            raise self.error
+        return self.name
+
+    async def ainvoke(self, messages):
+        self.calls.append(messages)
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.name
+
+
+def outage() -> Exception:
+    return openai.APIConnectionError(request=httpx.Request("POST", "http://provider/v1/chat/completions"))
+
+
+def router_for(*llms: FakeLLM, breakers=None) -> ProviderRouter:
+    return ProviderRouter(
+        [LLMBackend(llm.name, lambda model_name, schema, llm=llm: llm) for llm in llms],
+        breakers=breakers
+    )
+
+
+def test_backend_list_and_model_map_parsing():
+    assert parse_backend_list(" Local, openai,local ") == ["local", "openai"]
+    with pytest.raises(ValueError):
+        parse_backend_list("openai,mystery")
+    assert parse_model_map("gpt-4o=claude-sonnet, broken ,a=") == {"gpt-4o": "claude-sonnet"}
+
+
+def test_single_backend_is_used_directly():
+    only = FakeLLM("only")
+    assert router_for(only).structured_llm("gpt-4o", ResumeData) is only
+
+
+def test_provider_error_fails_over_to_next_backend():
+    down, up = FakeLLM("down", error=outage()), FakeLLM("up")
+    router = router_for(down, up)
+
+    assert router.structured_llm("gpt-4o", ResumeData).invoke(["resume"]) == "up"
+    assert len(down.calls) == 1
+    stats = router.stats()
+    assert stats["down"]["provider_error"] == 1
+    assert stats["up"]["calls"] == 1
+
+
+def test_request_errors_do_not_fail_over():
+    broken, spare = FakeLLM("broken", error=ValueError("bad schema")), FakeLLM("spare")
+    router = router_for(broken, spare)
+
+    with pytest.raises(ValueError):
+        router.structured_llm("gpt-4o", ResumeData).invoke(["resume"])
+    assert spare.calls == []
+
+
+def test_open_breaker_is_skipped_and_all_open_fails_fast():
+    first, second = FakeLLM("first"), FakeLLM("second")
+    breakers = {"first": CircuitBreaker(threshold=1, reset_seconds=60)}
+    router = router_for(first, second, breakers=breakers)
+    breakers["first"].on_failure()
+
+    assert router.ranked("gpt-4o")[-1].name == "first"
+    assert router.structured_llm("gpt-4o", ResumeData).invoke(["resume"]) == "second"
+    assert first.calls == []
+
+    lonely = router_for(FakeLLM("lonely"), FakeLLM("spare"), breakers={
+        name: CircuitBreaker(threshold=1, reset_seconds=60) for name in ("lonely", "spare")
+    })
+    for health in lonely.health.values():
+        health.breaker.on_failure()
+        assert health.breaker.state == BREAKER_OPEN
+    with pytest.raises(CircuitOpenError):
+        lonely.structured_llm("gpt-4o", ResumeData).invoke(["resume"])
+
+
+@pytest.mark.asyncio
+async def test_calls_go_to_the_fastest_backend_once_measured():
+    slow, fast = FakeLLM("slow", delay=0.05), FakeLLM("fast", delay=0.001)
+    router = router_for(slow, fast)
+    llm = router.structured_llm("gpt-4o", ResumeData)
+    assert isinstance(llm, RoutedLLM)
+
+    # Unmeasured backends go first so each gets a latency
+    assert await llm.ainvoke(["one"]) == "slow"
+    assert await llm.ainvoke(["two"]) == "fast"
+    for _ in range(3):
+        assert await llm.ainvoke(["again"]) == "fast"
+    assert len(slow.calls) == 1
+    assert router.stats()["fast"]["latency"] < router.stats()["slow"]["latency"]
+
+
+def test_backend_without_the_model_is_not_ranked():
+    openai_llm, anthropic_llm = FakeLLM("openai"), FakeLLM("anthropic")
+    router = ProviderRouter([
+        LLMBackend("openai", lambda model_name, schema: openai_llm),
+        LLMBackend("anthropic", lambda model_name, schema: anthropic_llm, models={"gpt-4o": "claude-sonnet"})
+    ])
+    assert [b.name for b in router.ranked("gpt-3.5-turbo-0125")] == ["openai"]
+    assert [b.name for b in router.ranked("gpt-4o")] == ["openai", "anthropic"]
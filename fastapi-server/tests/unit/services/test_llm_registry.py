@@ -0,0 +1,69 @@
+import time
+import pytest
+
+from services.llm_registry import LLMClientRegistry
+from services.resume_parser import ResumeParser
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """A registry able to build real (offline) ChatOpenAI clients"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    return LLMClientRegistry()
+
+
+def test_parser_and_llms_are_built_once(registry):
+    """The parser and each model's structured LLM are shared process-wide"""
+    parser = registry.get_parser()
+    assert registry.get_parser() is parser
+    assert parser.db is None  # sessions are passed per call, not bound
+
+    llm = registry.get_structured_llm("gpt-4o-mini")
+    assert registry.get_structured_llm("gpt-4o-mini") is llm
+    assert registry.get_structured_llm("gpt-4o") is not llm
+
+
+def test_llms_share_one_connection_pool(registry):
+    """Every model's ChatOpenAI reuses the registry's keep-alive httpx clients"""
+    for model_name in ("gpt-4o-mini", "gpt-4o"):
+        # with_structured_output(include_raw=True) runs the bound chat model under the "raw" key
+        chat_model = registry.get_structured_llm(model_name).first.steps__["raw"].bound
+        assert chat_model.http_async_client is registry.http_async_client
+        assert chat_model.http_client is registry.http_client
+
+
+def test_per_request_setup_is_near_zero(registry):
+    """Getting the shared parser costs far less than building a fresh one"""
+    started = time.perf_counter()
+    ResumeParser()
+    fresh = time.perf_counter() - started
+
+    registry.get_parser()
+    started = time.perf_counter()
+    for _ in range(1000):
+        registry.get_parser()
+    shared = (time.perf_counter() - started) / 1000
+
+    assert shared < 0.001
+    assert shared < fresh / 100
+
+
+@pytest.mark.asyncio
+async def test_startup_and_shutdown(registry):
+    """Startup warms the parser; shutdown closes the pools and drops the clients"""
+    await registry.startup(warm_connections=False)
+    assert registry.warmup_seconds is not None
+    http_async_client = registry.http_async_client
+
+    await registry.shutdown()
+    assert http_async_client.is_closed
+    assert registry._parser is None
+
+
+def test_chunk_llm_is_shared(registry):
+    """The parser's chunk LLM is the registry's PartialResumeData client"""
+    from schemas.resume_schemas import PartialResumeData
+
+    parser = registry.get_parser()
+    assert parser.chunk_llm is registry.get_structured_llm(parser.model_name, PartialResumeData)
+    assert parser.chunk_llm is not parser.llm
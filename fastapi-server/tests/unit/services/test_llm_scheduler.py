@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+
+from services.llm_guard import AdaptiveLimiter, LLMGuard
+from services.llm_scheduler import (
+    PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND, QueueDeadlineExceeded, WeightedFairQueue,
+    current_priority, llm_priority
+)
+
+
+def drain(queue: WeightedFairQueue) -> str:
+    order = []
+    while queue:
+        order.append(queue.pop()())
+    return "".join(order)
+
+
+def test_interactive_jumps_a_background_backlog():
+    """Interactive work queued behind a backlog goes first, by weight, without starving the backlog"""
+    queue = WeightedFairQueue({PRIORITY_INTERACTIVE: 2, PRIORITY_BACKGROUND: 1})
+    for _ in range(4):
+        queue.push(PRIORITY_BACKGROUND, lambda: "b")
+    assert queue.pop()() == "b"
+
+    for _ in range(5):
+        queue.push(PRIORITY_INTERACTIVE, lambda: "i")
+    assert queue.depths() == {PRIORITY_INTERACTIVE: 5, PRIORITY_BACKGROUND: 3}
+    assert drain(queue) == "iiiibibb"
+
+
+def test_idle_priority_does_not_bank_credit():
+    """A priority that was idle while others ran restarts at the current virtual time"""
+    queue = WeightedFairQueue({PRIORITY_INTERACTIVE: 1, PRIORITY_BACKGROUND: 1})
+    for _ in range(3):
+        queue.push(PRIORITY_INTERACTIVE, lambda: "i")
+    assert drain(queue) == "iii"
+
+    for _ in range(3):
+        queue.push(PRIORITY_BACKGROUND, lambda: "b")
+        queue.push(PRIORITY_INTERACTIVE, lambda: "i")
+    # Background starts level with the work just done rather than three slots ahead
+    assert drain(queue) == "bibibi"
+
+
+def test_priority_context():
+    assert current_priority() == PRIORITY_INTERACTIVE
+    with llm_priority(PRIORITY_BACKGROUND):
+        assert current_priority() == PRIORITY_BACKGROUND
+    assert current_priority() == PRIORITY_INTERACTIVE
+    with pytest.raises(ValueError):
+        with llm_priority("urgent"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_queued_interactive_calls_run_before_background():
+    """With the limit reached, interactive calls queued later still get the next slots"""
+    limiter = AdaptiveLimiter(initial=2, min_limit=1, max_limit=2)
+    guard = LLMGuard(limiter=limiter)
+    release = asyncio.Event()
+    order = []
+
+    async def work(name):
+        order.append(name)
+        await release.wait()
+
+    async def call(name, priority):
+        with llm_priority(priority):
+            await guard.acall(lambda: work(name))
+
+    tasks = [asyncio.create_task(call(f"b{i}", PRIORITY_BACKGROUND)) for i in range(4)]
+    await asyncio.sleep(0.01)
+    tasks += [asyncio.create_task(call(f"i{i}", PRIORITY_INTERACTIVE)) for i in range(2)]
+    await asyncio.sleep(0.01)
+    assert limiter.stats()["queued_by_priority"] == {PRIORITY_INTERACTIVE: 2, PRIORITY_BACKGROUND: 2}
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == ["b0", "b1", "i0", "i1", "b2", "b3"]
+
+
+@pytest.mark.asyncio
+async def test_waiting_past_the_deadline_fails():
+    """A call that can't get a slot within its priority's deadline gives up and leaves the queue"""
+    limiter = AdaptiveLimiter(initial=1, min_limit=1, max_limit=1,
+                              deadlines={PRIORITY_INTERACTIVE: 5, PRIORITY_BACKGROUND: 0.05})
+    guard = LLMGuard(limiter=limiter)
+    await limiter.aacquire()
+
+    with llm_priority(PRIORITY_BACKGROUND):
+        with pytest.raises(QueueDeadlineExceeded):
+            await guard.acall(lambda: asyncio.sleep(0))
+        with pytest.raises(QueueDeadlineExceeded):
+            await asyncio.to_thread(guard.call, lambda: None)
+
+    stats = guard.stats()
+    assert stats["queued"] == 0
+    assert stats["deadline_exceeded"] == {PRIORITY_BACKGROUND: 2}
+    assert stats["outcomes"] == {"deadline_exceeded": 2}
@@ -0,0 +1,112 @@
+import pytest
+from unittest.mock import MagicMock
+
+from schemas.resume_schemas import ResumeData
+from services.model_tiers import TierStats, find_confidence_issues, parse_model_chain
+from services.parse_cache import ParseCache
+from services.resume_parser import ResumeParser
+
+PARSED_DATA = {
+    "personal_info": {"name": "John Doe", "email": "john@example.com"},
+    "education": [{"institution": "MIT", "degree": "BS"}],
+    "work_experience": [{"company": "Google", "job_title": "Engineer"}],
+    "skills": [{"name": "Python", "category": "Programming"}]
+}
+
+NAMELESS_DATA = {**PARSED_DATA, "personal_info": {"email": "john@example.com"}}
+
+
+class FakeTierLLM:
+    """Fake structured LLM that returns (or raises) a fixed outcome"""
+
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+    def invoke(self, messages):
+        self.calls += 1
+        if isinstance(self.outcome, dict):
+            return ResumeData.model_validate(self.outcome)
+        # Validation failures surface the same way they do from with_structured_output
+        return ResumeData.model_validate(self.outcome or {})
+
+
+def make_parser(outcomes):
+    """Parser over a fake model chain, one outcome per tier"""
+    llms = {name: FakeTierLLM(outcome) for name, outcome in outcomes.items()}
+    parser = ResumeParser(
+        llm_factory=lambda model_name, schema: llms[model_name],
+        cache=ParseCache(),
+        model_chain=list(outcomes),
+        stats=TierStats(),
+        preextract=False
+    )
+    parser._save_parsed_data = MagicMock(side_effect=lambda db, data, user_id, file_name, **details: details)
+    return parser, llms
+
+
+def test_parse_model_chain():
+    """Chains are comma-separated, trimmed and deduplicated"""
+    assert parse_model_chain(" cheap , strong,cheap,") == ["cheap", "strong"]
+    with pytest.raises(ValueError):
+        parse_model_chain(" , ")
+
+
+def test_confidence_issues():
+    """Valid but implausible results are flagged"""
+    assert find_confidence_issues(ResumeData.model_validate(PARSED_DATA)) == []
+    assert find_confidence_issues(ResumeData.model_validate(NAMELESS_DATA)) == ["missing name"]
+
+
+@pytest.mark.asyncio
+async def test_cheap_tier_serves_good_results():
+    """The strong model is never called when the cheap one succeeds"""
+    parser, llms = make_parser({"cheap": PARSED_DATA, "strong": PARSED_DATA})
+
+    details = await parser.aparse_resume("John Doe resume", 1, "resume.txt")
+
+    assert details["served_by"] == "cheap"
+    assert list(details["timings"]) == ["resume"]
+    assert llms["strong"].calls == 0
+    assert parser.tier_stats.stats()["served"] == {"cheap": 1}
+
+
+@pytest.mark.asyncio
+async def test_validation_failure_escalates():
+    """A schema validation error moves on to the next tier instead of repeating the call"""
+    parser, llms = make_parser({"cheap": None, "strong": PARSED_DATA})
+
+    details = await parser.aparse_resume("John Doe resume", 1, "resume.txt")
+
+    assert details["served_by"] == "strong"
+    assert set(details["timings"]) == {"resume", "strong:resume"}
+    assert llms["cheap"].calls == 1
+    stats = parser.tier_stats.stats()
+    assert stats["served"] == {"strong": 1}
+    assert stats["escalations"] == {"cheap:validation": 1}
+
+
+def test_low_confidence_escalates_sync():
+    """A result that passes validation but fails the checks escalates too"""
+    parser, llms = make_parser({"cheap": NAMELESS_DATA, "strong": PARSED_DATA})
+
+    details = parser.parse_resume("John Doe resume", 1, "resume.txt")
+
+    assert details["served_by"] == "strong"
+    assert parser.tier_stats.stats()["escalations"] == {"cheap:low_confidence": 1}
+
+
+@pytest.mark.asyncio
+async def test_last_tier_is_final():
+    """The last tier's low-confidence result is kept; its errors are reported"""
+    parser, _ = make_parser({"cheap": NAMELESS_DATA, "strong": NAMELESS_DATA})
+    details = await parser.aparse_resume("John Doe resume", 1, "resume.txt")
+    assert details["served_by"] == "strong"
+
+    parser, _ = make_parser({"cheap": None, "strong": None})
+    response = await parser.aparse_resume("Jane Doe resume", 1, "resume.txt")
+    assert response.status == "error"
+    assert parser.tier_stats.stats()["escalations"] == {"cheap:validation": 1}
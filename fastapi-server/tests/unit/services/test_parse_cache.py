@@ -0,0 +1,126 @@
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy.orm import Session
+
+import models
+from schemas.resume_schemas import ResumeData
+from services.parse_cache import ParseCache, compute_content_hash, normalize_resume_text
+from services.resume_parser import ResumeParser
+from tests.conftest import TestingSessionLocal
+
+PARSED_DATA = {
+    "personal_info": {"name": "John Doe", "email": "john@example.com"},
+    "education": [{"institution": "MIT", "degree": "BS"}],
+    "work_experience": [{"company": "Google", "job_title": "Engineer"}],
+    "skills": [{"name": "Python", "category": "Programming"}]
+}
+
+
+def test_content_hash_ignores_whitespace_differences():
+    """Cosmetic whitespace changes must not change the content hash"""
+    assert normalize_resume_text("  John   Doe\n\nEngineer ") == "John Doe Engineer"
+    assert compute_content_hash("John Doe\nEngineer") == compute_content_hash("John  Doe  Engineer  ")
+    assert compute_content_hash("John Doe") != compute_content_hash("Jane Doe")
+
+
+def test_cache_key_depends_on_prompt_and_model():
+    """Changing the prompt version or model must produce a different key"""
+    base = ParseCache.make_key("abc", "v1", "model-a")
+    assert base == ParseCache.make_key("abc", "v1", "model-a")
+    assert base != ParseCache.make_key("abc", "v2", "model-a")
+    assert base != ParseCache.make_key("abc", "v1", "model-b")
+
+
+def test_memory_tier_hits_and_misses():
+    """Lookups without a DB session only use the in-process LRU"""
+    cache = ParseCache(max_entries=2)
+    assert cache.get(None, "k1") is None
+
+    cache.put(None, "k1", "h1", "v1", "m", PARSED_DATA)
+    assert cache.get(None, "k1") == PARSED_DATA
+
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_memory_tier_evicts_least_recently_used():
+    """The LRU keeps at most max_entries and evicts the coldest key"""
+    cache = ParseCache(max_entries=2)
+    cache.put(None, "k1", "h1", "v1", "m", {"n": 1})
+    cache.put(None, "k2", "h2", "v1", "m", {"n": 2})
+    cache.get(None, "k1")  # k1 is now the most recently used
+    cache.put(None, "k3", "h3", "v1", "m", {"n": 3})
+
+    assert cache.get(None, "k2") is None
+    assert cache.get(None, "k1") == {"n": 1}
+    assert cache.get(None, "k3") == {"n": 3}
+
+
+def test_concurrent_durable_hits_are_all_counted(db: Session):
+    """Hits on sessions that loaded the entry before each other's commits still add up"""
+    ParseCache().put(db, "k1", "h1", "v1", "m", PARSED_DATA)
+    first, second = TestingSessionLocal(), TestingSessionLocal()
+    try:
+        # Both requests have read the entry before either hit is written, and still hold it
+        loaded = [session.query(models.ParseCacheEntry).all() for session in (first, second)]
+        assert ParseCache().get(first, "k1") == PARSED_DATA
+        assert ParseCache().get(second, "k1") == PARSED_DATA
+        first.commit()
+        second.commit()
+    finally:
+        first.close()
+        second.close()
+
+    db.expire_all()
+    entry = db.query(models.ParseCacheEntry).filter(models.ParseCacheEntry.cache_key == "k1").first()
+    assert entry.hit_count == 2
+
+
+def test_durable_tier_survives_new_process(db: Session):
+    """A fresh cache instance (e.g. after a restart) is served from the parse_cache table"""
+    ParseCache().put(db, "k1", "h1", "v1", "m", PARSED_DATA)
+
+    cache = ParseCache()
+    assert cache.get(db, "k1") == PARSED_DATA
+    assert cache.stats()["db_hits"] == 1
+
+    # The hit count is saved with the caller's commit
+    db.commit()
+    entry = db.query(models.ParseCacheEntry).filter(models.ParseCacheEntry.cache_key == "k1").first()
+    assert entry.hit_count == 1
+
+    # The durable hit is promoted to the memory tier
+    assert cache.get(db, "k1") == PARSED_DATA
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_invalidate_by_content_hash(db: Session):
+    """Invalidation removes matching entries from both tiers"""
+    cache = ParseCache()
+    cache.put(db, "k1", "h1", "v1", "m", {"n": 1})
+    cache.put(db, "k2", "h2", "v1", "m", {"n": 2})
+
+    assert cache.invalidate(db, content_hash="h1") == 1
+    assert cache.get(db, "k1") is None
+    assert cache.get(db, "k2") == {"n": 2}
+
+    assert cache.invalidate(db) == 1
+    assert cache.get(db, "k2") is None
+    assert db.query(models.ParseCacheEntry).count() == 0
+
+
+def test_parser_skips_llm_on_repeat_upload(db: Session):
+    """Parsing the same text twice makes a single LLM call"""
+    llm = MagicMock()
+    llm.invoke.return_value = ResumeData.model_validate(PARSED_DATA)
+    cache = ParseCache()
+    parser = ResumeParser(db, llm=llm, cache=cache)
+
+    first = parser.parse_resume("John Doe\nEngineer at Google", 1, "resume.txt")
+    second = parser.parse_resume("John Doe  Engineer at Google", 1, "resume.txt")
+
+    assert llm.invoke.call_count == 1
+    assert cache.stats()["hits"] == 1
+    assert first.data.personal_info.name == second.data.personal_info.name == "John Doe"
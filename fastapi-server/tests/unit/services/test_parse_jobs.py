@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from repository.parse_job_repository import ParseJobRepository, JOB_QUEUED, JOB_SUCCEEDED, JOB_FAILED
+from schemas.resume_schemas import ResumeResponse
+from services.llm_scheduler import PRIORITY_BACKGROUND, current_priority
+from services.parse_jobs import ParseWorker, retry_delay
+from tests.conftest import SQLALCHEMY_DATABASE_URL, TestingSessionLocal
+
+PARSED = {
+    "personal_info": {"name": "John Doe"},
+    "education": [{"institution": "MIT", "degree": "BS"}],
+    "work_experience": [{"company": "Acme", "job_title": "Engineer"}],
+    "skills": [{"name": "Python"}]
+}
+
+
+class FakeParser:
+    """Records each parse and fails the first fail_first of them"""
+
+    def __init__(self, fail_first: int = 0, delay: float = 0.0):
+        self.fail_first = fail_first
+        self.delay = delay
+        self.parsed = []
+        self.priorities = []
+
+    async def aparse_resume(self, resume_text, user_id, file_name, db=None, mode=None):
+        self.priorities.append(current_priority())
+        await asyncio.sleep(self.delay)
+        self.parsed.append(file_name)
+        if len(self.parsed) <= self.fail_first:
+            return ResumeResponse(status="error", message="Failed to parse resume", error="provider down")
+        return ResumeResponse(status="success", message="saved", data=PARSED, served_by="cheap")
+
+
+def worker(parser, **options) -> ParseWorker:
+    return ParseWorker(parser, session_factory=TestingSessionLocal, retry_base=0, **options)
+
+
+def test_retry_delay_backs_off_exponentially_up_to_the_cap():
+    assert [retry_delay(n, base=10, cap=60) for n in range(1, 6)] == [10, 20, 40, 60, 60]
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_job_at_background_priority(db: Session):
+    job = ParseJobRepository.enqueue(db, 1, "resume.txt", "John Doe resume")
+    parser = FakeParser()
+
+    assert await worker(parser).run_once()
+    assert not await worker(parser).run_once()
+
+    db.expire_all()
+    finished = ParseJobRepository.get_job(db, job.id)
+    assert finished.status == JOB_SUCCEEDED
+    assert finished.result["data"]["personal_info"]["name"] == "John Doe"
+    assert parser.priorities == [PRIORITY_BACKGROUND]
+
+
+@pytest.mark.asyncio
+async def test_failed_attempts_retry_then_fail(db: Session):
+    job = ParseJobRepository.enqueue(db, 1, "resume.txt", "John Doe resume", max_attempts=2)
+    parser = FakeParser(fail_first=5)
+    parse_worker = worker(parser)
+
+    assert await parse_worker.run_once()
+    db.expire_all()
+    retried = ParseJobRepository.get_job(db, job.id)
+    assert (retried.status, retried.attempts, retried.error) == (JOB_QUEUED, 1, "provider down")
+
+    assert await parse_worker.run_once()
+    db.expire_all()
+    failed = ParseJobRepository.get_job(db, job.id)
+    assert (failed.status, failed.attempts) == (JOB_FAILED, 2)
+    assert failed.result["status"] == "error"
+    assert not await parse_worker.run_once()
+
+
+@pytest.mark.asyncio
+async def test_workers_share_the_queue_without_running_a_job_twice(db: Session):
+    """Several workers, each on its own connection pool, drain the queue between them"""
+    jobs = [ParseJobRepository.enqueue(db, 1, f"resume{i}.txt", "John Doe resume").id for i in range(12)]
+    engines = [create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}) for _ in range(3)]
+    parser = FakeParser(delay=0.01)
+    stop = asyncio.Event()
+    workers = [
+        ParseWorker(parser, session_factory=sessionmaker(bind=engine), worker_id=f"worker-{i}", concurrency=2,
+                    poll_seconds=0.01)
+        for i, engine in enumerate(engines)
+    ]
+
+    running = asyncio.gather(*(w.run(stop) for w in workers))
+    while ParseJobRepository.count_by_status(db)[JOB_SUCCEEDED] < len(jobs):
+        await asyncio.sleep(0.02)
+        db.expire_all()
+    stop.set()
+    await running
+    for engine in engines:
+        engine.dispose()
+
+    assert sorted(parser.parsed) == sorted(f"resume{i}.txt" for i in range(12))
+    assert len({ParseJobRepository.get_job(db, job_id).worker_id for job_id in jobs}) > 1
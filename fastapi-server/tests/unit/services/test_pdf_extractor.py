@@ -0,0 +1,80 @@
+import time
+import asyncio
+import pytest
+import pytest_asyncio
+
+from services.pdf_extractor import PdfExtractionEngine, PdfExtractionTimeout, join_pages
+from tests.conftest import make_text_pdf
+
+
+@pytest_asyncio.fixture
+async def engine():
+    """A small extraction pool that splits documents every 2 pages"""
+    engine = PdfExtractionEngine(max_workers=2, pages_per_task=2, timeout=20)
+    await engine.start()
+    yield engine
+    engine.shutdown()
+
+
+def test_join_pages():
+    """Pages are joined with page breaks"""
+    assert join_pages(["one", "two", "three"]) == "one\ftwo\fthree"
+    assert join_pages([]) == ""
+
+
+@pytest.mark.asyncio
+async def test_extract_single_task_document(engine):
+    """A document shorter than pages_per_task is extracted in one task"""
+    result = await engine.extract(make_text_pdf(["Jane Doe", "Software Engineer"]))
+
+    assert result.text == "Jane Doe\fSoftware Engineer"
+    assert result.page_count == 2
+    assert [t.page_number for t in result.page_timings] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_extract_splits_pages_and_keeps_order(engine):
+    """Long documents are split across workers and joined back in page order"""
+    pages = [f"Page {i} content" for i in range(7)]
+    result = await engine.extract(make_text_pdf(pages))
+
+    assert engine._page_ranges(7) == [(0, 2), (2, 4), (4, 6), (6, 7)]
+    assert result.text == "\f".join(pages)
+    assert result.page_count == 7
+    assert len(result.page_timings) == 7
+    assert all(t.seconds >= 0 for t in result.page_timings)
+    assert result.page_timings[3].characters == len("Page 3 content")
+    assert len(result.slowest_pages(limit=3)) == 3
+    timings = result.timings(limit=3)
+    assert timings["pdf_extract"] == round(result.seconds, 4)
+    assert len([key for key in timings if key.startswith("pdf_page_")]) == 3
+
+
+@pytest.mark.asyncio
+async def test_extract_enforces_per_document_timeout(engine):
+    """A document that overruns its deadline raises instead of pinning a worker"""
+    with pytest.raises(PdfExtractionTimeout):
+        await engine.extract(make_text_pdf(["slow"] * 4), timeout=0)
+
+    # The pool is still usable afterwards
+    result = await engine.extract(make_text_pdf(["still alive"]))
+    assert result.text == "still alive"
+
+
+@pytest.mark.asyncio
+async def test_recycling_a_hung_pool_doesnt_fail_other_extractions(engine):
+    """Documents in flight when the pool is recycled are extracted again on the new pool"""
+    loop = asyncio.get_running_loop()
+    executor = engine._get_executor()
+    # Tie up every worker, as a document stuck past its deadline would
+    hung = [loop.run_in_executor(executor, time.sleep, 5) for _ in range(engine.max_workers)]
+    waiting = asyncio.ensure_future(engine.extract(make_text_pdf(["queued behind the hung one"])))
+    await asyncio.sleep(0.2)
+
+    engine._recycle(executor)
+
+    result = await waiting
+    assert result.text == "queued behind the hung one"
+    assert engine._executor is not executor
+    await asyncio.gather(*hung, return_exceptions=True)
+
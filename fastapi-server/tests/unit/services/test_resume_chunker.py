@@ -0,0 +1,111 @@
+import time
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from schemas.resume_schemas import PartialResumeData
+from services.parse_cache import ParseCache
+from services.resume_chunker import chunk_resume_text, estimate_tokens, merge_partial_results, split_sections
+from services.resume_parser import ResumeParser
+
+LONG_RESUME = "\f".join([
+    "John Doe\njohn@example.com\n\nSUMMARY\nSenior engineer.",
+    "EXPERIENCE\n" + "\n".join(f"Company {i} - Engineer - did things {'x' * 300}" for i in range(20)),
+    "EDUCATION\nMIT - BS Computer Science\n\nSKILLS\nPython, Go",
+])
+
+
+class SlowChunkLLM:
+    """Fake structured LLM answering each chunk after a fixed delay"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = []
+
+    async def ainvoke(self, messages):
+        chunk_text = messages[-1].content
+        self.calls.append(chunk_text)
+        await asyncio.sleep(self.delay)
+        partial = {}
+        if "John Doe" in chunk_text:
+            partial["personal_info"] = {"name": "John Doe", "email": "john@example.com"}
+        if "Company 0" in chunk_text or "Company 19" in chunk_text:
+            partial["work_experience"] = [{"company": "Company 0", "job_title": "Engineer"}]
+        if "MIT" in chunk_text:
+            partial["education"] = [{"institution": "MIT", "degree": "BS"}]
+            partial["skills"] = [{"name": "Python"}, {"name": "python"}, {"name": "Go"}]
+        return PartialResumeData.model_validate(partial)
+
+
+def test_split_sections_on_headers_and_pages():
+    """Blocks start at section headers and never span a page break"""
+    blocks = split_sections("Jane\nSKILLS\nPython\fEducation:\nMIT")
+    assert blocks == ["Jane", "SKILLS\nPython", "Education:\nMIT"]
+
+
+def test_chunks_respect_token_budget():
+    """Every chunk fits the budget and no text is dropped"""
+    chunks = chunk_resume_text(LONG_RESUME, max_tokens=500)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(c) <= 500 for c in chunks)
+    assert chunks[0].startswith("John Doe")
+    joined = "".join(chunks)
+    for i in range(20):
+        assert f"Company {i} " in joined
+    assert "MIT - BS Computer Science" in chunks[-1]
+
+
+def test_merge_is_deterministic_and_deduplicates():
+    """Duplicates across chunks collapse to the first entry, with gaps filled from later ones"""
+    partials = [
+        PartialResumeData(
+            personal_info={"name": "Jane Doe"},
+            work_experience=[{"company": "Acme", "job_title": "Engineer", "start_date": "2020-01-01", "description": "Built APIs."}],
+            skills=[{"name": "Python"}]
+        ),
+        PartialResumeData(
+            personal_info={"name": "J. Doe", "email": "jane@example.com"},
+            education=[{"institution": "MIT", "degree": "BS"}],
+            work_experience=[{"company": " acme ", "job_title": "engineer", "start_date": "2020-01-01", "end_date": "2023-06-30", "description": "Led team."}],
+            skills=[{"name": "python", "category": "Programming"}, {"name": "SQL"}]
+        ),
+    ]
+
+    merged = merge_partial_results(partials)
+
+    assert merged == merge_partial_results(partials)
+    assert merged["personal_info"]["name"] == "Jane Doe"
+    assert merged["personal_info"]["email"] == "jane@example.com"
+    assert len(merged["work_experience"]) == 1
+    assert merged["work_experience"][0]["end_date"] == "2023-06-30T00:00:00"
+    assert merged["work_experience"][0]["description"] == "Built APIs. Led team."
+    assert [s["name"] for s in merged["skills"]] == ["Python", "SQL"]
+    assert merged["skills"][0]["category"] == "Programming"
+    assert merged["education"] == [{"institution": "MIT", "degree": "BS", "field_of_study": None,
+                                    "start_date": None, "end_date": None, "description": None}]
+
+
+@pytest.mark.asyncio
+async def test_long_resume_is_parsed_in_concurrent_chunks():
+    """Chunks are parsed concurrently, so latency tracks one chunk rather than the document"""
+    chunk_llm = SlowChunkLLM(delay=0.3)
+    parser = ResumeParser(llm=MagicMock(), chunk_llm=chunk_llm, cache=ParseCache(), chunk_tokens=500)
+    parser._save_parsed_data = MagicMock(side_effect=lambda db, data, user_id, file_name, **details: data)
+
+    started = time.perf_counter()
+    parsed = await parser.aparse_resume(LONG_RESUME, 1, "resume.pdf")
+    elapsed = time.perf_counter() - started
+
+    assert len(chunk_llm.calls) > 2
+    assert elapsed < 0.3 * 2
+    parser.llm.ainvoke.assert_not_called()
+    assert parsed.personal_info.name == "John Doe"
+    assert [s.name for s in parsed.skills] == ["Python", "Go"]
+
+
+def test_chunk_count_is_capped():
+    """Very long resumes get bigger chunks instead of more calls"""
+    parser = ResumeParser(llm=MagicMock(), chunk_llm=MagicMock(), chunk_tokens=200, max_chunks=3)
+    assert len(parser._plan_chunks(LONG_RESUME)) <= 3
+    assert parser._plan_chunks("short resume") == ["short resume"]
@@ -1,227 +1,142 @@
 import pytest
-import os
-import tempfile
-import json
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
+
+import services.resume_parser as resume_parser_module
+from schemas.resume_schemas import ResumeData
+from services.parse_cache import ParseCache
+from services.pdf_extractor import PdfExtractionEngine
 from services.resume_parser import ResumeParser
+from services.single_flight import SingleFlight
+from services.upload_spooler import SpooledUpload
+from tests.conftest import make_stand_in_parser, make_text_pdf
+
+PARSED = {
+    "personal_info": {"name": "John Doe", "email": "john@example.com"},
+    "education": [{"institution": "MIT", "degree": "BS"}],
+    "work_experience": [{"company": "Google", "job_title": "Engineer"}],
+    "skills": [{"name": "Python", "category": "Programming"}]
+}
+
+
+def spooled(file_name: str, content: bytes) -> SpooledUpload:
+    upload = SpooledUpload(file_name)
+    upload.write(content)
+    upload.finish()
+    return upload
+
+
+def saving_to_mock(parser: ResumeParser) -> ResumeParser:
+    """Parser whose saves return the response details instead of touching a database"""
+    parser._save_parsed_data = MagicMock(
+        side_effect=lambda db, data, user_id, file_name, **details: resume_parser_module.ResumeResponse(
+            status="success", message="Resume parsed successfully", data=data.model_dump(),
+            timings=details.get("timings"), served_by=details.get("served_by")
+        )
+    )
+    return parser
+
+
+class FailingLLM:
+    def invoke(self, messages):
+        raise ValueError("API error")
+
+    async def ainvoke(self, messages):
+        raise ValueError("API error")
 
 
 class TestResumeParser:
     """Test suite for the ResumeParser service"""
 
-    @patch('services.resume_parser.openai.OpenAI')
-    def test_init(self, mock_openai):
-        """Test ResumeParser initialization"""
-        # Setup mock
-        mock_openai.return_value = MagicMock()
-        
-        # Call the constructor
-        parser = ResumeParser()
-        
-        # Verify OpenAI was initialized with the correct parameters
-        mock_openai.assert_called_once()
-
-    @patch('services.resume_parser.PdfReader')
-    def test_extract_text_from_pdf(self, mock_pdf_reader):
-        """Test extracting text from PDF"""
-        # Setup mock
-        mock_page1 = MagicMock()
-        mock_page1.extract_text.return_value = "Page 1 content"
-        mock_page2 = MagicMock()
-        mock_page2.extract_text.return_value = "Page 2 content"
-        
-        mock_reader_instance = MagicMock()
-        mock_reader_instance.pages = [mock_page1, mock_page2]
-        mock_pdf_reader.return_value = mock_reader_instance
-        
-        # Call the method with a mock client
-        mock_client = MagicMock()
-        parser = ResumeParser(mock_client=mock_client)
-        text = parser._extract_text_from_pdf("dummy.pdf")
-        
-        # Verify PDF reader was used correctly
-        mock_pdf_reader.assert_called_once_with("dummy.pdf")
-        
-        # Verify text was extracted correctly
-        assert text == "Page 1 content Page 2 content "
-
-    @patch('builtins.open', new_callable=MagicMock)
-    def test_extract_text_from_txt(self, mock_open):
-        """Test extracting text from TXT"""
-        # Setup mock
-        mock_file = MagicMock()
-        mock_file.__enter__.return_value.read.return_value = "Text file content"
-        mock_open.return_value = mock_file
-        
-        # Call the method with a mock client
-        mock_client = MagicMock()
-        parser = ResumeParser(mock_client=mock_client)
-        text = parser._extract_text_from_txt("dummy.txt")
-        
-        # Verify file was opened correctly
-        mock_open.assert_called_once_with("dummy.txt", 'r', encoding='utf-8')
-        
-        # Verify text was extracted correctly
+    def test_init(self):
+        """LLMs come from the factory, one per model and output schema, and the parse version tracks the prompt"""
+        factory = MagicMock()
+        parser = ResumeParser(llm_factory=factory, model_chain=["cheap", "strong"], cache=ParseCache())
+
+        factory.assert_called_once_with("cheap", ResumeData)
+        assert parser.structured_llm(ResumeData) is parser.llm
+        assert parser.cache_model_name == "cheap>strong"
+        assert parser.parse_version.startswith(parser.prompt_version)
+
+    @pytest.mark.asyncio
+    async def test_extract_text_from_pdf(self, monkeypatch):
+        """PDF text is extracted in the extraction pool, one page per form feed"""
+        engine = PdfExtractionEngine(max_workers=1)
+        monkeypatch.setattr(resume_parser_module, "pdf_extraction_engine", engine)
+        try:
+            text = await make_stand_in_parser().extract_text_from_upload(
+                spooled("resume.pdf", make_text_pdf(["Page 1 content", "Page 2 content"]))
+            )
+        finally:
+            engine.shutdown()
+
+        assert text == "Page 1 content\fPage 2 content"
+
+    @pytest.mark.asyncio
+    async def test_extract_text_from_txt(self):
+        text = await make_stand_in_parser().extract_text_from_upload(spooled("resume.txt", "Text file content".encode()))
+
         assert text == "Text file content"
 
-    def test_extract_text(self):
-        """Test the extract_text method which delegates based on file extension"""
-        mock_client = MagicMock()
-        parser = ResumeParser(mock_client=mock_client)
-        
-        # Mock the individual extraction methods
-        parser._extract_text_from_pdf = MagicMock(return_value="PDF content")
-        parser._extract_text_from_txt = MagicMock(return_value="TXT content")
-        
-        # Test PDF extraction
-        pdf_text = parser.extract_text("test.pdf", ".pdf")
-        assert pdf_text == "PDF content"
-        parser._extract_text_from_pdf.assert_called_once_with("test.pdf")
-        
-        # Test TXT extraction
-        txt_text = parser.extract_text("test.txt", ".txt")
-        assert txt_text == "TXT content"
-        parser._extract_text_from_txt.assert_called_once_with("test.txt")
-        
-        # Test unsupported format
-        unsupported_text = parser.extract_text("test.jpg", ".jpg")
-        assert unsupported_text == ""
+    @pytest.mark.asyncio
+    async def test_extract_text_rejects_unsupported_types(self):
+        with pytest.raises(Exception, match="Unsupported file type"):
+            await make_stand_in_parser().extract_text_from_upload(spooled("resume.jpg", b"image"))
 
     def test_parse_resume(self):
-        """Test resume parsing with OpenAI"""
-        # Setup mock client and completion response
-        mock_client = MagicMock()
-        mock_message = MagicMock()
-        mock_message.content = json.dumps({
-            "personal_info": {
-                "name": "John Doe",
-                "email": "john@example.com"
-            },
-            "education": [
-                {
-                    "institution": "MIT",
-                    "degree": "BS"
-                }
-            ],
-            "work_experience": [
-                {
-                    "company": "Google",
-                    "job_title": "Engineer"
-                }
-            ],
-            "skills": [
-                {
-                    "name": "Python",
-                    "category": "Programming"
-                }
-            ]
-        })
-        
-        mock_choice = MagicMock()
-        mock_choice.message = mock_message
-        
-        mock_response = MagicMock()
-        mock_response.choices = [mock_choice]
-        
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        # Create parser with mock client
-        parser = ResumeParser(mock_client=mock_client)
-        
-        # Call the method
-        result = parser.parse_resume("Sample resume text")
-        
-        # Verify OpenAI API was called correctly
-        mock_client.chat.completions.create.assert_called_once()
-        call_args = mock_client.chat.completions.create.call_args[1]
-        assert call_args["model"] == "gpt-4"
-        assert call_args["temperature"] == 0
-        assert len(call_args["messages"]) == 2
-        assert call_args["messages"][1]["content"] == "Sample resume text"
-        assert call_args["response_format"] == {"type": "json_object"}
-        
-        # Verify parsed data
-        assert "personal_info" in result
-        assert result["personal_info"]["name"] == "John Doe"
-        assert len(result["education"]) == 1
-        assert result["education"][0]["institution"] == "MIT"
-        assert len(result["work_experience"]) == 1
-        assert result["work_experience"][0]["company"] == "Google"
-        assert len(result["skills"]) == 1
-        assert result["skills"][0]["name"] == "Python"
+        """The sync path parses with the LLM and saves the result"""
+        parser = saving_to_mock(make_stand_in_parser(canned=PARSED))
+
+        result = parser.parse_resume("John Doe\nSoftware engineer", 1, "resume.txt")
+
+        assert result.status == "success"
+        assert result.data.personal_info.name == "John Doe"
+        assert [edu.institution for edu in result.data.education] == ["MIT"]
+        assert [skill.name for skill in result.data.skills] == ["Python"]
+        parser._save_parsed_data.assert_called_once()
 
     def test_parse_resume_error_handling(self):
-        """Test error handling in parse_resume"""
-        # Setup mock to raise an exception
-        mock_client = MagicMock()
-        mock_client.chat.completions.create.side_effect = Exception("API error")
-        
-        parser = ResumeParser(mock_client=mock_client)
-        
-        # Call the method
-        result = parser.parse_resume("Sample resume text")
-        
-        # Verify error handling
-        assert "personal_info" in result
-        assert "education" in result
-        assert "work_experience" in result
-        assert "skills" in result
-        
-        # All should be empty defaults
-        assert result["personal_info"] == {}
-        assert result["education"] == []
-        assert result["work_experience"] == []
-        assert result["skills"] == []
-
-    @patch.object(ResumeParser, 'extract_text')
-    @patch.object(ResumeParser, 'parse_resume')
-    async def test_parse_uploaded_resume(self, mock_parse_resume, mock_extract_text):
-        """Test parsing an uploaded resume file"""
-        # Setup mocks
-        mock_extract_text.return_value = "Sample resume text"
-        mock_parse_resume.return_value = {
-            "personal_info": {"name": "John Doe"},
-            "education": [],
-            "work_experience": [],
-            "skills": []
-        }
-        
-        # Create a mock file
-        mock_file = MagicMock()
-        mock_file.filename = "resume.pdf"
-        mock_file.read = MagicMock(return_value=b"PDF content")
-        
-        # Call the method with a mock client
-        mock_client = MagicMock()
-        parser = ResumeParser(mock_client=mock_client)
-        result = await parser.parse_uploaded_resume(mock_file)
-        
-        # Verify the file was processed correctly
-        mock_file.read.assert_called_once()
-        assert mock_extract_text.called
-        mock_parse_resume.assert_called_once_with("Sample resume text")
-        
-        # Verify result
-        assert result["personal_info"]["name"] == "John Doe"
-
-    @patch.object(ResumeParser, 'extract_text')
-    async def test_parse_uploaded_resume_empty_text(self, mock_extract_text):
-        """Test parsing with no extracted text"""
-        # Setup mock to return empty text
-        mock_extract_text.return_value = ""
-        
-        # Create a mock file
-        mock_file = MagicMock()
-        mock_file.filename = "resume.pdf"
-        mock_file.read = MagicMock(return_value=b"PDF content")
-        
-        # Call the method with a mock client
-        mock_client = MagicMock()
-        parser = ResumeParser(mock_client=mock_client)
-        result = await parser.parse_uploaded_resume(mock_file)
-        
-        # Verify result has default empty structure
-        assert result["personal_info"] == {}
-        assert result["education"] == []
-        assert result["work_experience"] == []
-        assert result["skills"] == [] 
\ No newline at end of file
+        """An LLM failure becomes an error response instead of an exception, and nothing is saved"""
+        parser = saving_to_mock(ResumeParser(
+            llm_factory=lambda model_name, schema: FailingLLM(), model_chain=["cheap"], cache=ParseCache(),
+            flights=SingleFlight()
+        ))
+
+        result = parser.parse_resume("Sample resume text", 1, "resume.txt")
+
+        assert (result.status, result.data) == ("error", None)
+        assert "API error" in result.error
+        parser._save_parsed_data.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_parse_spooled_upload(self):
+        parser = saving_to_mock(make_stand_in_parser(canned=PARSED))
+
+        result = await parser.parse_spooled_upload(spooled("resume.txt", b"John Doe\nSoftware engineer"), 1)
+
+        assert result.status == "success"
+        assert result.data.personal_info.name == "John Doe"
+
+    @pytest.mark.asyncio
+    async def test_parse_spooled_pdf_reports_extraction_timings(self, monkeypatch):
+        """PDF extraction time and the slowest pages go into the response timings next to the LLM calls"""
+        engine = PdfExtractionEngine(max_workers=1)
+        monkeypatch.setattr(resume_parser_module, "pdf_extraction_engine", engine)
+        parser = saving_to_mock(make_stand_in_parser(canned=PARSED))
+        try:
+            result = await parser.parse_spooled_upload(spooled("resume.pdf", make_text_pdf(["John Doe", "Engineer"])), 1)
+        finally:
+            engine.shutdown()
+
+        assert result.status == "success"
+        assert {"pdf_extract", "pdf_page_1", "pdf_page_2", "resume"} <= set(result.timings)
+
+    @pytest.mark.asyncio
+    async def test_parse_spooled_upload_empty_text(self):
+        """A file with no text is reported without calling the LLM"""
+        parser = saving_to_mock(make_stand_in_parser(canned=PARSED))
+
+        result = await parser.parse_spooled_upload(spooled("resume.txt", b""), 1)
+
+        assert (result.status, result.data) == ("error", None)
+        assert "Could not extract text" in result.error
+        parser._save_parsed_data.assert_not_called()
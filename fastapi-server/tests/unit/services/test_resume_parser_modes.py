@@ -0,0 +1,98 @@
+import time
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from schemas.resume_schemas import ResumeData
+from services.parse_cache import ParseCache
+from services.resume_parser import ResumeParser, SECTION_SCHEMAS
+
+PARSED_DATA = {
+    "personal_info": {"name": "John Doe", "email": "john@example.com"},
+    "education": [{"institution": "MIT", "degree": "BS"}],
+    "work_experience": [{"company": "Google", "job_title": "Engineer"}],
+    "skills": [{"name": "Python", "category": "Programming"}]
+}
+
+
+class SlowSchemaLLM:
+    """Fake structured LLM returning its schema's slice of PARSED_DATA after a delay"""
+
+    def __init__(self, schema, delay: float):
+        self.schema = schema
+        self.delay = delay
+        self.calls = 0
+
+    def _result(self):
+        self.calls += 1
+        return self.schema.model_validate({k: v for k, v in PARSED_DATA.items() if k in self.schema.model_fields})
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(self.delay)
+        return self._result()
+
+    def invoke(self, messages):
+        time.sleep(self.delay)
+        return self._result()
+
+
+@pytest.fixture
+def parser():
+    """A parser whose structured LLMs are all slow fakes, built per schema"""
+    llms = {}
+
+    def factory(model_name, schema):
+        llms[schema] = SlowSchemaLLM(schema, delay=0.2)
+        return llms[schema]
+
+    parser = ResumeParser(llm_factory=factory, cache=ParseCache())
+    parser._save_parsed_data = MagicMock(
+        side_effect=lambda db, data, user_id, file_name, **details: (data, details.get("timings"))
+    )
+    parser.fake_llms = llms
+    return parser
+
+
+@pytest.mark.asyncio
+async def test_sections_mode_fans_out_concurrently(parser):
+    """Each section gets its own call, run concurrently and timed separately"""
+    started = time.perf_counter()
+    parsed, timings = await parser.aparse_resume("John Doe resume", 1, "resume.txt", mode="sections")
+    elapsed = time.perf_counter() - started
+
+    assert parsed == ResumeData.model_validate(PARSED_DATA)
+    assert set(timings) == set(SECTION_SCHEMAS)
+    assert all(t >= 0.2 for t in timings.values())
+    assert elapsed < 0.2 * 2
+    assert parser.fake_llms[ResumeData].calls == 0
+    assert all(parser.fake_llms[schema].calls == 1 for schema in SECTION_SCHEMAS.values())
+
+
+@pytest.mark.asyncio
+async def test_single_mode_is_the_default(parser):
+    """Without a mode the whole schema is extracted in one call"""
+    parsed, timings = await parser.aparse_resume("Jane Doe resume", 1, "resume.txt")
+
+    assert parsed == ResumeData.model_validate(PARSED_DATA)
+    assert list(timings) == ["resume"]
+    assert parser.fake_llms[ResumeData].calls == 1
+
+
+def test_sync_sections_mode(parser):
+    """The blocking path fans out through a thread pool"""
+    started = time.perf_counter()
+    parsed, timings = parser.parse_resume("Jim Doe resume", 1, "resume.txt", mode="sections")
+
+    assert parsed == ResumeData.model_validate(PARSED_DATA)
+    assert set(timings) == set(SECTION_SCHEMAS)
+    assert time.perf_counter() - started < 0.2 * 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_mode_is_an_error(parser):
+    """An unsupported mode fails without calling the LLM"""
+    response = await parser.aparse_resume("Jill Doe resume", 1, "resume.txt", mode="fastest")
+
+    assert response.status == "error"
+    assert "Unknown extraction mode" in response.error
+    assert parser.fake_llms[ResumeData].calls == 0
@@ -0,0 +1,106 @@
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from schemas.resume_schemas import ResumeData
+from services.parse_cache import ParseCache
+from services.resume_parser import ResumeParser
+from services.resume_preextractor import pre_extract
+
+RESUME = """Curriculum Vitae
+JOHN DOE
+San Francisco, CA | john.doe@example.com | +1 (415) 555-0123
+linkedin.com/in/johndoe • https://johndoe.dev
+
+SUMMARY
+Engineer with ASP.NET and Node.js experience.
+
+EXPERIENCE
+Acme Corp    2017-2021
+Built github.com/acme/tool and called 415-555-0199 support lines.
+
+Page 1 of 2
+\fEDUCATION
+MIT 2013 - 2017
+
+References available upon request"""
+
+
+def test_contact_details_are_extracted_from_the_header():
+    """Emails, phones and links in the header fill personal info"""
+    result = pre_extract(RESUME)
+
+    assert result.personal_info == {
+        "email": "john.doe@example.com",
+        "phone": "+1 (415) 555-0123",
+        "linkedin": "linkedin.com/in/johndoe",
+        "website": "https://johndoe.dev"
+    }
+
+
+def test_contact_lines_and_boilerplate_are_stripped():
+    """The model gets the name, location and body, without contact lines or stock phrases"""
+    result = pre_extract(RESUME)
+
+    assert result.text.startswith("JOHN DOE\nSan Francisco, CA\n\nSUMMARY")
+    assert "john.doe@example.com" not in result.text
+    assert "linkedin" not in result.text
+    assert "Curriculum Vitae" not in result.text
+    assert "Page 1 of 2" not in result.text
+    assert "References available" not in result.text
+    # Body text, including links and numbers, is left alone
+    assert "Built github.com/acme/tool and called 415-555-0199 support lines." in result.text
+    assert "Acme Corp 2017-2021" in result.text
+    assert result.sections == ["summary", "experience", "education"]
+    assert result.tokens_saved > 0
+    assert result.tokens_saved == result.original_tokens - result.tokens
+
+
+def test_dates_are_not_phone_numbers():
+    """Year ranges in the header are not taken for phone numbers"""
+    result = pre_extract("Jane Roe\nMIT 2013-2017 | 2019.01-2020.05\n\nSKILLS\nPython")
+    assert "phone" not in result.personal_info
+    assert "MIT 2013-2017" in result.text
+
+
+def test_pre_extraction_is_sub_millisecond():
+    """A typical resume is processed in well under a millisecond"""
+    typical = RESUME + "\n" + "\n".join(f"- Delivered project {i} on time and under budget" for i in range(60))
+    pre_extract(typical)
+
+    runs = []
+    for _ in range(50):
+        started = time.perf_counter()
+        pre_extract(typical)
+        runs.append(time.perf_counter() - started)
+
+    assert sorted(runs)[len(runs) // 2] < 0.001
+
+
+@pytest.mark.asyncio
+async def test_parser_sends_stripped_text_and_fills_contacts():
+    """The LLM sees the trimmed text and the regex results override its contact fields"""
+    llm = MagicMock()
+
+    async def ainvoke(messages):
+        llm.prompt = messages[-1].content
+        return ResumeData.model_validate({
+            "personal_info": {"name": "John Doe", "email": None},
+            "education": [{"institution": "MIT"}],
+            "work_experience": [{"company": "Acme Corp"}],
+            "skills": [{"name": "Python"}]
+        })
+
+    llm.ainvoke = ainvoke
+    parser = ResumeParser(llm=llm, cache=ParseCache())
+    parser._save_parsed_data = MagicMock(
+        side_effect=lambda db, data, user_id, file_name, **details: (data, details.get("tokens_saved"))
+    )
+
+    parsed, tokens_saved = await parser.aparse_resume(RESUME, 1, "resume.txt")
+
+    assert "john.doe@example.com" not in llm.prompt
+    assert parsed.personal_info.name == "John Doe"
+    assert parsed.personal_info.email == "john.doe@example.com"
+    assert parsed.personal_info.phone == "+1 (415) 555-0123"
+    assert tokens_saved > 0
@@ -0,0 +1,113 @@
+import pytest
+from sqlalchemy.orm import Session
+
+import models
+from repository.resume_repository import ResumeRepository
+from repository.reparse_checkpoint_repository import ReparseCheckpointRepository
+from schemas.resume_schemas import ResumeData, ResumeResponse
+from services.llm_scheduler import PRIORITY_BACKGROUND, current_priority
+from services.resume_reparse import ResumeReparser, diff_parsed_data
+from tests.conftest import TestingSessionLocal
+
+
+def parsed(skill: str):
+    return ResumeData.model_validate({
+        "personal_info": {"name": "John Doe", "email": "john@example.com"},
+        "education": [{"institution": "MIT", "degree": "BS"}],
+        "work_experience": [{"company": "Acme", "job_title": "Engineer"}],
+        "skills": [{"name": skill, "category": "Languages"}]
+    }).model_dump(mode="json")
+
+
+class FakeParser:
+    """Parses a resume text to a resume whose one skill is the text, failing on the texts in fail_on"""
+    parse_version = "v2"
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.parsed = []
+        self.priorities = []
+
+    async def aparse_text(self, resume_text, db=None, mode=None):
+        self.priorities.append(current_priority())
+        if resume_text in self.fail_on:
+            raise RuntimeError("worker crashed")
+        self.parsed.append(resume_text)
+        return ResumeResponse(status="success", message="Resume parsed", data=parsed(resume_text))
+
+
+def store(db: Session, user_id: int, text: str, skill: str, parse_version="v1") -> models.Resume:
+    return ResumeRepository.save_parsed_resume(db, user_id, f"{text}.txt", parsed(skill), resume_text=text,
+                                               parse_version=parse_version)
+
+
+def reparser(parser, **options) -> ResumeReparser:
+    return ResumeReparser(parser, session_factory=TestingSessionLocal, page_size=2, **options)
+
+
+def test_diff_lists_changed_fields_and_entries():
+    old, new = parsed("Python"), parsed("Go")
+    new["personal_info"]["name"] = "Jon Doe"
+
+    assert diff_parsed_data(old, new) == {
+        "personal_info": {"name": ["John Doe", "Jon Doe"]},
+        "skills": {"added": [{"name": "Go", "category": "Languages"}],
+                   "removed": [{"name": "Python", "category": "Languages"}]}
+    }
+    assert diff_parsed_data(old, parsed("Python")) == {}
+
+
+@pytest.mark.asyncio
+async def test_only_stale_parses_are_reparsed(db: Session):
+    stale = store(db, 1, "Go", "Python")
+    same = store(db, 2, "Rust", "Rust")
+    store(db, 3, "Java", "Java", parse_version="v2")
+    ResumeRepository.save_parsed_resume(db, 4, "edited.txt", parsed("Edited"))
+    parser = FakeParser()
+
+    summary = await reparser(parser).run()
+
+    assert sorted(parser.parsed) == ["Go", "Rust"]
+    assert parser.priorities == [PRIORITY_BACKGROUND] * 2
+    assert (summary["updated"], summary["unchanged"]) == (1, 1)
+    db.expire_all()
+    assert db.get(models.Resume, stale.id).parsed_data["skills"] == [{"name": "Go", "category": "Languages"}]
+    assert [r.parse_version for r in (db.get(models.Resume, stale.id), db.get(models.Resume, same.id))] == ["v2", "v2"]
+    assert ReparseCheckpointRepository.get_checkpoint(db, "default").finished_at is not None
+    # Nothing is left to do
+    assert (await reparser(FakeParser()).run())["updated"] == 0
+
+
+@pytest.mark.asyncio
+async def test_crashed_run_resumes_after_the_last_saved_page(db: Session):
+    resumes = [store(db, n, f"Skill{n}", "Old") for n in range(1, 6)]
+
+    with pytest.raises(RuntimeError):
+        await reparser(FakeParser(fail_on={"Skill3"})).run()
+    checkpoint = ReparseCheckpointRepository.get_checkpoint(db, "default")
+    assert (checkpoint.last_resume_id, checkpoint.updated, checkpoint.finished_at) == (resumes[1].id, 2, None)
+
+    parser = FakeParser()
+    summary = await reparser(parser).run()
+
+    assert parser.parsed == ["Skill3", "Skill4", "Skill5"]
+    assert summary["updated"] == 3
+    db.expire_all()
+    assert {r.parse_version for r in db.query(models.Resume).all()} == {"v2"}
+
+
+@pytest.mark.asyncio
+async def test_dry_run_reports_changes_without_saving(db: Session):
+    resume = store(db, 1, "Go", "Python")
+    results = []
+
+    summary = await reparser(FakeParser(), dry_run=True).run(report=results.append)
+
+    assert summary["updated"] == 1
+    assert results[0]["changes"] == {"skills": {
+        "added": [{"name": "Go", "category": "Languages"}], "removed": [{"name": "Python", "category": "Languages"}]
+    }}
+    db.expire_all()
+    saved = db.get(models.Resume, resume.id)
+    assert (saved.parse_version, saved.parsed_data["skills"]) == ("v1", [{"name": "Python", "category": "Languages"}])
+    assert ReparseCheckpointRepository.get_checkpoint(db, "default") is None
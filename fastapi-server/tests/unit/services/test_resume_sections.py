@@ -0,0 +1,42 @@
+from services.resume_sections import changed_sections, segment_resume
+
+RESUME = """Jane Smith
+jane@example.com
+
+Summary
+Backend engineer.
+
+Experience
+- Engineer at Acme
+- Intern at Initech
+
+Education
+- MIT
+
+Skills
+Python, Go
+
+Projects
+- Resume parser
+"""
+
+
+def test_blocks_are_grouped_by_the_section_they_feed():
+    segments = segment_resume(RESUME)
+
+    assert segments["personal_info"] == "Jane Smith\njane@example.com\n\nSummary\nBackend engineer."
+    assert segments["skills"] == "Skills\nPython, Go"
+    assert segments["other"] == "Projects\n- Resume parser"
+
+
+def test_only_edited_sections_are_changed():
+    revised = RESUME.replace("Python, Go", "Python, Go, Rust").replace("- MIT", "-   MIT")
+
+    assert changed_sections(RESUME, revised) == ["skills"]
+    assert changed_sections(RESUME, RESUME) == []
+
+
+def test_changes_that_cant_be_pinned_to_a_section_need_a_full_parse():
+    assert changed_sections(RESUME, RESUME.replace("Resume parser", "Chat bot")) is None
+    assert changed_sections(RESUME, RESUME.replace("Skills\nPython, Go\n", "")) is None
+    assert changed_sections("Jane Smith\nEngineer at Acme", "Jane Smith\nEngineer at Initech") is None
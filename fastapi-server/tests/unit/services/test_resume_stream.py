@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from schemas.resume_schemas import ResumeResponse
+from services.llm_guard import LLMGuard
+from services.model_tiers import TierStats
+from services.parse_cache import ParseCache
+from services.resume_parser import ResumeParser
+from services.resume_stream import PartialResumeEmitter, sse_event
+from services.single_flight import SingleFlight
+
+# How a streamed ResumeData tool call grows, one partial parse per step
+PARTIALS = [
+    {"personal_info": {"name": "Jo"}},
+    {"personal_info": {"name": "John Doe"}},
+    {"personal_info": {"name": "John Doe"}, "education": []},
+    {"personal_info": {"name": "John Doe"}, "education": [{"institution": "MIT", "degree": "BS"}]},
+    {"personal_info": {"name": "John Doe"}, "education": [{"institution": "MIT", "degree": "BS"}],
+     "work_experience": [{"company": "Acme", "job_title": "Engineer", "start_date": "2020-01"}]},
+    {"personal_info": {"name": "John Doe"}, "education": [{"institution": "MIT", "degree": "BS"}],
+     "work_experience": [{"company": "Acme", "job_title": "Engineer", "start_date": "2020-01"}],
+     "skills": [{"name": "Python"}, {"name": "Go"}]},
+]
+
+
+class StreamingLLM:
+    """Fake streaming LLM yielding PARTIALS with a pause before each"""
+
+    def __init__(self, step: float):
+        self.step = step
+        self.finished_at = None
+
+    async def astream(self, messages):
+        for partial in PARTIALS:
+            await asyncio.sleep(self.step)
+            yield partial
+        self.finished_at = asyncio.get_running_loop().time()
+
+
+def test_emitter_sends_each_piece_once_it_is_finished():
+    emitter = PartialResumeEmitter({"email": "john@example.com"})
+    events = [[event for event, _ in emitter.feed(partial)] for partial in PARTIALS]
+    assert events == [[], [], ["personal_info"], [], ["education"], ["work_experience", "skills"]]
+
+    # Whatever is still open is finished by the end of the stream, and nothing is sent twice
+    assert emitter.feed(PARTIALS[-1], final=True) == [("skills", {"name": "Go", "category": None})]
+
+    emitter = PartialResumeEmitter({"email": "john@example.com"})
+    first = emitter.feed(PARTIALS[2])
+    assert first == [("personal_info", {
+        "name": "John Doe", "email": "john@example.com", "phone": None, "location": None,
+        "linkedin": None, "website": None, "summary": None
+    })]
+
+
+def test_emitter_repairs_entries_and_skips_invalid_ones():
+    emitter = PartialResumeEmitter()
+    events = emitter.feed({"skills": ["Python", {"category": "no name"}, {"name": "Go"}]}, final=True)
+    assert events == [("skills", {"name": "Python", "category": None}), ("skills", {"name": "Go", "category": None})]
+
+
+def test_sse_event_format():
+    assert sse_event("skills", {"name": "Go"}) == 'event: skills\ndata: {"name": "Go"}\n\n'
+
+
+@pytest.mark.asyncio
+async def test_personal_info_streams_before_the_llm_finishes():
+    llm = StreamingLLM(step=0.05)
+    parser = ResumeParser(
+        llm_factory=MagicMock(),
+        stream_factory=lambda model_name, schema: llm,
+        cache=ParseCache(),
+        model_chain=["cheap"],
+        stats=TierStats(),
+        preextract=False,
+        flights=SingleFlight(),
+        guard=LLMGuard()
+    )
+    parser._save_parsed_data = MagicMock(side_effect=lambda db, data, user_id, file_name, **details: ResumeResponse(
+        status="success", message="saved", data=data.model_dump(), **details
+    ))
+
+    loop = asyncio.get_running_loop()
+    received = []
+    async for event, data in parser.astream_resume("John Doe resume", 1, "resume.txt"):
+        received.append((event, loop.time(), data))
+
+    assert [event for event, _, _ in received] == [
+        "personal_info", "education", "work_experience", "skills", "skills", "result"
+    ]
+    assert received[0][1] < llm.finished_at - 0.1
+    result = received[-1][2]
+    assert result.status == "success"
+    assert result.served_by == "cheap"
+    assert [skill.name for skill in result.data.skills] == ["Python", "Go"]
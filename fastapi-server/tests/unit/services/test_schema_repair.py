@@ -0,0 +1,112 @@
+import pytest
+from unittest.mock import MagicMock
+from langchain_core.messages import AIMessage
+
+from schemas.resume_schemas import ResumeData
+from services.model_tiers import TierStats
+from services.parse_cache import ParseCache
+from services.resume_parser import ResumeParser
+from services.schema_repair import coerce_date, repair_resume_data
+
+NEAR_MISS = {
+    "personal_info": {"name": "John Doe", "email": "john@example.com", "github": "johndoe"},
+    "education": {"institution": "MIT", "degree": "BS", "start_date": 2013, "end_date": 2017},
+    "work_experience": [
+        {"company": "Acme", "job_title": "Engineer", "start_date": "May 2021", "end_date": "Present"},
+        {"company": "Initech", "job_title": "Intern", "start_date": "2020-08", "end_date": "06/2019",
+         "location": "Remote"},
+        {"company": None, "job_title": None}
+    ],
+    "skills": "Python, SQL",
+    "hobbies": ["chess"]
+}
+
+
+def test_coerce_date_formats():
+    """Common resume date formats parse to the first of the month"""
+    assert coerce_date("2020-05-01T00:00:00").strftime("%Y-%m-%d") == "2020-05-01"
+    assert coerce_date("2020-05").strftime("%Y-%m-%d") == "2020-05-01"
+    assert coerce_date("2020").strftime("%Y-%m-%d") == "2020-01-01"
+    assert coerce_date("05/2020").strftime("%Y-%m-%d") == "2020-05-01"
+    assert coerce_date("Sept. 2019").strftime("%Y-%m-%d") == "2019-09-01"
+    assert coerce_date("September 2019").strftime("%Y-%m-%d") == "2019-09-01"
+    assert coerce_date(2018).strftime("%Y-%m-%d") == "2018-01-01"
+    assert coerce_date("sometime") is None
+
+
+def test_repair_fixes_near_miss_output():
+    """Every kind of near miss is fixed and counted"""
+    repaired, counts = repair_resume_data(NEAR_MISS)
+    data = ResumeData.model_validate(repaired)
+
+    assert "github" not in repaired["personal_info"]
+    assert data.education[0].start_date == "2013"
+    acme, initech = data.work_experience
+    assert acme.is_current_job is True and acme.end_date is None
+    assert acme.start_date.strftime("%Y-%m-%d") == "2021-05-01"
+    # End before start is swapped back into order
+    assert initech.start_date.strftime("%Y-%m-%d") == "2019-06-01"
+    assert initech.end_date.strftime("%Y-%m-%d") == "2020-08-01"
+    assert [s.name for s in data.skills] == ["Python", "SQL"]
+
+    assert counts == {
+        "dropped_unknown_key": 3,
+        "wrapped_scalar": 2,
+        "coerced_type": 4,
+        "filled_default": 3,
+        "current_job": 1,
+        "coerced_date": 3,
+        "swapped_dates": 1,
+        "dropped_empty_entry": 1
+    }
+
+
+def test_clean_output_needs_no_repairs():
+    """Valid output passes through untouched"""
+    clean = {
+        "personal_info": {"name": "Jane"},
+        "education": [{"institution": "MIT"}],
+        "work_experience": [{"company": "Acme", "start_date": "2020-01-01", "is_current_job": False}],
+        "skills": [{"name": "Go"}]
+    }
+    repaired, counts = repair_resume_data(clean)
+    assert repaired == clean
+    assert not counts
+
+
+class RawOutputLLM:
+    """Fake structured LLM with include_raw=True that fails validation on a near miss"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        raw = AIMessage(content="", tool_calls=[{"name": "ResumeData", "args": NEAR_MISS, "id": "call_1"}])
+        try:
+            parsed = ResumeData.model_validate(NEAR_MISS)
+            error = None
+        except Exception as e:
+            parsed, error = None, e
+        return {"raw": raw, "parsed": parsed, "parsing_error": error}
+
+
+@pytest.mark.asyncio
+async def test_parser_repairs_instead_of_escalating():
+    """A near-miss output is repaired locally and served by the first tier"""
+    llm = RawOutputLLM()
+    parser = ResumeParser(
+        llm_factory=lambda model_name, schema: llm,
+        cache=ParseCache(),
+        model_chain=["cheap", "strong"],
+        stats=TierStats(),
+        preextract=False
+    )
+    parser._save_parsed_data = MagicMock(side_effect=lambda db, data, user_id, file_name, **details: (data, details))
+
+    data, details = await parser.aparse_resume("John Doe resume", 1, "resume.txt")
+
+    assert llm.calls == 1
+    assert details["served_by"] == "cheap"
+    assert details["repairs"]["swapped_dates"] == 1
+    assert data.work_experience[0].is_current_job is True
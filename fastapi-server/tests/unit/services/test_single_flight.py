@@ -0,0 +1,114 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from schemas.resume_schemas import ResumeData
+from services.model_tiers import TierStats
+from services.parse_cache import ParseCache
+from services.resume_parser import ResumeParser
+from services.single_flight import SingleFlight
+
+
+PARSED = {
+    "personal_info": {"name": "John Doe", "email": "john@example.com"},
+    "work_experience": [{"company": "Acme", "job_title": "Engineer", "start_date": "2021-05-01"}],
+    "skills": [{"name": "Python"}]
+}
+
+
+class GatedLLM:
+    """Fake structured LLM whose calls wait until the test releases them"""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        await self.release.wait()
+        return ResumeData.model_validate(PARSED)
+
+
+def make_parser(llm: GatedLLM, flights: SingleFlight) -> ResumeParser:
+    parser = ResumeParser(
+        llm_factory=lambda model_name, schema: llm,
+        cache=ParseCache(),
+        model_chain=["cheap"],
+        stats=TierStats(),
+        preextract=False,
+        flights=flights
+    )
+    parser._save_parsed_data = MagicMock(side_effect=lambda db, data, user_id, file_name, **details: data)
+    return parser
+
+
+@pytest.mark.asyncio
+async def test_duplicates_share_one_parse_and_save():
+    """Concurrent identical parses make one LLM call and one save, and all get the result"""
+    llm, flights = GatedLLM(), SingleFlight()
+    parser = make_parser(llm, flights)
+
+    calls = [asyncio.create_task(parser.aparse_resume("John Doe resume", 1, "resume.txt")) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    llm.release.set()
+    results = await asyncio.gather(*calls)
+
+    assert llm.calls == 1
+    assert parser._save_parsed_data.call_count == 1
+    assert all(result is results[0] for result in results)
+    assert flights.stats() == {"in_flight": 0, "leaders": 2, "coalesced": 4}
+
+
+@pytest.mark.asyncio
+async def test_other_users_share_the_llm_call_but_save_their_own():
+    """The same file uploaded by two users is parsed once and saved for each"""
+    llm = GatedLLM()
+    parser = make_parser(llm, SingleFlight())
+
+    calls = [asyncio.create_task(parser.aparse_resume("John Doe resume", user_id, "resume.txt")) for user_id in (1, 2)]
+    await asyncio.sleep(0.01)
+    llm.release.set()
+    await asyncio.gather(*calls)
+
+    assert llm.calls == 1
+    assert sorted(call.args[2] for call in parser._save_parsed_data.call_args_list) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    """Followers still get their answer after the caller that started the parse goes away"""
+    llm, flights = GatedLLM(), SingleFlight()
+    parser = make_parser(llm, flights)
+
+    leader = asyncio.create_task(parser.aparse_resume("John Doe resume", 1, "resume.txt"))
+    await asyncio.sleep(0.01)
+    followers = [asyncio.create_task(parser.aparse_resume("John Doe resume", 1, "resume.txt")) for _ in range(2)]
+    await asyncio.sleep(0.01)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    llm.release.set()
+    results = await asyncio.gather(*followers)
+
+    assert llm.calls == 1
+    assert all(result.personal_info.name == "John Doe" for result in results)
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_and_clear_the_key():
+    """A failed computation is reported to all waiters and the next call starts afresh"""
+    flights = SingleFlight()
+    gate = asyncio.Event()
+
+    async def failing():
+        await gate.wait()
+        raise ValueError("boom")
+
+    calls = [asyncio.create_task(flights.run("key", failing)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    gate.set()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert await flights.run("key", lambda: asyncio.sleep(0, result="fresh")) == "fresh"
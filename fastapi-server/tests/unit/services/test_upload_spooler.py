@@ -0,0 +1,114 @@
+import os
+import hashlib
+import tempfile
+import tracemalloc
+import pytest
+from io import BytesIO
+from starlette.datastructures import UploadFile
+
+from services.upload_spooler import spool_upload, UploadRejected
+from tests.conftest import make_text_pdf
+
+
+class CountingUploadFile(UploadFile):
+    """UploadFile that records how many bytes were actually read from it"""
+
+    bytes_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        chunk = await super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def _upload(data: bytes, filename: str) -> CountingUploadFile:
+    return CountingUploadFile(file=BytesIO(data), filename=filename)
+
+
+@pytest.mark.asyncio
+async def test_small_upload_stays_in_memory():
+    """Small uploads are hashed and kept in memory"""
+    data = make_text_pdf(["Jane Doe"])
+    with await spool_upload(_upload(data, "resume.pdf"), chunk_size=16) as upload:
+        assert not upload.on_disk
+        assert upload.size == len(data)
+        assert upload.sha256 == hashlib.sha256(data).hexdigest()
+        assert upload.source == data
+
+
+@pytest.mark.asyncio
+async def test_large_upload_spills_to_disk_and_is_cleaned_up():
+    """Uploads past the threshold spill to a temp file that is removed afterwards"""
+    data = b"Jane Doe, Software Engineer\n" * 2000
+    upload = await spool_upload(_upload(data, "resume.txt"), chunk_size=1024, spool_threshold=4096)
+    with upload:
+        assert upload.on_disk
+        assert upload.source == upload.path
+        assert upload.read_bytes() == data
+        assert upload.sha256 == hashlib.sha256(data).hexdigest()
+        path = upload.path
+    assert not os.path.exists(path)
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_is_rejected_before_reading_everything():
+    """The size cap is enforced chunk by chunk, not after buffering the whole body"""
+    data = b"a" * 100_000
+    file = _upload(data, "resume.txt")
+    with pytest.raises(UploadRejected) as exc:
+        await spool_upload(file, max_size=10_000, chunk_size=1024)
+    assert exc.value.status_code == 413
+    assert file.bytes_read <= 10_000 + 1024
+
+
+@pytest.mark.asyncio
+async def test_unsupported_extension_is_rejected_without_reading():
+    """Files with an unsupported extension are rejected before any content is read"""
+    file = _upload(b"\x89PNG....", "photo.png")
+    with pytest.raises(UploadRejected) as exc:
+        await spool_upload(file)
+    assert exc.value.status_code == 415
+    assert file.bytes_read == 0
+
+
+@pytest.mark.asyncio
+async def test_mismatched_content_is_rejected_on_first_chunk():
+    """A .pdf without a PDF header or a binary .txt is rejected after the first chunk"""
+    fake_pdf = _upload(b"<html>not a pdf</html>" * 1000, "resume.pdf")
+    with pytest.raises(UploadRejected):
+        await spool_upload(fake_pdf, chunk_size=1024)
+    assert fake_pdf.bytes_read == 1024
+
+    with pytest.raises(UploadRejected):
+        await spool_upload(_upload(b"abc\x00def", "resume.txt"))
+
+    with pytest.raises(UploadRejected):
+        await spool_upload(_upload(b"caf\xe9", "resume.txt"))
+
+
+@pytest.mark.asyncio
+async def test_multibyte_characters_split_across_chunks_are_accepted():
+    """UTF-8 validation is incremental, so a character split between chunks is fine"""
+    data = "Zoë Müller — Software Engineer".encode("utf-8")
+    with await spool_upload(_upload(data, "resume.txt"), chunk_size=3) as upload:
+        assert upload.read_bytes().decode("utf-8") == "Zoë Müller — Software Engineer"
+
+
+@pytest.mark.asyncio
+async def test_peak_memory_scales_with_chunk_size_not_file_size():
+    """Spooling a 4MB upload never holds more than the threshold plus a chunk in memory"""
+    size = 4 * 1024 * 1024
+    with tempfile.TemporaryFile() as source:
+        source.write(b"%PDF-1.4\n" + b"x" * (size - 9))
+        source.seek(0)
+        file = UploadFile(file=source, filename="resume.pdf")
+
+        tracemalloc.start()
+        upload = await spool_upload(file, max_size=size, chunk_size=64 * 1024, spool_threshold=256 * 1024)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    with upload:
+        assert upload.size == size
+        assert upload.on_disk
+    assert peak < size / 4
@@ -0,0 +1,23 @@
+import pytest
+
+import database
+from database import AsyncDatabaseNotConfigured, async_database_url, get_async_db
+
+
+def test_async_url_swaps_in_the_asyncio_driver():
+    assert async_database_url("postgresql://u:secret@db:5432/app") == "postgresql+asyncpg://u:secret@db:5432/app"
+    assert async_database_url("postgresql+psycopg2://u@db/app") == "postgresql+asyncpg://u@db/app"
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+
+
+def test_database_without_an_asyncio_driver_is_a_configuration_error():
+    with pytest.raises(AsyncDatabaseNotConfigured, match="ASYNC_DATABASE_URL"):
+        async_database_url("mssql+pyodbc://u@db/app")
+
+
+@pytest.mark.asyncio
+async def test_async_sessions_fail_clearly_without_an_async_engine(monkeypatch):
+    monkeypatch.setattr(database, "AsyncSessionLocal", None)
+
+    with pytest.raises(AsyncDatabaseNotConfigured):
+        await get_async_db().__anext__()
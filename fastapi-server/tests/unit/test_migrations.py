@@ -0,0 +1,71 @@
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+import models
+from migrate import upgrade_database
+
+
+def migrated_engine(tmp_path, revision: str = "head"):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    upgrade_database(engine, revision)
+    return engine
+
+
+def test_migrations_build_the_schema_the_models_describe(tmp_path):
+    engine = migrated_engine(tmp_path)
+
+    with engine.connect() as conn:
+        assert compare_metadata(MigrationContext.configure(conn), models.Base.metadata) == []
+    engine.dispose()
+
+
+def pre_migration_engine(tmp_path):
+    """A database as create_all built it from the models before there were migrations"""
+    engine = migrated_engine(tmp_path, "0001")
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE alembic_version"))
+    return engine
+
+
+def test_database_built_by_create_all_is_adopted_and_deduplicated(tmp_path):
+    """A pre-migration database is stamped at the baseline, and duplicate rows go before the unique indexes"""
+    engine = pre_migration_engine(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id) VALUES (1), (2)"))
+        conn.execute(text("INSERT INTO resumes (id, user_id) VALUES (1, 1), (2, 1), (3, 2)"))
+        conn.execute(text("INSERT INTO skills (resume_id, name) VALUES (1, 'Python'), (2, 'Go'), (3, 'Rust')"))
+        conn.execute(text("INSERT INTO profiles (id, user_id) VALUES (1, 1), (2, 1)"))
+
+    upgrade_database(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT version_num FROM alembic_version")).scalar() == "0003"
+        assert conn.execute(text("SELECT id, user_id FROM resumes ORDER BY id")).all() == [(1, 1), (3, 2)]
+        assert conn.execute(text("SELECT name FROM skills ORDER BY id")).scalars().all() == ["Python", "Rust"]
+        assert conn.execute(text("SELECT id FROM profiles")).scalars().all() == [1]
+    indexes = {index["name"]: index["unique"] for index in inspect(engine).get_indexes("resumes")}
+    assert indexes["ix_resumes_user_id"]
+    with engine.connect() as conn:
+        assert compare_metadata(MigrationContext.configure(conn), models.Base.metadata) == []
+    engine.dispose()
+
+
+def test_database_with_parse_tables_from_create_all_is_adopted(tmp_path):
+    """Tables and columns create_all already added after the baseline aren't created twice"""
+    engine = pre_migration_engine(tmp_path)
+    models.Base.metadata.create_all(engine, tables=[
+        models.Base.metadata.tables[name] for name in ("parse_cache", "parse_jobs", "reparse_checkpoints")
+    ])
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE resumes ADD COLUMN resume_text TEXT"))
+        conn.execute(text("ALTER TABLE resumes ADD COLUMN parse_version VARCHAR"))
+        conn.execute(text("CREATE INDEX ix_resumes_parse_version ON resumes (parse_version)"))
+        conn.execute(text("INSERT INTO parse_cache (cache_key, content_hash) VALUES ('key', 'hash')"))
+
+    upgrade_database(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT cache_key FROM parse_cache")).scalars().all() == ["key"]
+        assert compare_metadata(MigrationContext.configure(conn), models.Base.metadata) == []
+    engine.dispose()
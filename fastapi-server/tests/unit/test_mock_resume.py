@@ -1,13 +1,6 @@
-import json
-from unittest.mock import MagicMock, patch
-import sys
-import os
-
-# Add the current directory to the path so we can import the modules
-current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.insert(0, current_dir)
-
-from services.resume_parser import ResumeParser, MockOpenAIClient
+import schemas
+from repository.user_repository import UserRepository
+from tests.conftest import make_stand_in_parser
 
 # Sample mock data
 MOCK_RESUME_DATA = {
@@ -35,25 +28,35 @@ MOCK_RESUME_DATA = {
     ]
 }
 
-def test_resume_parser_with_mock():
-    """Test resume parsing with a mock client"""
-    # Create mock client with predefined response
-    mock_client = MockOpenAIClient(MOCK_RESUME_DATA)
+def test_resume_parser_with_mock(db):
+    """Test resume parsing with the stand-in LLM returning predefined data"""
+    user = UserRepository.create_user(db, schemas.UserCreate(email="mock_resume@example.com"))
     
-    # Create parser with mock client
-    parser = ResumeParser(mock_client=mock_client)
+    # Create parser backed by the stand-in
+    parser = make_stand_in_parser(canned=MOCK_RESUME_DATA)
     
     # Test parsing
-    result = parser.parse_resume("Sample resume text")
+    result = parser.parse_resume("Sample resume text", user.id, "resume.txt", db=db)
     
     # Verify results
-    assert result["personal_info"]["name"] == "John Doe"
-    assert result["education"][0]["institution"] == "MIT"
-    assert result["work_experience"][0]["company"] == "Google"
-    assert result["skills"][0]["name"] == "Python"
-    
-    print("All tests passed!")
+    assert result.status == "success"
+    data = result.data.model_dump()
+    assert data["personal_info"]["name"] == "John Doe"
+    assert data["education"][0]["institution"] == "MIT"
+    assert data["work_experience"][0]["company"] == "Google"
+    assert data["skills"][0]["name"] == "Python"
 
-# Run the test directly when this file is executed
-if __name__ == "__main__":
-    test_resume_parser_with_mock() 
\ No newline at end of file
+
+def test_resume_parser_with_rule_based_stand_in(db):
+    """Without canned data the stand-in parses the resume text itself, deterministically"""
+    user = UserRepository.create_user(db, schemas.UserCreate(email="stand_in@example.com"))
+    parser = make_stand_in_parser()
+    text = "Jane Roe\njane@example.com\n\nExperience\nEngineer at Acme\n\nEducation\nMIT\n\nSkills\nPython, SQL\n"
+    
+    result = parser.parse_resume(text, user.id, "resume.txt", db=db)
+    
+    assert result.status == "success"
+    assert result.data.personal_info.name == "Jane Roe"
+    assert result.data.personal_info.email == "jane@example.com"
+    assert [(w.company, w.job_title) for w in result.data.work_experience] == [("Acme", "Engineer")]
+    assert [s.name for s in result.data.skills] == ["Python", "SQL"]